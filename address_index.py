@@ -0,0 +1,154 @@
+# address_index.py
+# 범공인 Pro v24 Enterprise - Address Index Module (v25.00 Parsed 번지)
+# Feature: 번지 Parser (산/본번/부번), Hash Index, Sorted (구, 동, 본번, 부번) Index, Exact/Prefix/Range/Same-Block Lookup
+
+import re
+import weakref
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 번지 데이터: '산 12-3', '12번지 3호', '12 - 03', '123-4외 1필지' 등 (본번을 못 읽으면 해석 불가)
+BUNJI_PATTERN = re.compile(r'^\s*(산)?\s*(\d+)\s*(?:(?:번지\s*-?|-)\s*(\d+)\s*(?:호)?|번지)?')
+
+# 검색어: '123-4'(정확) / '123-*', '123*', '123-'(본번 전체) / '120~130'(본번 범위) / 앞에 '산' 가능
+QUERY_PATTERN = re.compile(r'^(산)?(\d+)(?:~(\d+)|-(\d+)|(-?\*|-))?$')
+
+# 정렬 키 자릿수 (본번 < 100000, 부번 < 10000)
+BON_SPAN = 100000
+BU_SPAN = 10000
+
+# ==============================================================================
+# [SECTION 2: PARSER]
+# ==============================================================================
+
+def parse_bunji(bunji):
+    """번지 열 → (산 여부, 본번, 부번) 열 (본번을 못 읽으면 NaN, 부번 없으면 0)"""
+    parts = bunji.where(bunji.notna(), "").astype(str).str.extract(BUNJI_PATTERN)
+    return pd.DataFrame({
+        "산": parts[0].notna(),
+        "본번": pd.to_numeric(parts[1], errors='coerce'),
+        "부번": pd.to_numeric(parts[2], errors='coerce').fillna(0),
+    }, index=bunji.index)
+
+def parse_query(text):
+    """
+    번지 검색어 해석
+    Returns: {"산", "lo", "hi", "부번"(None = 전체)} 또는 None (해석 불가 → 문자열 일치로 처리)
+    """
+    m = QUERY_PATTERN.match(re.sub(r'\s+', '', str(text or "")).replace("번지", ""))
+    if not m: return None
+    san, bon, bon_hi, bu, wildcard = m.groups()
+    lo = int(bon)
+    hi = int(bon_hi) if bon_hi else lo
+    if hi < lo: lo, hi = hi, lo
+    if bon_hi or wildcard:
+        bu = None
+    else:
+        bu = int(bu or 0)
+    if hi >= BON_SPAN or (bu is not None and bu >= BU_SPAN): return None
+    return {"산": bool(san), "lo": lo, "hi": hi, "부번": bu}
+
+def _address_keys(san, bon, bu):
+    return (np.asarray(san, dtype=np.int64) * BON_SPAN + np.asarray(bon, dtype=np.int64)) * BU_SPAN + np.asarray(bu, dtype=np.int64)
+
+# ==============================================================================
+# [SECTION 3: INDEX]
+# ==============================================================================
+
+class AddressIndex:
+    """
+    데이터프레임 1개의 번지 인덱스 (행 위치 기준, 조회 결과는 시트 순서)
+    - exact: (산, 본번, 부번) → 행 위치 (해시)
+    - sorted: (구·동 코드, 산, 본번, 부번) 정렬 키 → 본번 전체 / 범위 / 같은 블록 조회는 이진 탐색
+    """
+    def __init__(self, df):
+        n = len(df)
+        parsed = parse_bunji(df['번지'] if '번지' in df.columns else pd.Series("", index=df.index))
+        gu = df['지역_구'].astype(str).fillna("").str.strip() if '지역_구' in df.columns else pd.Series("", index=df.index)
+        dong = df['지역_동'].astype(str).fillna("").str.strip() if '지역_동' in df.columns else pd.Series("", index=df.index)
+        codes, self.regions = pd.factorize(gu + "|" + dong)
+
+        valid = parsed["본번"].notna().to_numpy() & (parsed["본번"].fillna(0).to_numpy() < BON_SPAN) & \
+                (parsed["부번"].to_numpy() < BU_SPAN)
+        self.parsed = valid.sum()
+        self.rows = n
+        pos = np.arange(n)[valid]
+        san = parsed["산"].to_numpy()[valid]
+        bon = parsed["본번"].to_numpy()[valid]
+        bu = parsed["부번"].to_numpy()[valid]
+
+        # 해시 인덱스 (정확 일치)
+        addr = _address_keys(san, bon, bu)
+        order = np.argsort(addr, kind='stable')
+        uniq, starts = np.unique(addr[order], return_index=True)
+        self.exact = {int(k): p for k, p in zip(uniq, np.split(pos[order], starts[1:]))}
+
+        # 정렬 인덱스 (지역 코드가 가장 앞자리)
+        self.region_of = np.full(n, -1, dtype=np.int64)
+        self.region_of[pos] = codes[valid]
+        self.key_of = np.full(n, -1, dtype=np.int64)
+        self.key_of[pos] = addr
+        composite = codes[valid].astype(np.int64) * (2 * BON_SPAN * BU_SPAN) + addr
+        order = np.argsort(composite, kind='stable')
+        self.sorted_keys = composite[order]
+        self.sorted_pos = pos[order]
+
+    def _range(self, lo_addr, hi_addr, regions=None):
+        """주소 키 [lo, hi] 범위의 행 위치 (지역 코드별 이진 탐색, 시트 순서로 정렬)"""
+        regions = np.arange(len(self.regions), dtype=np.int64) if regions is None else np.asarray(regions, dtype=np.int64)
+        base = regions * (2 * BON_SPAN * BU_SPAN)
+        starts = np.searchsorted(self.sorted_keys, base + lo_addr, side='left')
+        ends = np.searchsorted(self.sorted_keys, base + hi_addr, side='right')
+        hits = [self.sorted_pos[s:e] for s, e in zip(starts, ends) if e > s]
+        return np.sort(np.concatenate(hits)) if hits else np.empty(0, dtype=int)
+
+    def lookup(self, query):
+        """
+        검색어(또는 parse_query 결과)에 맞는 행 위치
+        Returns: 행 위치 배열 또는 None (해석 불가)
+        """
+        q = parse_query(query) if isinstance(query, str) else query
+        if q is None: return None
+        san = int(q["산"])
+        if q["부번"] is not None and q["lo"] == q["hi"]:
+            return self.exact.get(int(_address_keys(san, q["lo"], q["부번"])), np.empty(0, dtype=int))
+        lo = int(_address_keys(san, q["lo"], 0))
+        hi = int(_address_keys(san, q["hi"], BU_SPAN - 1))
+        return self._range(lo, hi)
+
+    def same_block(self, row_pos):
+        """같은 구·동 + 같은 본번(산 포함)인 행 위치 (자기 자신 포함, 번지 해석 불가면 빈 배열)"""
+        region, addr = self.region_of[row_pos], self.key_of[row_pos]
+        if region < 0: return np.empty(0, dtype=int)
+        block = addr - addr % BU_SPAN
+        return self._range(block, block + BU_SPAN - 1, regions=[region])
+
+# ==============================================================================
+# [SECTION 4: PER-FRAME CACHE]
+# ==============================================================================
+
+# 데이터프레임별 인덱스 (같은 데이터로 여러 번 조회할 때 재사용, 프레임이 사라지면 함께 정리)
+_index_cache = {}
+
+def get_index(df):
+    """df의 번지 인덱스 (행 수가 바뀌었거나 invalidate 되었으면 다시 생성)"""
+    cached = _index_cache.get(id(df))
+    if cached and cached[0]() is df and cached[1] == len(df):
+        return cached[2]
+    index = AddressIndex(df)
+    _index_cache[id(df)] = (weakref.ref(df, lambda _, k=id(df): _index_cache.pop(k, None)), len(df), index)
+    return index
+
+def invalidate(df):
+    """df의 번지/지역 값이 바뀌었을 때 호출 (다음 조회 시 재생성)"""
+    _index_cache.pop(id(df), None)
+
+def lookup(df, query):
+    """df에서 번지 검색 (행 위치 배열, 해석 불가면 None)"""
+    q = parse_query(query)
+    if q is None: return None
+    return get_index(df).lookup(q)
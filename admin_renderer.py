@@ -0,0 +1,169 @@
+# admin_renderer.py
+# 범공인 Pro v24 Enterprise - Admin Diagnostics Renderer (v25.00 Trace Panel)
+# Feature: Admin Gate, Per-Rerun Waterfall, Rolling Span Percentiles, JSONL Export, API Metrics View, Duplicate Report, Archive Store Status, SQL Mirror Status
+
+import streamlit as st
+import pandas as pd
+import tracing
+import metrics
+import api_guard
+import http_client
+import dedup_engine
+import archive_store
+import sql_engine
+import core_engine as engine
+
+def get_admin_password():
+    """관리자 비밀번호 (.streamlit/secrets.toml [admin] password, 미설정 시 관리자 기능 비활성)"""
+    try:
+        return st.secrets["admin"]["password"]
+    except Exception:
+        return None
+
+def render_waterfall(trace):
+    """트레이스 1건의 구간을 시작 시각 기준 막대로 그립니다."""
+    total = max(trace.get("duration_ms") or 0.0, 1.0)
+    status = " (중단됨)" if trace.get("aborted") else ""
+    st.caption(f"{trace['label']} · {trace['started_at']} · 총 {trace['duration_ms']:.0f}ms{status} · 구간 {len(trace['spans'])}개")
+
+    rows = []
+    for s in trace["spans"]:
+        left = min(99.0, s["start_ms"] / total * 100)
+        width = max(0.5, min(100.0 - left, s["duration_ms"] / total * 100))
+        # 오류: 빨강 / 워커 스레드(병렬 API 호출): 보라 / 스크립트 스레드: 파랑
+        color = "#e74c3c" if s.get("error") else ("#9b59b6" if s["thread"].startswith("ThreadPoolExecutor") else "#3498db")
+        indent = "&nbsp;" * (s["depth"] * 2)
+        rows.append(
+            f"<div style='display:flex; align-items:center; font-size:11px; line-height:16px;'>"
+            f"<div style='width:42%; white-space:nowrap; overflow:hidden; text-overflow:ellipsis;'>{indent}{s['name']}</div>"
+            f"<div style='width:43%; position:relative; height:10px; background:#f0f0f0;'>"
+            f"<div style='position:absolute; left:{left:.2f}%; width:{width:.2f}%; height:10px; background:{color};'></div></div>"
+            f"<div style='width:15%; text-align:right;'>{s['duration_ms']:.1f}ms</div></div>"
+        )
+    st.markdown("".join(rows) or "기록된 구간이 없습니다.", unsafe_allow_html=True)
+
+def render_trace_panel():
+    """
+    관리자 전용 성능 추적 패널 (사이드바)
+    - 직전 실행 폭포수 / 구간별 누적 백분위 / JSONL 내보내기
+    """
+    with st.expander("⏱️ 성능 추적 (관리자)", expanded=False):
+        traces = tracing.get_recent_traces()
+        if not traces:
+            st.caption("아직 완료된 실행 기록이 없습니다.")
+        else:
+            labels = [f"{t['started_at'][11:]} {t['label']} ({t['duration_ms']:.0f}ms)" for t in traces]
+            pick = st.selectbox("실행 기록", range(len(traces)), format_func=lambda i: labels[i], key="trace_pick")
+            render_waterfall(traces[pick])
+
+        stats = tracing.get_span_stats()
+        if stats:
+            st.markdown("###### 구간별 지연시간 (최근 표본)")
+            st.dataframe(pd.DataFrame(stats).sort_values("p95_ms", ascending=False),
+                         hide_index=True, use_container_width=True)
+
+        c1, c2 = st.columns(2)
+        c1.download_button("⬇️ JSONL", tracing.traces_to_jsonl(traces), file_name="traces.jsonl",
+                           mime="application/jsonl", use_container_width=True)
+        if c2.button("💾 파일 저장", use_container_width=True, key="trace_export"):
+            ok, msg = tracing.export_jsonl()
+            (st.success if ok else st.error)(msg)
+        if st.button("🧹 기록 초기화", use_container_width=True, key="trace_reset"):
+            tracing.reset()
+            st.rerun()
+
+def render_metrics_panel():
+    """
+    관리자 전용 외부 API 지표 패널 (사이드바)
+    - 엔드포인트별 호출/오류/지연시간, 지연 분포, 캐시 적중률, 세션별 호출 수, 쿼터/서킷 상태
+    """
+    with st.expander("📈 API 지표 (관리자)", expanded=False):
+        endpoints = metrics.endpoint_table()
+        if endpoints:
+            st.markdown("###### 엔드포인트")
+            df_ep = pd.DataFrame(endpoints)
+            df_ep["error_classes"] = df_ep["error_classes"].map(lambda d: ", ".join(f"{k}:{v}" for k, v in d.items()))
+            st.dataframe(df_ep, hide_index=True, use_container_width=True)
+
+            pick = st.selectbox("지연 분포", [r["endpoint"] for r in endpoints], key="metrics_hist_pick")
+            hist = metrics.latency_histogram(pick)
+            st.bar_chart(pd.DataFrame({"건수": [n for _, n in hist]}, index=[label for label, _ in hist]), height=160)
+        else:
+            st.caption("아직 외부 API 호출 기록이 없습니다.")
+
+        caches = metrics.cache_table()
+        if caches:
+            st.markdown("###### 캐시 적중률 (%)")
+            st.dataframe(pd.DataFrame(caches), hide_index=True, use_container_width=True)
+
+        sessions = metrics.session_table()
+        if sessions:
+            st.markdown("###### 세션별 호출 수")
+            st.dataframe(pd.DataFrame(sessions).fillna(0), hide_index=True, use_container_width=True)
+
+        st.markdown("###### 쿼터 / 서킷")
+        quota = api_guard.get_quota_status()
+        breakers = http_client.get_breaker_status()
+        st.caption(" · ".join(f"{api}: {q['used_today']}/{q['daily']}{' (소진)' if q['exhausted'] else ''}" for api, q in quota.items()))
+        if breakers:
+            st.caption(" · ".join(f"{host}: {state}({fails})" for host, (state, fails) in breakers.items()))
+
+        c1, c2 = st.columns(2)
+        if c1.button("💾 스냅샷 저장", use_container_width=True, key="metrics_dump"):
+            ok, msg = metrics.dump()
+            (st.success if ok else st.error)(msg)
+        if c2.button("🧹 초기화", use_container_width=True, key="metrics_reset"):
+            metrics.reset()
+            st.rerun()
+
+def render_dedup_panel():
+    """
+    관리자 전용 중복 매물 점검 패널 (사이드바)
+    - 6개 시트 전체에서 같은 동/본번 블록 안의 유사 매물 쌍을 찾아 점수순으로 표시
+    """
+    with st.expander("🧬 중복 매물 점검 (관리자)", expanded=False):
+        if st.button("🔍 전체 시트 점검", use_container_width=True, key="dedup_run"):
+            with st.spinner("6개 시트 비교 중..."):
+                report, elapsed = dedup_engine.duplicate_report()
+            st.session_state.dedup_report = (report, elapsed)
+
+        result = st.session_state.get('dedup_report')
+        if result is None:
+            st.caption("종료/브리핑 시트를 포함해 번지·면적·층·호실·금액이 비슷한 매물을 찾습니다.")
+            return
+        report, elapsed = result
+        st.caption(f"중복 의심 {len(report)}쌍 · {elapsed:.1f}초")
+        if not report.empty:
+            st.dataframe(report.drop(columns=["IronID1", "IronID2"]), hide_index=True, use_container_width=True)
+            st.download_button("⬇️ CSV", report.to_csv(index=False).encode("utf-8-sig"), file_name="duplicates.csv",
+                               mime="text/csv", use_container_width=True, key="dedup_csv")
+
+def render_archive_panel():
+    """
+    관리자 전용 종료 시트 콜드 스토어 패널 (사이드바)
+    - 시트별 행 수 / 파일 수 / 디스크·메모리 용량, 시트를 직접 고쳤을 때 다시 동기화
+    """
+    with st.expander("🗄️ 종료 시트 보관소 (관리자)", expanded=False):
+        rows = [s for s in (archive_store.status(name) for name in archive_store.ARCHIVE_SHEETS) if s]
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("아직 만들어진 보관소가 없습니다. (종료 시트를 처음 불러올 때 생성)")
+        for name in archive_store.ARCHIVE_SHEETS:
+            if st.button(f"🔄 {name} 시트에서 다시 동기화", use_container_width=True, key=f"archive_sync_{name}"):
+                with st.spinner(f"{name} 내려받는 중..."):
+                    ok, msg = engine.rebuild_archive(name)
+                (st.success if ok else st.error)(msg)
+
+def render_sql_panel():
+    """
+    관리자 전용 SQL 미러 상태 패널 (사이드바, SQL 엔진 사용 시에만)
+    - 시트별 미러 행 수 / 준비 여부 / 동기화 오류
+    """
+    if not sql_engine.is_enabled(): return
+    with st.expander("🗃️ SQL 미러 (관리자)", expanded=False):
+        rows = sql_engine.get_status()
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("아직 만들어진 미러가 없습니다. (목록을 처음 열 때 백그라운드로 생성)")
@@ -0,0 +1,233 @@
+# api_guard.py
+# 범공인 Pro v24 Enterprise - External API Guard Module (v25.00 Quota Shield)
+# Feature: Single-Flight Coalescing, Token-Bucket Rate Limit, Daily Quota, Stale Cache Fallback
+
+import threading
+import time
+import datetime
+from collections import OrderedDict
+import metrics
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# API 키별 속도 제한 (초당 토큰, 버스트 용량, 일일 한도)
+RATE_LIMITS = {
+    "kakao": {"rate": 10.0, "burst": 20, "daily": 90000},
+    "naver": {"rate": 5.0, "burst": 10, "daily": 90000},
+}
+
+# 토큰이 없을 때 대기할 최대 시간 (초) - 이후엔 쿼터 소진으로 간주
+ACQUIRE_WAIT_SEC = 1.0
+
+# 업스트림이 429(쿼터 초과)를 돌려줬을 때 호출을 멈추는 시간 (초)
+EXHAUST_COOLDOWN_SEC = 60.0
+
+# 결과 캐시 (신선 TTL 경과 후에도 STALE TTL까지는 쿼터 소진 시 대체값으로 사용)
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # 지도 이미지 등 바이너리 값의 총 용량 상한
+STALE_TTL_SEC = 7 * 24 * 3600
+
+
+class QuotaExceeded(Exception):
+    """속도 제한/일일 쿼터 초과로 호출이 거부되었을 때 발생합니다."""
+
+
+# ==============================================================================
+# [SECTION 2: TOKEN BUCKET]
+# ==============================================================================
+
+class TokenBucket:
+    """
+    API 키 하나에 대한 토큰 버킷 + 일일 쿼터 카운터
+    """
+    def __init__(self, rate, burst, daily=None):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.daily = daily
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.day = datetime.date.today()
+        self.used_today = 0
+        self.exhausted_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        today = datetime.date.today()
+        if today != self.day:
+            self.day = today
+            self.used_today = 0
+
+    def try_acquire(self, wait=ACQUIRE_WAIT_SEC):
+        """토큰 1개 획득 시도 (최대 wait초 대기). 실패 시 False"""
+        deadline = time.monotonic() + wait
+        while True:
+            with self.lock:
+                self._refill()
+                if time.monotonic() < self.exhausted_until:
+                    return False
+                if self.daily is not None and self.used_today >= self.daily:
+                    return False
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.used_today += 1
+                    return True
+                need = (1 - self.tokens) / self.rate
+            if time.monotonic() + need > deadline:
+                return False
+            time.sleep(need)
+
+    def mark_exhausted(self, cooldown=EXHAUST_COOLDOWN_SEC):
+        """업스트림 429 수신 시 일정 시간 호출 차단"""
+        with self.lock:
+            self.exhausted_until = time.monotonic() + cooldown
+
+    def status(self):
+        with self.lock:
+            self._refill()
+            return {
+                "tokens": round(self.tokens, 1),
+                "used_today": self.used_today,
+                "daily": self.daily,
+                "exhausted": time.monotonic() < self.exhausted_until,
+            }
+
+_buckets = {name: TokenBucket(**cfg) for name, cfg in RATE_LIMITS.items()}
+
+def get_bucket(api):
+    return _buckets[api]
+
+def get_quota_status():
+    """API 키별 잔여 토큰 및 당일 사용량을 반환합니다."""
+    return {name: b.status() for name, b in _buckets.items()}
+
+# ==============================================================================
+# [SECTION 3: SINGLE-FLIGHT & RESULT CACHE]
+# ==============================================================================
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_bytes = 0
+
+# 스레드별 대체값(STALE 캐시 / fallback) 또는 업스트림 오류 응답 횟수 - 배치가 정상 결과만 저장하도록 확인용
+_degraded = threading.local()
+
+def degraded_count():
+    """현재 스레드에서 지금까지 대체값으로 응답한 횟수"""
+    return getattr(_degraded, "count", 0)
+
+def mark_degraded():
+    """현재 스레드의 응답이 정상 결과가 아님을 기록 (대체값 / 업스트림 오류로 빈 결과)"""
+    _degraded.count = degraded_count() + 1
+
+def _sizeof(value):
+    return len(value) if isinstance(value, (bytes, bytearray)) else 0
+
+def _cache_get(key, max_age):
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None: return None
+        stored_at, value = hit
+        if time.time() - stored_at > max_age: return None
+        _cache.move_to_end(key)
+        return value
+
+def _cache_put(key, value):
+    global _cache_bytes
+    with _cache_lock:
+        if key in _cache:
+            _cache_bytes -= _sizeof(_cache.pop(key)[1])
+        _cache[key] = (time.time(), value)
+        _cache_bytes += _sizeof(value)
+        while len(_cache) > CACHE_MAX_ENTRIES or (_cache_bytes > CACHE_MAX_BYTES and len(_cache) > 1):
+            _, (_, evicted) = _cache.popitem(last=False)
+            _cache_bytes -= _sizeof(evicted)
+
+def single_flight(key, fn):
+    """
+    동일 key의 동시 호출을 하나로 합칩니다. (선행 호출 결과/예외를 후행 호출이 공유)
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = {"event": threading.Event(), "result": None, "error": None}
+            _inflight[key] = call
+
+    if not leader:
+        call["event"].wait()
+        if call["error"] is not None: raise call["error"]
+        return call["result"]
+
+    try:
+        call["result"] = fn()
+        return call["result"]
+    except Exception as e:
+        call["error"] = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call["event"].set()
+
+def guarded_call(api, key, fn, ttl, cache_if=None, fallback=None):
+    """
+    캐시 → 단일 비행 → 토큰 버킷 순으로 외부 API 호출을 보호합니다.
+    - ttl 이내 캐시가 있으면 호출 없이 반환
+    - 쿼터 소진(QuotaExceeded) 시 STALE 캐시 → fallback() 순으로 대체값 반환
+    - fn은 업스트림 429를 QuotaExceeded로 알려야 합니다.
+    """
+    cache_key = (api,) + tuple(key)
+    cache_name = f"{api}.{key[0]}"
+    fresh = _cache_get(cache_key, ttl)
+    if fresh is not None:
+        metrics.record_cache(cache_name, "hit")
+        return fresh
+
+    led = []
+    def _leader():
+        led.append(True)
+        bucket = get_bucket(api)
+        if not bucket.try_acquire():
+            raise QuotaExceeded(f"{api} rate limit / daily quota reached")
+        # "miss"는 실제 호출이 응답했을 때만 (쿼터 거부는 아래 stale/fallback 1건으로만 기록)
+        try:
+            value = fn()
+        except QuotaExceeded:
+            bucket.mark_exhausted()
+            raise
+        except Exception:
+            metrics.record_cache(cache_name, "miss")
+            raise
+        metrics.record_cache(cache_name, "miss")
+        if cache_if is None or cache_if(value):
+            _cache_put(cache_key, value)
+        return value
+
+    try:
+        value = single_flight(cache_key, _leader)
+        if not led: metrics.record_cache(cache_name, "coalesced")
+        return value
+    except QuotaExceeded:
+        stale = _cache_get(cache_key, STALE_TTL_SEC)
+        if stale is not None:
+            metrics.record_cache(cache_name, "stale")
+            mark_degraded()
+            return stale
+        if fallback is not None:
+            metrics.record_cache(cache_name, "fallback")
+            mark_degraded()
+            return fallback()
+        raise
+
+def is_exhausted(api):
+    """현재 해당 API 키가 쿼터 소진 상태(대체값 응답 중)인지 반환합니다."""
+    status = get_bucket(api).status()
+    return status["exhausted"] or (status["daily"] is not None and status["used_today"] >= status["daily"])
@@ -6,9 +6,14 @@ import streamlit as st
 import pandas as pd
 import core_engine as engine
 import list_renderer     # 목록 렌더링 전담
+import sort_engine       # 목록 정렬 전담
 import detail_renderer   # 상세 보기 전담
 import new_item_renderer # 신규 등록 전담
 import styles            # 스타일 모듈
+import admin_renderer    # 관리자 진단 도구
+import fuzzy_search      # 오타 허용 검색
+import unified_renderer  # 전체 시트 검색
+import tracing           # 실행 구간 추적
 
 # ==============================================================================
 # [INIT] 시스템 초기화 및 보안 설정
@@ -16,13 +21,22 @@ import styles            # 스타일 모듈
 st.set_page_config(page_title="범공인 Pro (v24.99)", layout="wide", initial_sidebar_state="expanded")
 styles.apply_custom_css()
 
+# [TRACE] 실행(rerun) 단위 구간 추적 시작
+# 직전 실행이 st.rerun/st.stop으로 끝까지 가지 못했다면 여기서 중단 처리로 마감
+if 'active_trace' in st.session_state: tracing.end_trace(st.session_state.active_trace, aborted=True)
+st.session_state.active_trace = tracing.begin_trace("rerun")
+
 # 1. 로그인 상태 관리 초기화
 if 'auth_status' not in st.session_state: 
     st.session_state.auth_status = False
 
 def check_password():
-    """마스터 비밀번호 검증 함수"""
-    if st.session_state.password_input == "bum24!":
+    """마스터 비밀번호 검증 함수 (관리자 비밀번호로 접속 시 관리자 도구 활성화)"""
+    admin_pw = admin_renderer.get_admin_password()
+    if admin_pw and st.session_state.password_input == admin_pw:
+        st.session_state.auth_status = True
+        st.session_state.is_admin = True
+    elif st.session_state.password_input == "bum24!":
         st.session_state.auth_status = True
     else:
         st.error("🔒 비밀번호가 올바르지 않습니다.")
@@ -56,6 +70,7 @@ if not st.session_state.auth_status:
 if 'current_sheet' not in st.session_state: st.session_state.current_sheet = engine.SHEET_NAMES[0]
 if 'selected_item' not in st.session_state: st.session_state.selected_item = None
 if 'view_mode' not in st.session_state: st.session_state.view_mode = '🗂️ 카드 모드'
+if 'column_profile' not in st.session_state: st.session_state.column_profile = 'compact'
 if 'page_num' not in st.session_state: st.session_state.page_num = 1
 if 'editor_key_version' not in st.session_state: st.session_state.editor_key_version = 0
 
@@ -80,6 +95,8 @@ def sess(key): return st.session_state.get(key)
 # [Helper] 필터 변경 시 페이지 리셋 콜백
 def reset_page():
     st.session_state.page_num = 1
+    st.session_state.page_cursor = None
+    st.session_state.scroll_blocks = 1
 
 # ==============================================================================
 # [SIDEBAR] 필터링 컨트롤 타워
@@ -107,11 +124,14 @@ with st.sidebar:
             index=curr_idx, 
             label_visibility="collapsed"
         )
+        # 전체 시트 검색 (시트 전환 없이 6개 시트를 한 번에 검색 → 결과에서 해당 시트 상세로 이동)
+        st.toggle("🔎 전체 시트 검색", key='unified_mode')
         
         # 시트 변경 감지 및 강제 리셋 (데이터 강제 동기화)
         if selected_sheet != st.session_state.current_sheet:
             st.session_state.current_sheet = selected_sheet
             st.session_state.page_num = 1
+            st.session_state.page_cursor = None
             st.session_state.selected_item = None
             
             # [중요] 시트 변경 시 등록 모드 해제
@@ -131,12 +151,18 @@ with st.sidebar:
     if 'df_main' not in st.session_state:
         with st.spinner("데이터 로드 중..."):
             st.session_state.df_main = engine.load_sheet_data(st.session_state.current_sheet)
+            if st.session_state.df_main is not None:
+                engine.capture_row_fingerprints(st.session_state.current_sheet, st.session_state.df_main)
     df_main = st.session_state.df_main
 
     # [B] 키워드 검색 (페이지 리셋 적용)
     st.write("")
     st.text_input("통합 검색 (건물명, 특징 등)", key='search_keyword', on_change=reset_page)
-    st.text_input("번지 검색 (정확히 일치)", key='exact_bunji', on_change=reset_page)
+    st.checkbox("오타 허용 (초성 검색 가능, 예: ㅇㅅㄷ)", key='fuzzy_search', on_change=reset_page)
+    if st.session_state.fuzzy_search and st.session_state.search_keyword and df_main is not None:
+        similar = fuzzy_search.suggest(df_main, st.session_state.search_keyword)
+        if similar: st.caption("비슷한 검색어: " + ", ".join(similar))
+    st.text_input("번지 검색 (예: 123-4, 123-*, 120~130, 산 12)", key='exact_bunji', on_change=reset_page)
     st.write("")
     
     # [C] 스마트 항목 필터링 (검색 + 멀티셀렉트)
@@ -231,6 +257,17 @@ with st.sidebar:
         c3, c4 = st.columns(2)
         c3.number_input("최저 층", key='min_fl', value=None, step=1.0, min_value=-50.0, max_value=200.0, on_change=reset_page)
         c4.number_input("최고 층", key='max_fl', value=None, step=1.0, min_value=-50.0, max_value=200.0, on_change=reset_page)
+
+        # 역세권 필터 (location_batch 사전 계산 결과가 있을 때만 표시)
+        if '역거리' in df_main.columns:
+            st.selectbox("🚇 역세권", list(list_renderer.STATION_RADIUS_OPTIONS.keys()), key='station_radius', on_change=reset_page)
+
+    # [정렬] 기준/방향 변경 시 첫 페이지부터 (역거리는 입지 정보가 있을 때만)
+    sort_labels = [k for k, v in sort_engine.SORT_OPTIONS.items() if v != "station" or '역거리' in df_main.columns]
+    if st.session_state.get('sort_field') not in sort_labels: st.session_state.sort_field = sort_labels[0]
+    c_s1, c_s2 = st.columns([3, 1.3])
+    c_s1.selectbox("↕️ 정렬", sort_labels, key='sort_field', on_change=reset_page)
+    c_s2.checkbox("내림차순", key='sort_desc', on_change=reset_page)
     
     st.divider()
     # [보기 모드 보존 로직]
@@ -245,14 +282,26 @@ with st.sidebar:
         st.rerun()
         
     st.markdown("---")
-    view_option = st.radio("보기", ['🗂️ 카드 모드', '📋 리스트 모드'], 
-                           index=0 if st.session_state.view_mode == '🗂️ 카드 모드' else 1)
+    view_options = ['🗂️ 카드 모드', list_renderer.SCROLL_VIEW_LABEL, '📋 리스트 모드']
+    view_option = st.radio("보기", view_options, 
+                           index=view_options.index(st.session_state.view_mode) if st.session_state.view_mode in view_options else 0)
     if view_option != st.session_state.view_mode:
         st.session_state.view_mode = view_option
         st.rerun()
 
+    # 저장 대기열 (시트 반영 대기 / 실패 건)
+    detail_renderer.render_write_status()
+
+    # [관리자 전용] 성능 추적 / API 지표 패널
+    if st.session_state.get('is_admin'):
+        admin_renderer.render_trace_panel()
+        admin_renderer.render_metrics_panel()
+        admin_renderer.render_dedup_panel()
+        admin_renderer.render_archive_panel()
+        admin_renderer.render_sql_panel()
+
 # ==============================================================================
-# [MAIN CONTENT] - 뇌 (Brain / 3-Way Branching)
+# [MAIN CONTENT] - 뇌 (Brain / 4-Way Branching)
 # ==============================================================================
 st.title("🏙️ 범공인 매물장 (Pro)")
 
@@ -262,7 +311,13 @@ if st.session_state.selected_item is not None:
 elif st.session_state.is_adding_new:
     # 2. 신규 등록 모드 (New Item Renderer에 위임)
     new_item_renderer.render_new_item_form()
+elif st.session_state.get('unified_mode'):
+    # 3. 전체 시트 검색 모드 (Unified Renderer에 위임)
+    unified_renderer.render_unified_search()
 else:
-    # 3. 목록 보기 모드 (List Renderer에 위임)
+    # 4. 목록 보기 모드 (List Renderer에 위임)
     # 필터링 상태는 session_state를 통해 공유됨
     list_renderer.show_main_list()
+
+# [TRACE] 정상 종료된 실행 마감
+tracing.end_trace(st.session_state.get("active_trace"))
@@ -0,0 +1,273 @@
+# archive_store.py
+# 범공인 Pro v24 Enterprise - Archive Cold Store Module (v25.00 Tiered 종료 Sheets)
+# Feature: Compressed Parquet Parts, In-Memory Index Columns Only, Lazy Full-Row Load (Row Group), Delta Append + Tombstones, Compaction
+
+import os
+import json
+import time
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 콜드 스토어로 관리하는 시트 (계속 쌓이기만 하는 종료 시트)
+ARCHIVE_SHEETS = ["임대(종료)", "매매(종료)"]
+
+# 저장 위치: 시트별 폴더 = manifest.json + part-{seq}.parquet
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "archive")
+
+# 메모리에 올리는 컬럼 (목록 카드 / 필터 / 정렬 / 검색에 쓰는 컬럼만, 나머지는 상세 화면에서 행 단위로 로드)
+INDEX_COLS = ['IronID', '구분', '지역_구', '지역_동', '번지', '층', '호실', '면적', '보증금', '월차임', '관리비',
+              '권리금', '매매가', '수익률', '대지면적', '현업종', '건물명', '매물특징', '접수일']
+
+# 압축 / 행 그룹 크기 (상세 화면은 해당 행이 든 행 그룹 1개만 읽음)
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 1000
+
+# 행 순서 키 (시트 순서 유지: 내용이 바뀐 행은 뒤 파일로 가도 원래 자리 번호를 유지)
+ORDER_COL = "_ord"
+
+# 변경분 파일이 이보다 많아지면 1개로 합침 (삭제 표시도 정리)
+MAX_PARTS = 20
+
+# 시트 원본과 다시 맞추는 주기 (초) - 시트 직접 수정 / 다른 인스턴스의 쓰기는 이 주기 안에 반영
+RESYNC_SEC = 300
+
+def is_archive(sheet_name):
+    return sheet_name in ARCHIVE_SHEETS
+
+# ==============================================================================
+# [SECTION 2: FILES (manifest / parts)]
+# ==============================================================================
+
+_locks = {}
+_registry_lock = threading.Lock()
+
+def _lock(sheet_name):
+    with _registry_lock:
+        return _locks.setdefault(sheet_name, threading.RLock())
+
+def _dir(sheet_name):
+    return os.path.join(ARCHIVE_DIR, sheet_name)
+
+def _part_path(sheet_name, seq):
+    return os.path.join(_dir(sheet_name), f"part-{seq:06d}.parquet")
+
+def _manifest_path(sheet_name):
+    return os.path.join(_dir(sheet_name), "manifest.json")
+
+def read_manifest(sheet_name):
+    """
+    {"seq": 마지막 변경 번호, "parts": [번호...], "tombstones": {IronID: 삭제 번호}, "columns": [...],
+     "next_ord": 다음 행 순서 키, "synced_at", "synced_ts": 시트 원본과 마지막으로 맞춘 시각}
+    (저장소가 없으면 None)
+    """
+    try:
+        with open(_manifest_path(sheet_name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[Archive Manifest Error] {sheet_name}: {e}")
+        return None
+
+def _write_manifest(sheet_name, manifest):
+    """임시 파일에 쓴 뒤 교체 (manifest가 바뀌는 순간 변경이 확정됨)"""
+    tmp = _manifest_path(sheet_name) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp, _manifest_path(sheet_name))
+
+def has_store(sheet_name):
+    return is_archive(sheet_name) and read_manifest(sheet_name) is not None
+
+def is_stale(sheet_name, max_age=None):
+    """시트 원본과 마지막으로 맞춘 지 max_age초(기본 RESYNC_SEC)가 지났는지 (저장소가 없으면 False)"""
+    manifest = read_manifest(sheet_name) if is_archive(sheet_name) else None
+    max_age = RESYNC_SEC if max_age is None else max_age
+    return manifest is not None and time.time() - manifest.get("synced_ts", 0) > max_age
+
+def _storable(df):
+    """parquet 저장용: 섞인 타입(object) 컬럼은 문자열로 통일 (빈 값은 유지)"""
+    df = df.drop(columns=['선택'], errors='ignore').reset_index(drop=True)
+    for c in df.columns:
+        if df[c].dtype == object:
+            df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df
+
+def _write_part(sheet_name, seq, df):
+    tmp = _part_path(sheet_name, seq) + ".tmp"
+    _storable(df).to_parquet(tmp, index=False, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, _part_path(sheet_name, seq))
+
+def _live_mask(ids, part_seq, tombstones):
+    """part_seq 파일의 행 중 살아 있는 행 (같은 IronID가 이 파일 이후에 삭제/수정되지 않음)"""
+    if not tombstones: return np.ones(len(ids), dtype=bool)
+    dead_at = pd.Series(ids).map(tombstones).fillna(-1).to_numpy()
+    return dead_at <= part_seq
+
+# ==============================================================================
+# [SECTION 3: WRITE (전체 동기화 / 변경분 추가 / 합치기)]
+# ==============================================================================
+
+def sync(sheet_name, df, synced_ts=None):
+    """
+    시트 전체(정제 완료, IronID 포함)로 저장소를 새로 만듭니다. (최초 1회 / 주기적 재동기화 / 관리자 재동기화)
+    synced_ts: 원본과 맞춘 시각 (기본 지금, 저장소 자체 데이터로 합칠 때는 기존 값 유지)
+    """
+    with _lock(sheet_name):
+        old = read_manifest(sheet_name) or {}
+        seq = old.get("seq", -1) + 1
+        os.makedirs(_dir(sheet_name), exist_ok=True)
+        _write_part(sheet_name, seq, df.assign(**{ORDER_COL: np.arange(len(df))}))
+        _write_manifest(sheet_name, {"seq": seq, "parts": [seq], "tombstones": {},
+                                     "columns": [c for c in df.columns if c not in ['선택', ORDER_COL]],
+                                     "next_ord": len(df), "synced_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                     "synced_ts": synced_ts or time.time()})
+        for p in old.get("parts", []):
+            if p != seq and os.path.exists(_part_path(sheet_name, p)): os.remove(_part_path(sheet_name, p))
+        _invalidate(sheet_name)
+
+def apply_changes(sheet_name, added, removed_ids):
+    """
+    시트 쓰기 후 변경분만 반영합니다.
+    added: 새로 들어왔거나 내용이 바뀐 행 (정제 완료), removed_ids: 빠졌거나 내용이 바뀐 행의 IronID
+    """
+    if not has_store(sheet_name): return
+    with _lock(sheet_name):
+        index = get_index(sheet_name)
+        manifest = read_manifest(sheet_name)
+        seq = manifest["seq"] + 1
+        for iid in removed_ids:
+            manifest["tombstones"][str(iid)] = seq
+        if added is not None and len(added):
+            # 기존 행은 원래 순서 키, 새 행은 맨 뒤
+            ords = [index.order_of.get(str(i)) for i in added['IronID']]
+            for i, o in enumerate(ords):
+                if o is None:
+                    ords[i] = manifest["next_ord"]
+                    manifest["next_ord"] += 1
+            _write_part(sheet_name, seq, added.assign(**{ORDER_COL: ords}))
+            manifest["parts"].append(seq)
+            manifest["columns"] += [c for c in added.columns if c not in manifest["columns"] and c not in ['선택', ORDER_COL]]
+        manifest["seq"] = seq
+        _write_manifest(sheet_name, manifest)
+        _invalidate(sheet_name)
+        if len(manifest["parts"]) > MAX_PARTS:
+            compact(sheet_name)
+
+def compact(sheet_name):
+    """변경분 파일과 삭제 표시를 파일 1개로 합칩니다."""
+    with _lock(sheet_name):
+        df = read_sheet(sheet_name)
+        if df is not None: sync(sheet_name, df, read_manifest(sheet_name).get("synced_ts", 0))
+
+def remove_store(sheet_name):
+    with _lock(sheet_name):
+        shutil.rmtree(_dir(sheet_name), ignore_errors=True)
+        _invalidate(sheet_name)
+
+# ==============================================================================
+# [SECTION 4: READ (인덱스 / 행 단위 / 전체)]
+# ==============================================================================
+
+class ArchiveIndex:
+    """
+    시트 1개의 메모리 상주 부분
+    - frame: 인덱스 컬럼만 (시트 순서)
+    - locator: IronID → (파일 번호, 파일 내 행 위치), order_of: IronID → 순서 키
+    """
+    def __init__(self, sheet_name, manifest):
+        self.seq = manifest["seq"]
+        self.columns = manifest["columns"]
+        cols = [c for c in INDEX_COLS if c in self.columns]
+        frames = []
+        for p in manifest["parts"]:
+            path = _part_path(sheet_name, p)
+            names = pq.read_schema(path).names
+            part = pd.read_parquet(path, columns=[c for c in cols + [ORDER_COL] if c in names])
+            live = _live_mask(part['IronID'].astype(str).to_numpy(), p, manifest["tombstones"])
+            frames.append(part[live].assign(_part=p, _row=np.flatnonzero(live)))
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=cols + [ORDER_COL, '_part', '_row'])
+        frame = frame.sort_values(ORDER_COL, kind='stable').reset_index(drop=True)
+        ids = frame['IronID'].astype(str).tolist()
+        self.locator = dict(zip(ids, zip(frame['_part'].astype(int).tolist(), frame['_row'].astype(int).tolist())))
+        self.order_of = dict(zip(ids, frame[ORDER_COL].astype(int).tolist()))
+        self.frame = frame.reindex(columns=cols)
+
+_indexes = {}
+
+def _invalidate(sheet_name):
+    _indexes.pop(sheet_name, None)
+
+def get_index(sheet_name):
+    """저장소 인덱스 (manifest가 바뀌었으면 다시 읽음, 저장소가 없으면 None)"""
+    manifest = read_manifest(sheet_name) if is_archive(sheet_name) else None
+    if manifest is None: return None
+    with _lock(sheet_name):
+        index = _indexes.get(sheet_name)
+        if index is None or index.seq != manifest["seq"]:
+            index = _indexes[sheet_name] = ArchiveIndex(sheet_name, manifest)
+        return index
+
+def load_index(sheet_name):
+    """목록 화면용 데이터 (인덱스 컬럼만, 저장소가 없으면 None)"""
+    index = get_index(sheet_name)
+    return index.frame.copy() if index is not None else None
+
+def read_rows(sheet_name, iron_ids):
+    """
+    IronID 행 전체 컬럼 로드 (행이 든 행 그룹만 읽음)
+    Returns: 데이터프레임 (없는 IronID는 빠짐)
+    """
+    index = get_index(sheet_name)
+    if index is None: return None
+    wanted = {}
+    for iid in iron_ids:
+        loc = index.locator.get(str(iid))
+        if loc: wanted.setdefault(loc[0], []).append(loc[1])
+    rows = []
+    for part, positions in wanted.items():
+        pf = pq.ParquetFile(_part_path(sheet_name, part))
+        starts = np.cumsum([0] + [pf.metadata.row_group(g).num_rows for g in range(pf.num_row_groups)])
+        for g in sorted({int(np.searchsorted(starts, pos, side='right') - 1) for pos in positions}):
+            group = pf.read_row_group(g).to_pandas()
+            local = [pos - starts[g] for pos in positions if starts[g] <= pos < starts[g + 1]]
+            rows.append(group.iloc[local])
+    if not rows: return pd.DataFrame(columns=index.columns)
+    return pd.concat(rows, ignore_index=True).reindex(columns=index.columns)
+
+def read_row(sheet_name, iron_id):
+    """IronID 1건의 전체 행 (dict, 없으면 None)"""
+    rows = read_rows(sheet_name, [iron_id])
+    return rows.iloc[0].to_dict() if rows is not None and len(rows) else None
+
+def read_sheet(sheet_name):
+    """
+    시트 전체 (모든 컬럼, 살아 있는 행만, 시트에 쌓인 순서) - 합치기(compact)용
+    Returns: 데이터프레임 또는 None (저장소 없음)
+    """
+    manifest = read_manifest(sheet_name) if is_archive(sheet_name) else None
+    if manifest is None: return None
+    parts = []
+    for p in manifest["parts"]:
+        part = pd.read_parquet(_part_path(sheet_name, p))
+        parts.append(part[_live_mask(part['IronID'].astype(str).to_numpy(), p, manifest["tombstones"])])
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[ORDER_COL])
+    return df.sort_values(ORDER_COL, kind='stable').reset_index(drop=True).reindex(columns=manifest["columns"])
+
+def status(sheet_name):
+    """관리자 화면용 요약 (행 수 / 파일 수 / 디스크 용량 / 메모리 인덱스 크기)"""
+    manifest = read_manifest(sheet_name)
+    if manifest is None: return None
+    index = get_index(sheet_name)
+    disk = sum(os.path.getsize(_part_path(sheet_name, p)) for p in manifest["parts"] if os.path.exists(_part_path(sheet_name, p)))
+    return {"시트": sheet_name, "행 수": len(index.frame), "파일 수": len(manifest["parts"]),
+            "삭제 표시": len(manifest["tombstones"]), "디스크 KB": round(disk / 1024, 1),
+            "메모리 KB": round(index.frame.memory_usage(deep=True).sum() / 1024, 1),
+            "동기화 시각": manifest.get("synced_at", "")}
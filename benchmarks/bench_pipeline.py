@@ -0,0 +1,283 @@
+# bench_pipeline.py
+# 범공인 Pro v24 Enterprise - Data Pipeline Benchmarks (v25.00 Regression Guard)
+# Feature: Load / Sanitize / Signature / Filter / Search / Fuzzy Search / 번지 Lookup / Unified Search / Archive Store / Sort / Diff / Save / Write-Path / Write-Behind Benchmarks
+#
+# 각 bench_* 함수는 준비된 fixture(dict)를 받아 측정 대상 작업을 1회 수행합니다.
+# 실행/기록/기준선 비교는 run_benchmarks.py가 담당합니다.
+
+import os
+import tempfile
+import threading
+import itertools
+import uuid
+import numpy as np
+import core_engine as engine
+import list_renderer
+import sort_engine
+import sql_engine
+import storage_backend
+import write_queue
+import dedup_engine
+import address_index
+import fuzzy_search
+import unified_search
+import archive_store
+from synthetic_listings import make_raw_sheet
+
+# 편집 비교(diff) 대상 행 수 상한 - 실제 저장은 편집기 화면 단위로 일어나므로 전체 시트 대신 이 크기로 측정
+DIFF_ROWS_MAX = 2000
+# 편집된 것으로 만들 행 비율
+DIFF_CHANGE_RATIO = 0.01
+
+# 세컨드 매칭(IronID 없는 행 찾기) 벤치마크의 조회 건수
+SECOND_MATCH_LOOKUPS = 100
+
+# 동시 저장 벤치마크의 동시 사용자(스레드) 수
+CONCURRENT_EDITS = 8
+
+# 번지 검색 벤치마크 검색어 (정확 / 본번 전체 / 본번 범위 / 산)
+BUNJI_QUERIES = ["123-4", "45-*", "100~200", "산 12"]
+
+# 오타 허용 검색 벤치마크 검색어 (정상 / 오타 / 초성 / 여러 단어)
+FUZZY_QUERIES = ["역삼동", "역상동", "ㅇㅅㄷ", "당선동 무궈리"]
+
+# 트랜잭션 벤치마크에서 종료 시트로 옮겼다가 되돌리는 행 수
+TRANSACTION_ROWS = 10
+
+# 보관소 벤치마크에서 한 번에 불러오는 행 수 (상세 화면 진입 / 복구 대상)
+ARCHIVE_ROWS = 10
+
+# 대표 필터 조합 (구 2개 + 금액/면적/층 범위)
+RENT_FILTER = {"selected_gu": ["강남구", "마포구"], "min_dep": 1000.0, "max_dep": 20000.0,
+               "min_rent": 50.0, "max_rent": 800.0, "min_area": 10.0, "max_area": 60.0,
+               "min_fl": -1.0, "max_fl": 5.0, "is_no_kwon": False}
+SALE_FILTER = {"selected_gu": ["강남구", "마포구"], "min_price": 100000.0, "max_price": 2000000.0,
+               "min_yield": 3.0, "max_yield": 100.0, "min_area": 10.0, "max_area": 100.0,
+               "min_fl": -1.0, "max_fl": 10.0}
+
+# ==============================================================================
+# [SECTION 1: FIXTURE]
+# ==============================================================================
+
+def _fill_iron_ids(df):
+    """load_sheet_data와 동일하게 빈 IronID를 채우고 '선택' 컬럼을 붙입니다."""
+    empty = df['IronID'].isna() | (df['IronID'].astype(str).str.strip() == "")
+    df.loc[empty, 'IronID'] = [str(uuid.uuid4()) for _ in range(int(empty.sum()))]
+    df.insert(0, '선택', False)
+    return df
+
+def prepare(n_rows, kind="임대", seed=0, workdir=None, latency_ms=0.0, bandwidth_kbps=0.0):
+    """
+    벤치마크 공용 입력을 만듭니다.
+    raw: 원본(시트 CSV 그대로), clean: 로드 완료 상태,
+    original/edited: 편집 전후 프레임, changed_ids: 실제 변경된 IronID
+    storage: 로컬 시트 대역 (core_engine 쓰기 경로가 이 백엔드를 사용하도록 교체)
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="bench_")
+    raw = make_raw_sheet(n_rows, kind=kind, seed=seed)
+
+    clean = _fill_iron_ids(engine.sanitize_dataframe(engine.normalize_headers(raw.copy())))
+
+    rng = np.random.default_rng(seed + 1)
+    original = clean.iloc[:DIFF_ROWS_MAX].copy()
+    edited = original.copy()
+    n_change = max(1, int(len(edited) * DIFF_CHANGE_RATIO))
+    rows = rng.choice(len(edited), n_change, replace=False)
+    edited.iloc[rows, edited.columns.get_loc('월차임')] = edited['월차임'].iloc[rows] + 10
+    changed_ids = edited['IronID'].iloc[rows].tolist()
+
+    mirror = sql_engine.ListingMirror(("bench", kind), "매매" in kind)
+    mirror.build(clean)
+
+    storage = storage_backend.LocalSheetBackend(os.path.join(workdir, "sheets"),
+                                                latency_ms=latency_ms, bandwidth_kbps=bandwidth_kbps)
+    sheet = clean.drop(columns=['선택'])
+    storage.seed(f"{kind}_원본", raw)
+    storage.seed(kind, sheet)
+    storage.seed(f"{kind}(종료)", sheet.iloc[:0])
+    storage.seed(f"{kind}브리핑", sheet.iloc[:0])
+    storage_backend.use_backend(storage)
+
+    # 종료 시트 보관소: 작업 폴더에 생성, 다른 벤치마크의 종료 시트와 겹치지 않도록 반대 종류 종료 시트 이름 사용
+    archive_store.ARCHIVE_DIR = os.path.join(workdir, "archive")
+    ended_copy = _fill_iron_ids(engine.sanitize_dataframe(engine.normalize_headers(
+        make_raw_sheet(max(1, n_rows // 2), kind=kind, seed=seed + 2))))
+    archive = [s for s in archive_store.ARCHIVE_SHEETS if s != f"{kind}(종료)"][0]
+    storage.seed(archive, ended_copy.drop(columns=['선택']))
+    archive_store.sync(archive, ended_copy)
+
+    return {
+        "kind": kind, "is_sale": "매매" in kind, "rows": n_rows, "workdir": workdir,
+        "raw": raw, "clean": clean,
+        "original": original, "edited": edited, "changed_ids": changed_ids,
+        "sheet": engine.normalize_headers(raw.copy()),
+        "lookups": [dict(clean.iloc[i].to_dict(), IronID=None)
+                    for i in rng.choice(len(clean), min(SECOND_MATCH_LOOKUPS, len(clean)), replace=False)],
+        "filter": SALE_FILTER if "매매" in kind else RENT_FILTER,
+        "storage": storage, "ended": f"{kind}(종료)", "mirror": mirror,
+        "queue": write_queue.WriteQueue(os.path.join(workdir, "write_journal.jsonl")),
+        "ended_copy": ended_copy, "archive": archive,
+        "new_bunji": itertools.count(10000),
+    }
+
+# ==============================================================================
+# [SECTION 2: BENCHMARKS]
+# ==============================================================================
+
+def bench_load(fx):
+    """시트 CSV 내려받기 + 헤더 표준화 + 정제 (원본 시트 기준, 주입 지연 포함)"""
+    df = engine.sanitize_dataframe(engine.normalize_headers(fx["storage"].export(f"{fx['kind']}_원본")))
+    assert len(df) == fx["rows"]
+
+def bench_sanitize(fx):
+    """헤더 표준화 + 값 정제 (메모리 상 원본 기준)"""
+    engine.sanitize_dataframe(engine.normalize_headers(fx["raw"].copy()))
+
+def bench_signature(fx):
+    """세컨드 매칭용 서명 생성 (번지 + 층 + 면적, 64비트 해시 + 서명 인덱스)"""
+    engine.SignatureIndex(fx["clean"])
+
+def bench_second_match(fx):
+    """IronID 없는 행 찾기 (정제 전 서버 시트에서 세컨드 매칭, 인덱스 1회 생성 + 조회 반복)"""
+    sheet = fx["sheet"].copy()
+    for row in fx["lookups"]:
+        row_idx, _ = engine.locate_row(sheet, row)
+        assert row_idx is not None
+
+def bench_fingerprints(fx):
+    """행 지문 계산 (시트 로드 직후 1회, 낙관적 동시성 검사 기준)"""
+    engine.compute_row_fingerprints(fx["clean"])
+
+def bench_filter(fx):
+    """목록 화면 필터 체인 (구 + 금액/면적/층 범위)"""
+    list_renderer.filter_listings(fx["clean"], fx["filter"], fx["is_sale"])
+
+def bench_fuzzy_search(fx):
+    """오타 허용 검색 (인덱스 1회 생성 + 정상/오타/초성/여러 단어 검색)"""
+    df = fx["clean"].copy()
+    for query in FUZZY_QUERIES:
+        fuzzy_search.search(df, query)
+
+def bench_bunji_lookup(fx):
+    """번지 검색 (인덱스 1회 생성 + 정확/본번 전체/본번 범위 조회, 목록 필터 경로)"""
+    df = fx["clean"].copy()
+    for query in BUNJI_QUERIES:
+        list_renderer.filter_listings(df, {"exact_bunji": query}, fx["is_sale"])
+    assert address_index.get_index(df).parsed > 0
+
+def bench_unified_load(fx):
+    """전체 시트 검색용 동시 로드 (같은 종류 시트 3개를 동시에 내려받아 정제 + 합친 인덱스, 주입 지연 포함)"""
+    sheets = [fx["kind"], fx["ended"], f"{fx['kind']}브리핑"]
+    frames, errors, _ = unified_search.load_sheets(sheets)
+    assert not errors, errors
+    unified_search.CombinedIndex(frames)
+
+def bench_unified_search(fx):
+    """전체 시트 검색 (원본 + 종료 시트 합친 인덱스 생성 + 키워드 / 번지 범위 / 금액 범위 조회)"""
+    index = unified_search.CombinedIndex({fx["kind"]: fx["clean"], fx["ended"]: fx["ended_copy"]})
+    index.search(keyword="역세권")
+    index.search(bunji="100~200")
+    index.search(keyword="역삼동", ranges={"면적": (10.0, 60.0)})
+
+def bench_search(fx):
+    """통합 검색 (전체 컬럼 부분 문자열 검색)"""
+    list_renderer.filter_listings(fx["clean"], {"search_keyword": "역세권"}, fx["is_sale"])
+
+def bench_sort(fx):
+    """평당가 정렬 순열 계산"""
+    sort_engine.sort_permutation(fx["clean"], "unit_price", fx["is_sale"], descending=True)
+
+def bench_sql_sync(fx):
+    """SQL 미러 생성 (테이블 적재 + 인덱스, 백그라운드 동기화 1회 비용)"""
+    sql_engine.ListingMirror(("bench", "sync"), fx["is_sale"]).build(fx["clean"])
+
+def bench_sql_page(fx):
+    """SQL 미러 페이지 조회 (건수 + 평당가 정렬 첫 페이지, bench_filter와 같은 필터)"""
+    mirror = fx["mirror"]
+    mirror.count(fx["filter"])
+    mirror.page(fx["filter"], "unit_price", True, 0, list_renderer.ITEMS_PER_PAGE)
+
+def bench_card_texts(fx):
+    """카드 본문 마크다운 생성 (스크롤 모드 최대 표시량 기준)"""
+    list_renderer.build_card_texts(fx["clean"].iloc[:list_renderer.SCROLL_BLOCK_SIZE * list_renderer.SCROLL_MAX_BLOCKS], fx["is_sale"])
+
+def bench_diff(fx):
+    """편집 전후 변경 행 탐색 (리스트 편집기 일괄 저장 1단계)"""
+    changed = engine.find_changed_ids(fx["edited"], fx["original"])
+    assert len(changed) == len(fx["changed_ids"])
+
+def bench_save(fx):
+    """변경 행을 전체 시트에 반영 + CSV 직렬화 (업로드 페이로드 생성 비용)"""
+    sheet = fx["clean"].copy()
+    engine.apply_changed_rows(sheet, fx["edited"], fx["changed_ids"])
+    sheet.to_csv(index=False)
+
+def bench_update_single_row(fx):
+    """상세 화면 단일 행 저장 (시트 읽기 + IronID 매칭 + 시트 쓰기)"""
+    row = fx["clean"].iloc[len(fx["clean"]) // 2].to_dict()
+    row['월차임'] = float(row.get('월차임') or 0) + 1
+    ok, msg = engine.update_single_row(row, fx["kind"])
+    assert ok, msg
+
+def bench_concurrent_updates(fx):
+    """여러 세션이 동시에 서로 다른 행 저장 (쓰기 조정기가 묶어서 1회 읽기 + 1회 쓰기, 유실 없음)"""
+    step = max(1, len(fx["clean"]) // CONCURRENT_EDITS)
+    rows = [fx["clean"].iloc[i * step].to_dict() for i in range(CONCURRENT_EDITS)]
+    results = [None] * len(rows)
+
+    def _save(i):
+        rows[i]['월차임'] = float(rows[i].get('월차임') or 0) + 1
+        results[i] = engine.update_single_row(rows[i], fx["kind"])
+
+    threads = [threading.Thread(target=_save, args=(i,)) for i in range(len(rows))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert all(ok for ok, _ in results), results
+
+def bench_enqueue(fx):
+    """상세 화면 저장 요청 응답 (저널 기록까지, 시트 반영은 워커가 뒤에서 처리)"""
+    row = fx["clean"].iloc[len(fx["clean"]) // 3].to_dict()
+    row['월차임'] = float(row.get('월차임') or 0) + 1
+    fx["queue"].enqueue(fx["kind"], row)
+
+def bench_add_new_row(fx):
+    """신규 매물 등록 (중복 검사 + 시트 읽기 + 컬럼 맞춤 + 추가 쓰기, 호출마다 1행씩 늘어남)"""
+    ok, msg = engine.add_new_row({"구분": "상가", "지역_구": "마포구", "지역_동": "서교동", "번지": f"{next(fx['new_bunji'])}-4",
+                                  "층": 1, "보증금": 3000, "월차임": 150, "면적": 20}, fx["kind"])
+    assert ok, msg
+
+def bench_dedup(fx):
+    """중복 의심 탐지 (같은 종류 시트 2개 = 원본 + 절반 크기 종료 시트, 동/본번 블록 후 유사도)"""
+    dedup_engine.find_duplicates({fx["kind"]: fx["clean"], fx["ended"]: fx["ended_copy"]}, fx["is_sale"])
+
+def bench_archive_load(fx):
+    """종료 시트 보관소 인덱스 로드 (인덱스 컬럼만 읽기, 다운로드/정제 없음 - bench_load와 비교)"""
+    index = archive_store.ArchiveIndex(fx["archive"], archive_store.read_manifest(fx["archive"]))
+    assert len(index.frame) == len(fx["ended_copy"])
+
+def bench_archive_rows(fx):
+    """보관소 행 단위 로드 (상세 화면 진입 ARCHIVE_ROWS건, 행이 든 행 그룹만 읽기)"""
+    ids = fx["ended_copy"]['IronID'].iloc[::max(1, len(fx["ended_copy"]) // ARCHIVE_ROWS)].iloc[:ARCHIVE_ROWS]
+    assert len(archive_store.read_rows(fx["archive"], ids)) == len(ids)
+
+def bench_archive_restore(fx):
+    """보관소에서 복구 후 다시 종료 (시트 읽기 2회 + 쓰기 2회, 보관소에는 변경분만 추가 기록)"""
+    ids = fx["ended_copy"]['IronID'].iloc[:ARCHIVE_ROWS].tolist()
+    ok, msg, _ = engine.execute_transactions([("restore", ids, fx["archive"], fx["kind"]),
+                                              ("move", ids, fx["kind"], fx["archive"])])
+    assert ok, msg
+
+def bench_transaction(fx):
+    """종료 처리 후 복구 (이동 트랜잭션 2회 따로 실행, 시트 읽기 4회 + 쓰기 4회)"""
+    rows = fx["clean"].iloc[:TRANSACTION_ROWS]
+    ok, msg, _ = engine.execute_transaction("move", rows, fx["kind"], fx["ended"])
+    assert ok, msg
+    ok, msg, _ = engine.execute_transaction("restore", rows, fx["ended"], fx["kind"])
+    assert ok, msg
+
+def bench_transaction_batch(fx):
+    """종료 처리 + 복구를 한 트랜잭션으로 계획 (시트 읽기 2회 + 쓰기 2회)"""
+    ids = fx["clean"]['IronID'].iloc[:TRANSACTION_ROWS].tolist()
+    ok, msg, _ = engine.execute_transactions([("move", ids, fx["kind"], fx["ended"]),
+                                              ("restore", ids, fx["ended"], fx["kind"])])
+    assert ok, msg
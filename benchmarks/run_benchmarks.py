@@ -0,0 +1,158 @@
+# run_benchmarks.py
+# 범공인 Pro v24 Enterprise - Benchmark Runner (v25.00 Regression Guard)
+# Feature: bench_* Discovery, Warmup + Repeat Timing, JSON Results, Baseline Comparison, Regression Exit Code
+#
+# 사용법:
+#   python benchmarks/run_benchmarks.py --rows 10000                 # 측정 + 기준선 비교
+#   python benchmarks/run_benchmarks.py --rows 10000 --save-baseline # 현재 결과를 기준선으로 저장
+#   python benchmarks/run_benchmarks.py --rows 100000 --only filter,sort
+#   python benchmarks/run_benchmarks.py --latency-ms 300 --bandwidth-kbps 2000  # 시트 왕복 비용 주입
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))  # 루트 모듈(core_engine 등) 임포트용
+
+import bench_pipeline
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+# 기준선 대비 중앙값이 이 비율 이상 느려지면 회귀로 판정
+REGRESSION_THRESHOLD = 1.20
+
+# ==============================================================================
+# [SECTION 2: RUN]
+# ==============================================================================
+
+def discover(only=None):
+    """bench_pipeline의 bench_* 함수 목록 (정의 순서)"""
+    benches = [(name[len("bench_"):], fn) for name, fn in vars(bench_pipeline).items()
+               if name.startswith("bench_") and callable(fn)]
+    if only:
+        benches = [(name, fn) for name, fn in benches if name in only]
+    return benches
+
+def time_bench(fn, fx, repeat, warmup=1):
+    """워밍업 후 repeat회 측정한 소요시간(ms) 목록"""
+    for _ in range(warmup):
+        fn(fx)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(fx)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+def run(rows, kind, repeat, only=None, seed=0, latency_ms=0.0, bandwidth_kbps=0.0):
+    print(f"[Bench] 합성 데이터 준비: {kind} {rows:,}건 (지연 {latency_ms}ms, 대역폭 {bandwidth_kbps or '무제한'}kbps)")
+    fx = bench_pipeline.prepare(rows, kind=kind, seed=seed, latency_ms=latency_ms, bandwidth_kbps=bandwidth_kbps)
+    results = {}
+    for name, fn in discover(only):
+        fx["storage"].reset_stats()  # 시트 읽기/쓰기 횟수·바이트를 벤치별로 집계
+        try:
+            samples = time_bench(fn, fx, repeat)
+            # 백그라운드 시트 반영이 다음 측정에 섞이지 않도록 대기열 비우기
+            fx["queue"].wait_idle()
+            results[name] = {"min_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3),
+                             "max_ms": round(max(samples), 3), "repeat": repeat,
+                             "storage": dict(fx["storage"].stats)}
+            print(f"  {name:<18} min {results[name]['min_ms']:>10.2f}ms   median {results[name]['median_ms']:>10.2f}ms")
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  {name:<18} ❌ {results[name]['error']}")
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "rows": rows, "kind": kind, "seed": seed,
+        "latency_ms": latency_ms, "bandwidth_kbps": bandwidth_kbps,
+        "python": platform.python_version(), "machine": platform.machine(), "results": results,
+    }
+
+# ==============================================================================
+# [SECTION 3: RESULTS & BASELINE]
+# ==============================================================================
+
+def _run_key(report):
+    return f"{report['kind']}:{report['rows']}:{report.get('latency_ms', 0)}:{report.get('bandwidth_kbps', 0)}"
+
+def save_report(report):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{report['kind']}_{report['rows']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(report):
+    """기준선은 실행 조건(구분:행수:지연:대역폭)별로 보관합니다."""
+    baseline = load_baseline()
+    baseline[_run_key(report)] = report
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+    return BASELINE_PATH
+
+def compare(report, threshold=REGRESSION_THRESHOLD):
+    """
+    같은 조건의 기준선과 중앙값을 비교합니다.
+    Returns: 회귀 항목 이름 목록 (기준선이 없으면 None)
+    """
+    base = load_baseline().get(_run_key(report))
+    if not base: return None
+    regressions = []
+    print(f"\n[Bench] 기준선 비교 ({base['timestamp']}, 임계 {threshold:.0%})")
+    for name, cur in report["results"].items():
+        ref = base["results"].get(name)
+        if not ref or "median_ms" not in ref or "median_ms" not in cur:
+            continue
+        ratio = cur["median_ms"] / ref["median_ms"] if ref["median_ms"] else 1.0
+        flag = "🔴 회귀" if ratio >= threshold else ("🟢 개선" if ratio <= 1 / threshold else "")
+        if ratio >= threshold: regressions.append(name)
+        print(f"  {name:<18} {ref['median_ms']:>10.2f}ms → {cur['median_ms']:>10.2f}ms  (x{ratio:.2f}) {flag}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="데이터 파이프라인 벤치마크")
+    parser.add_argument("--rows", type=int, default=10000, help="합성 시트 행 수 (예: 10000 / 100000 / 1000000)")
+    parser.add_argument("--kind", choices=["임대", "매매"], default="임대")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default="", help="쉼표로 구분한 벤치마크 이름 (예: filter,sort)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="로컬 시트 대역의 호출당 지연")
+    parser.add_argument("--bandwidth-kbps", type=float, default=0.0, help="로컬 시트 대역의 전송 속도 (0 = 무제한)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    only = {s.strip() for s in args.only.split(",") if s.strip()} or None
+    report = run(args.rows, args.kind, args.repeat, only=only, seed=args.seed,
+                 latency_ms=args.latency_ms, bandwidth_kbps=args.bandwidth_kbps)
+    print(f"\n[Bench] 결과 저장 → {save_report(report)}")
+
+    if args.save_baseline:
+        print(f"[Bench] 기준선 저장 → {save_baseline(report)}")
+        sys.exit(0)
+
+    regressions = compare(report, args.threshold)
+    if regressions is None:
+        print("[Bench] 같은 조건의 기준선이 없습니다. --save-baseline 으로 먼저 저장하세요.")
+    elif regressions:
+        print(f"[Bench] ❌ 성능 회귀: {', '.join(regressions)}")
+        sys.exit(1)
+    else:
+        print("[Bench] ✅ 회귀 없음")
@@ -0,0 +1,177 @@
+# synthetic_listings.py
+# 범공인 Pro v24 Enterprise - Synthetic Listing Generator (v25.00 Benchmark Fixture)
+# Feature: Realistic 임대/매매 Sheets, Messy Headers, Mixed Units, Blank IronIDs, CSV Export
+#
+# 사용법: python benchmarks/synthetic_listings.py --rows 100000 --kind 매매 --out /tmp/sale.csv
+
+import uuid
+import argparse
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: VOCABULARY]
+# ==============================================================================
+
+# 구 -> 동 (서울 주요 상권)
+REGIONS = {
+    "강남구": ["역삼동", "논현동", "삼성동", "신사동", "청담동", "대치동"],
+    "서초구": ["서초동", "반포동", "방배동", "양재동"],
+    "마포구": ["서교동", "합정동", "망원동", "연남동", "상수동"],
+    "송파구": ["잠실동", "방이동", "문정동", "가락동"],
+    "용산구": ["이태원동", "한남동", "한강로동"],
+    "성동구": ["성수동1가", "성수동2가", "행당동"],
+    "영등포구": ["여의도동", "영등포동", "당산동"],
+    "종로구": ["종로1가", "관철동", "익선동"],
+}
+CATEGORIES_RENT = ["상가", "사무실", "상가주택", "오피스텔", "공장/창고"]
+CATEGORIES_SALE = ["상가건물", "꼬마빌딩", "근린생활시설", "상가", "토지"]
+BUSINESSES = ["카페", "음식점", "편의점", "미용실", "학원", "공실", "사무실", "약국", "주점", "-"]
+FEATURES = ["대로변 코너", "역세권 도보 3분", "유동인구 많음", "무권리", "주차 2대 가능", "렌트프리 협의",
+            "층고 높음", "신축", "리모델링 완료", "테라스 있음", "1층 가시성 좋음", "즉시 입주"]
+
+# 표준 컬럼 -> 실제 시트에서 쓰이는 헤더 표기 (공백/단위 포함)
+HEADER_VARIANTS = {
+    "구분": ["구분", "매물구분", "종류"],
+    "지역_구": ["지역_구", "구", "시군구"],
+    "지역_동": ["지역_동", "동", "읍면동"],
+    "번지": ["번지", "지번", "세부주소"],
+    "층": ["층", "해당층", "층수"],
+    "호실": ["호실", "호"],
+    "보증금": ["보증금(만원)", "보증금 (만원)", "기보증금(만원)", "보증금"],
+    "월차임": ["월차임(만원)", "월세(만원)", "월세 (만원)", "월차임"],
+    "관리비": ["관리비(만원)", "관리비"],
+    "권리금": ["권리금(만원)", "권리금_입금가(만원)", "권리금"],
+    "매매가": ["매매가(만원)", "매매금액(만원)", "매매가"],
+    "수익률": ["수익률(%)", "수익률"],
+    "면적": ["전용면적(평)", "실평수", "면적"],
+    "대지면적": ["대지면적(평)", "대지"],
+    "연면적": ["연면적(평)", "연면적"],
+    "현업종": ["현업종"],
+    "매물특징": ["매물특징", "특징", "내용", "메모"],
+    "연락처": ["연락처", "전화번호", "임대인연락처"],
+    "접수일": ["접수일"],
+    "IronID": ["IronID"],
+}
+
+RENT_COLS = ["구분", "지역_구", "지역_동", "번지", "층", "호실", "보증금", "월차임", "관리비", "권리금",
+             "면적", "현업종", "매물특징", "연락처", "접수일", "IronID"]
+SALE_COLS = ["구분", "지역_구", "지역_동", "번지", "층", "매매가", "수익률", "보증금", "월차임",
+             "대지면적", "연면적", "면적", "현업종", "매물특징", "연락처", "접수일", "IronID"]
+
+# ==============================================================================
+# [SECTION 2: VALUE GENERATORS (열 단위 일괄 생성)]
+# ==============================================================================
+
+def _money(rng, n, low, high, step):
+    """만원 단위 금액 - 콤마/단위/공백/빈칸이 섞인 문자열"""
+    vals = (rng.integers(low // step, high // step + 1, n) * step).astype(np.int64)
+    s = pd.Series(vals).map("{:,}".format)
+    style = rng.random(n)
+    s = s.where(style > 0.25, pd.Series(vals).astype(str))            # 콤마 없음
+    s = s.where((style < 0.25) | (style > 0.35), s + "만원")             # 단위 표기
+    s = s.where((style < 0.35) | (style > 0.40), " " + s + " ")         # 앞뒤 공백
+    s = s.where(style < 0.97, "")                                       # 빈칸
+    return s
+
+def _area(rng, n, low, high):
+    vals = np.round(rng.uniform(low, high, n), 1)
+    s = pd.Series(vals).astype(str)
+    style = rng.random(n)
+    s = s.where(style > 0.2, s + "평")
+    s = s.where((style < 0.2) | (style > 0.25), "약 " + s)
+    return s.where(style < 0.98, "")
+
+def _floor(rng, n):
+    base = rng.choice([1, 1, 1, 2, 2, 3, 4, 5, 7, 10, -1, -2], n)
+    s = pd.Series(base).astype(str)
+    style = rng.random(n)
+    s = s.where(style > 0.3, s + "층")
+    s = s.where(~((base < 0) & (style > 0.5)), "B" + pd.Series(-base).astype(str))
+    s = s.where(~((base < 0) & (style > 0.8)), "지하" + pd.Series(-base).astype(str) + "층")
+    return s
+
+def _bunji(rng, n):
+    main = rng.integers(1, 999, n).astype(str)
+    sub = rng.integers(0, 60, n)
+    s = pd.Series(main).where(sub == 0, pd.Series(main) + "-" + pd.Series(sub).astype(str))
+    return s.where(rng.random(n) > 0.02, "산 " + s)
+
+def _dates(rng, n):
+    days = rng.integers(0, 3 * 365, n)
+    d = pd.Timestamp("2022-01-01") + pd.to_timedelta(days, unit="D")
+    s = pd.Series(d.strftime("%Y-%m-%d"))
+    return s.where(rng.random(n) > 0.1, pd.Series(d.strftime("%Y.%m.%d")))
+
+# ==============================================================================
+# [SECTION 3: SHEET GENERATOR]
+# ==============================================================================
+
+def make_raw_sheet(n_rows, kind="임대", seed=0, blank_id_ratio=0.05, messy_headers=True):
+    """
+    구글 시트 CSV를 그대로 읽은 것과 같은 원본 데이터프레임을 생성합니다.
+    - 헤더는 시트마다 다른 표기(단위/공백 포함)로 섞이고, 값은 문자열(콤마/단위/빈칸 혼재)
+    - IronID 일부는 비어 있어 로드 시 자동 생성 경로를 탑니다.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_rows)
+    is_sale = "매매" in kind
+
+    gu_names = list(REGIONS.keys())
+    gu = rng.choice(gu_names, n)
+    dong = np.empty(n, dtype=object)
+    for g in gu_names:
+        mask = gu == g
+        dong[mask] = rng.choice(REGIONS[g], int(mask.sum()))
+
+    data = {
+        "구분": rng.choice(CATEGORIES_SALE if is_sale else CATEGORIES_RENT, n),
+        "지역_구": gu,
+        "지역_동": dong,
+        "번지": _bunji(rng, n),
+        "층": _floor(rng, n),
+        "호실": pd.Series(rng.integers(101, 1201, n)).astype(str).where(rng.random(n) > 0.6, ""),
+        "면적": _area(rng, n, 5, 120),
+        "현업종": rng.choice(BUSINESSES, n),
+        "매물특징": pd.Series(rng.choice(FEATURES, n)) + ", " + pd.Series(rng.choice(FEATURES, n)),
+        "연락처": pd.Series(rng.integers(1000, 9999, n)).map(lambda x: f"010-{x}-") + pd.Series(rng.integers(1000, 9999, n)).astype(str),
+        "접수일": _dates(rng, n),
+        "IronID": pd.Series([str(uuid.UUID(int=int(x))) for x in rng.integers(0, 2**63, n)]).where(rng.random(n) > blank_id_ratio, ""),
+    }
+    if is_sale:
+        data.update({
+            "매매가": _money(rng, n, 50000, 3000000, 1000),
+            "수익률": pd.Series(np.round(rng.uniform(1.5, 6.5, n), 2)).astype(str) + np.where(rng.random(n) > 0.5, "%", ""),
+            "보증금": _money(rng, n, 0, 50000, 500),
+            "월차임": _money(rng, n, 0, 3000, 10),
+            "대지면적": _area(rng, n, 20, 300),
+            "연면적": _area(rng, n, 40, 1200),
+        })
+    else:
+        data.update({
+            "보증금": _money(rng, n, 500, 30000, 500),
+            "월차임": _money(rng, n, 30, 2000, 10),
+            "관리비": _money(rng, n, 0, 100, 5),
+            "권리금": _money(rng, n, 0, 20000, 500).where(rng.random(n) > 0.3, "무권리"),
+        })
+
+    cols = SALE_COLS if is_sale else RENT_COLS
+    df = pd.DataFrame({c: np.asarray(data[c], dtype=object) for c in cols})
+    if messy_headers:
+        df.columns = [rng.choice(HEADER_VARIANTS[c]) for c in cols]
+    return df
+
+def write_sheet_csv(path, n_rows, kind="임대", seed=0):
+    """합성 시트를 CSV로 저장하고 경로를 반환합니다. (로드 벤치마크용)"""
+    make_raw_sheet(n_rows, kind=kind, seed=seed).to_csv(path, index=False)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 매물 시트 생성")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--kind", choices=["임대", "매매"], default="임대")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    write_sheet_csv(args.out, args.rows, kind=args.kind, seed=args.seed)
+    print(f"[Synthetic] {args.kind} {args.rows}건 → {args.out}")
@@ -4,11 +4,23 @@
 
 import streamlit as st
 import pandas as pd
-from streamlit_gsheets import GSheetsConnection
+import os
+import json
 import time
 import uuid
+import shutil
 import re
 import traceback
+import weakref
+import threading
+import numpy as np
+import location_features
+import tracing
+import storage_backend
+import write_coordinator
+import address_index
+import fuzzy_search
+import archive_store
 
 # ==============================================================================
 # [SECTION 1: GLOBAL CONFIGURATION]
@@ -30,6 +42,40 @@ NUMERIC_COLS = ["보증금", "월차임", "권리금", "관리비", "매매가",
 STRING_COLS = ["구분", "지역_구", "지역_동", "번지", "매물특징", "비고", "호실"]
 REQUIRED_COLS = ["번지"] 
 
+# 행 지문에서 제외할 컬럼 (화면 전용 선택 상태 / 배치로 결합되는 입지 정보)
+FINGERPRINT_EXCLUDE = ['선택', 'IronID'] + location_features.FEATURE_COLS
+
+# 세컨드 매칭 키 (서명 인덱스로 조회, 호실은 입력 값이 있을 때만 후보 중에서 추가 비교)
+MATCH_KEYS = ['번지', '층', '면적']
+
+# 트랜잭션 작업 종류 / 롤백 기록 보관 폴더 (성공 시 삭제, 롤백 실패 시에만 남음)
+TXN_ACTIONS = ["move", "restore", "copy", "delete"]
+ROLLBACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "txn_rollback")
+
+def get_storage():
+    """시트 저장소 백엔드 (기본: 구글 시트, secrets [storage]로 로컬 대역 선택)"""
+    return storage_backend.get_backend(SHEET_URL, SHEET_GIDS)
+
+def submit_sheet_edit(sheet_name, mutate):
+    """
+    시트 수정 1건을 쓰기 조정기에 등록합니다. (같은 시트 동시 요청은 잠금 + 1회 읽기/쓰기로 묶임)
+    Returns: (성공 여부, 메시지, 부가 결과)
+    """
+    storage = get_storage()
+    if not archive_store.has_store(sheet_name):
+        return write_coordinator.submit(sheet_name, mutate,
+                                        read=lambda name: normalize_headers(storage.read(name)), write=storage.write)
+
+    # 종료 시트: 쓰기 후 바뀐 행만 콜드 스토어에 반영 (읽은 원본과 비교)
+    before = {}
+    def _read(name):
+        before[name] = normalize_headers(storage.read(name))
+        return before[name].copy()
+    def _write(name, df):
+        storage.write(name, df)
+        record_archive_write(name, before.get(name), df)
+    return write_coordinator.submit(sheet_name, mutate, read=_read, write=_write)
+
 # ==============================================================================
 # [SECTION 2: DATA SANITIZATION ENGINE]
 # ==============================================================================
@@ -121,6 +167,27 @@ def validate_data_integrity(df):
         return False, "\n".join(errors)
     return True, "Integrity Check Passed"
 
+def apply_row_updates(df, iron_id, updates):
+    """
+    세션에 보관 중인 데이터프레임의 한 행(IronID 기준)에 수정값을 반영합니다.
+    (로드 시와 동일한 헤더 표준화/정제를 거쳐 타입을 맞춤)
+    """
+    if df is None or not iron_id or not updates: return df
+    clean = sanitize_dataframe(normalize_headers(pd.DataFrame([updates])))
+    mask = df['IronID'].astype(str) == str(iron_id)
+    for col in clean.columns:
+        if col in df.columns and col not in ['선택', 'IronID']:
+            try:
+                df.loc[mask, col] = clean.at[0, col]
+            except (TypeError, ValueError):
+                df[col] = df[col].astype(object)
+                df.loc[mask, col] = clean.at[0, col]
+    if any(c in clean.columns for c in ['번지', '지역_구', '지역_동']):
+        address_index.invalidate(df)
+    if any(c in clean.columns for c in fuzzy_search.INDEX_COLS):
+        fuzzy_search.invalidate(df)
+    return df
+
 # ==============================================================================
 # [SECTION 3: CORE LOAD ENGINE]
 # ==============================================================================
@@ -133,7 +200,7 @@ def initialize_search_state():
         st.session_state.editor_key_version = 0
         
     defaults = {
-        'search_keyword': "", 'exact_bunji': "", 'selected_cat': [], 
+        'search_keyword': "", 'fuzzy_search': False, 'exact_bunji': "", 'selected_cat': [], 
         'selected_gu': [], 'selected_dong': [], 'is_no_kwon': False,
         'min_price': 0.0, 'max_price': 100000000.0, 
         'min_dep': 0.0, 'max_dep': 100000000.0,
@@ -142,7 +209,9 @@ def initialize_search_state():
         'min_area': 0.0, 'max_area': 100000000.0, 
         'min_land': 0.0, 'max_land': 100000000.0,
         'min_yield': 0.0, 'max_yield': 100.0,
-        'min_fl': -10.0, 'max_fl': 100.0
+        'min_fl': -10.0, 'max_fl': 100.0,
+        'station_radius': "전체",
+        'sort_field': "기본 (시트 순서)", 'sort_desc': False
     }
     for k, v in defaults.items():
         if k not in st.session_state: st.session_state[k] = v
@@ -153,7 +222,7 @@ def safe_reset():
     [수정됨] auth_status를 보호하여 로그아웃 되는 것을 방지합니다.
     """
     # 보호할 시스템 변수 목록 (로그인 상태 포함)
-    protected_keys = ['current_sheet', 'editor_key_version', 'view_mode', 'page_num', 'auth_status']
+    protected_keys = ['current_sheet', 'editor_key_version', 'view_mode', 'column_profile', 'page_num', 'auth_status', 'is_admin']
     
     for key in list(st.session_state.keys()):
         if key not in protected_keys:
@@ -163,86 +232,277 @@ def safe_reset():
     # [Cache Purge] 메모리 캐시 삭제로 데이터 갱신 보장
     st.cache_data.clear()
 
+def invalidate_search_index():
+    """시트 내용이 바뀐 뒤 통합 검색 인덱스도 다음 검색에서 다시 불러오도록 합니다. (캐시 파괴와 함께 호출)"""
+    import unified_search  # unified_search가 core_engine을 사용하므로 호출 시점에 로드
+    unified_search.invalidate()
+
+def fetch_sheet_frame(sheet_name):
+    """
+    시트 CSV를 내려받아 헤더 표준화 및 정제까지 수행합니다. (Streamlit 비의존, 배치 작업 공용)
+    """
+    gid = SHEET_GIDS.get(sheet_name)
+    if not gid: return None
+    
+    with tracing.span("sheet.download"):
+        df = get_storage().export(sheet_name)
+    with tracing.span("core.normalize_headers"):
+        df = normalize_headers(df)
+    with tracing.span("core.sanitize_dataframe"):
+        return sanitize_dataframe(df)
+
+def assign_missing_iron_ids(df):
+    """빈 IronID를 채웁니다. Returns: 새로 채운 행이 있는지 (시트 저장 필요 여부)"""
+    if 'IronID' not in df.columns:
+        df['IronID'] = [str(uuid.uuid4()) for _ in range(len(df))]
+        return True
+    empty_id_mask = df['IronID'].isna() | (df['IronID'].astype(str).str.strip() == "")
+    if empty_id_mask.any():
+        df.loc[empty_id_mask, 'IronID'] = [str(uuid.uuid4()) for _ in range(empty_id_mask.sum())]
+        return True
+    return False
+
 @st.cache_data(ttl=60) 
+@tracing.span("core.load_sheet_data")
 def load_sheet_data(sheet_name):
     """
     구글 시트에서 데이터를 로드하고 전처리합니다. (IronID 무적화)
+    종료 시트는 콜드 스토어의 인덱스 컬럼만 불러옵니다. (저장소가 없거나 오래됐으면 시트를 내려받아 생성/재동기화)
     """
-    gid = SHEET_GIDS.get(sheet_name)
-    if not gid: return None
+    if not SHEET_GIDS.get(sheet_name): return None
     
-    csv_url = f"{SHEET_URL}/export?format=csv&gid={gid}"
-    conn = st.connection("gsheets", type=GSheetsConnection)
+    storage = get_storage()
     
     try:
-        df = pd.read_csv(csv_url)
-        df = normalize_headers(df)
-        df = sanitize_dataframe(df)
+        with tracing.span("archive.load_index"):
+            df = load_archive_index(sheet_name)
+        if df is not None:
+            df.insert(0, '선택', False)
+            return location_features.attach_location_features(df)
+
+        df = fetch_sheet_frame(sheet_name)
         
-        needs_save = False
-        if 'IronID' not in df.columns:
-            df['IronID'] = [str(uuid.uuid4()) for _ in range(len(df))]
-            needs_save = True
-        else:
-            empty_id_mask = df['IronID'].isna() | (df['IronID'].astype(str).str.strip() == "")
-            if empty_id_mask.any():
-                df.loc[empty_id_mask, 'IronID'] = [str(uuid.uuid4()) for _ in range(empty_id_mask.sum())]
-                needs_save = True
+        needs_save = assign_missing_iron_ids(df)
         
         if needs_save:
             try:
-                conn.update(spreadsheet=SHEET_URL, worksheet=sheet_name, data=df)
+                storage.write(sheet_name, df)
+                invalidate_search_index()
                 st.toast("✅ 데이터 식별자(ID)를 자동으로 생성하여 저장했습니다.", icon="ℹ️")
             except Exception as e:
                 st.error(f"ID 자동 저장 실패: {e}")
 
         if '선택' in df.columns: df = df.drop(columns=['선택'])
+        if archive_store.is_archive(sheet_name):
+            archive_store.sync(sheet_name, df)
+            df = archive_store.load_index(sheet_name)
         df.insert(0, '선택', False)
         
+        # 배치로 사전 계산된 입지 정보(역세권 등) 결합
+        df = location_features.attach_location_features(df)
+        
         return df
     except Exception as e:
         print(f"[Load Error] {e}")
         st.error(f"데이터 로드 중 오류 발생: {e}")
         return None
 
+def record_archive_write(sheet_name, before, after):
+    """
+    종료 시트를 쓴 뒤 콜드 스토어에 변경분만 반영합니다. (저장소가 없는 시트는 무시)
+    빠진 행 / 내용이 바뀐 행은 삭제 표시, 새 행 / 바뀐 행은 변경분 파일로 추가
+    before가 None이면 after의 행 전체를 '바뀐 행'으로 봅니다. (수정한 행만 알고 있는 경우)
+    """
+    if not archive_store.has_store(sheet_name) or after is None: return
+    try:
+        if before is None:
+            removed, added = after['IronID'].astype(str).tolist(), after
+        else:
+            # 같은 읽기에서 나온 전후 비교라 정제 없이 문자열 해시로 충분 (지문 계산보다 수 배 빠름)
+            cols = sorted(set(before.columns) | set(after.columns))
+            old, new = _raw_row_hashes(before, cols), _raw_row_hashes(after, cols)
+            removed = [iid for iid, fp in old.items() if new.get(iid) != fp]
+            added = after[after['IronID'].astype(str).isin([iid for iid, fp in new.items() if old.get(iid) != fp])]
+        archive_store.apply_changes(sheet_name, sanitize_dataframe(added.copy()), removed)
+    except Exception as e:
+        # 시트 반영은 끝났으므로 저장소만 다시 만들도록 제거 (다음 로드 시 시트에서 재생성)
+        print(f"[Archive Sync Error] {sheet_name}: {e}")
+        archive_store.remove_store(sheet_name)
+
+def _raw_row_hashes(df, cols):
+    """IronID → 행 문자열 해시 (변경 행 찾기 전용)"""
+    hashed = pd.util.hash_pandas_object(df.reindex(columns=cols).astype(str).fillna(""), index=False)
+    return dict(zip(df['IronID'].astype(str), hashed.to_numpy()))
+
+# 주기적 재동기화는 한 번에 1개 세션만 (나머지는 끝난 뒤 새 저장소를 그대로 사용)
+_archive_resync_lock = threading.Lock()
+
+def _sync_archive_from_sheet(sheet_name):
+    """종료 시트를 내려받아 콜드 스토어를 새로 만듭니다. (IronID 없는 행은 생성 후 시트에도 저장)"""
+    df = fetch_sheet_frame(sheet_name)
+    if assign_missing_iron_ids(df):
+        get_storage().write(sheet_name, df)
+    archive_store.sync(sheet_name, df)
+    return df
+
+def load_archive_index(sheet_name):
+    """
+    종료 시트 목록용 인덱스 (콜드 스토어, 저장소가 없으면 None)
+    마지막 동기화 후 archive_store.RESYNC_SEC가 지났으면 시트를 내려받아 다시 맞춥니다.
+    (시트가 원본 - 시트 직접 수정 / 다른 인스턴스의 쓰기는 이 쓰기 경로로는 반영되지 않으므로)
+    """
+    if archive_store.is_stale(sheet_name):
+        with _archive_resync_lock:
+            if archive_store.is_stale(sheet_name):
+                try:
+                    with tracing.span("archive.resync"):
+                        _sync_archive_from_sheet(sheet_name)
+                except Exception as e:
+                    print(f"[Archive Resync Error] {sheet_name}: {e}")  # 기존 저장소로 응답, 다음 로드에서 재시도
+    return archive_store.load_index(sheet_name)
+
+def rebuild_archive(sheet_name):
+    """
+    종료 시트를 내려받아 콜드 스토어를 새로 만듭니다. (시트를 직접 고친 경우 관리자 즉시 재동기화)
+    Returns: (성공 여부, 메시지)
+    """
+    if not archive_store.is_archive(sheet_name): return False, "종료 시트가 아닙니다."
+    try:
+        df = _sync_archive_from_sheet(sheet_name)
+        st.cache_data.clear()
+        invalidate_search_index()
+        return True, f"✅ {sheet_name} {len(df):,}건 동기화 완료"
+    except Exception as e:
+        return False, f"동기화 실패: {str(e)}"
+
 # ==============================================================================
 # [SECTION 4: MATCHING ENGINE]
 # ==============================================================================
 
+# 매칭 키 정규화 규칙 (열 단위 / 단일 값 두 경로가 같은 값을 내도록 공용)
+_FLOOR_NUM = re.compile(r'(-?[\d.]+)')
+_NON_NUM = re.compile(r'[^0-9.]')
+_NON_WORD = re.compile(r'[^가-힣a-zA-Z0-9-]')
+
+def _match_key_values(df, k):
+    """
+    매칭 키 1개를 열 단위로 정규화합니다.
+    숫자 키: 숫자만 추출해 소수 1자리 반올림 (층은 첫 숫자, '1층' = 1.0) / 문자 키: 공백·기호 제거 (번지의 '-'는 유지)
+    """
+    if k not in df.columns:
+        return pd.Series(0.0 if k in NUMERIC_COLS else "", index=df.index)
+    col = df[k]
+    val_str = col.where(col.notna(), "").astype(str)
+    if k in NUMERIC_COLS:
+        if k == '층':
+            val_str = val_str.str.extract(_FLOOR_NUM)[0]
+        else:
+            val_str = val_str.str.replace(_NON_NUM, '', regex=True)
+        return pd.to_numeric(val_str, errors='coerce').astype(float).fillna(0).round(1) + 0.0
+    return val_str.str.replace(_NON_WORD, '', regex=True)
+
+def _match_key_scalar(value, k):
+    """_match_key_values와 같은 규칙으로 값 1개 정규화 (조회용, 데이터프레임 생성 없음)"""
+    text = "" if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+    if k in NUMERIC_COLS:
+        if k == '층':
+            m = _FLOOR_NUM.search(text)
+            text = m.group(1) if m else ""
+        else:
+            text = _NON_NUM.sub('', text)
+        try:
+            num = float(text)
+        except ValueError:
+            num = 0.0
+        return float(np.round(np.float64(0.0 if np.isnan(num) else num), 1)) + 0.0
+    return _NON_WORD.sub('', text)
+
+def _hash_keys(columns):
+    """정규화된 키 열(배열)들을 64비트 해시 1개로 결합"""
+    sig = np.zeros(len(columns[0]), dtype=np.uint64)
+    for arr in columns:
+        arr = np.asarray(arr, dtype=float) if arr.dtype.kind == 'f' else np.asarray(arr, dtype=object)
+        sig = (sig * np.uint64(0x100000001B3)) ^ pd.util.hash_array(arr)
+    return sig
+
+def match_signatures(df, keys=None):
+    """
+    행별 매칭 서명 (64비트 해시, 전체 열을 한 번에 계산)
+    같은 키 값이면 시트 표기가 달라도('1층' / 1.0) 같은 서명이 나옵니다.
+    """
+    keys = keys or MATCH_KEYS
+    if not len(df): return np.empty(0, dtype=np.uint64)
+    return _hash_keys([_match_key_values(df, k).to_numpy() for k in keys])
+
+def row_signature(row, keys=None):
+    """행(dict) 1개의 매칭 서명 (match_signatures와 같은 값)"""
+    keys = keys or MATCH_KEYS
+    values = [_match_key_scalar(row.get(k), k) for k in keys]
+    return int(_hash_keys([np.array([v], dtype=float if k in NUMERIC_COLS else object)
+                           for k, v in zip(keys, values)])[0])
+
 def create_match_signature(df, keys):
     """
-    데이터 매칭을 위한 고유 서명(Signature)을 생성합니다.
+    데이터 매칭을 위한 고유 서명(Signature)을 생성합니다. (_match_sig: 64비트 해시)
     """
     temp_df = df.copy()
-    temp_df['_match_sig'] = ""
-    
-    for k in keys:
-        try:
-            if k in NUMERIC_COLS:
-                val_str = temp_df[k].astype(str)
-                if k == '층':
-                    val_str = val_str.str.extract(r'(-?[\d.]+)')[0]
-                else:
-                    val_str = val_str.str.replace(r'[^0-9.]', '', regex=True)
-                
-                val = pd.to_numeric(val_str, errors='coerce').fillna(0)
-                temp_df['_match_sig'] += val.round(1).astype(str).str.replace(r'\.0$', '', regex=True) + "|"
-            else:
-                val = temp_df[k].astype(str).str[:20] if k == '매물특징' else temp_df[k].astype(str)
-                temp_df['_match_sig'] += val.str.replace(r'[^가-힣a-zA-Z0-9]', '', regex=True) + "|"
-        except: continue
-        
+    temp_df['_match_sig'] = match_signatures(df, keys)
     return temp_df
 
+class SignatureIndex:
+    """
+    서명 → 행 위치 목록 인덱스 (세컨드 매칭 / 중복 탐지 공용)
+    조회는 해시 1회 계산 + 사전 조회이므로 시트 크기와 무관합니다.
+    """
+    def __init__(self, df, keys=None):
+        self.keys = keys or MATCH_KEYS
+        self.sigs = match_signatures(df, self.keys).copy()
+        order = np.argsort(self.sigs, kind='stable')
+        uniq, starts = np.unique(self.sigs[order], return_index=True)
+        self.rows = {int(sig): pos for sig, pos in zip(uniq, np.split(order, starts[1:]))}
+
+    def lookup(self, row):
+        """행(dict)과 서명이 같은 행 위치 배열 (시트 순서)"""
+        return self.rows.get(row_signature(row, self.keys), np.empty(0, dtype=int))
+
+    def relocate(self, df, pos):
+        """행 1개의 키 값이 바뀌었을 때 해당 행만 옮깁니다."""
+        old, new = int(self.sigs[pos]), int(match_signatures(df.iloc[[pos]], self.keys)[0])
+        if old == new: return
+        self.rows[old] = self.rows[old][self.rows[old] != pos]
+        self.rows[new] = np.sort(np.append(self.rows.get(new, np.empty(0, dtype=int)), pos))
+        self.sigs[pos] = new
+
+# 데이터프레임별 인덱스 캐시 (같은 시트 데이터로 여러 건을 매칭할 때 재사용, 프레임이 사라지면 함께 정리)
+_sig_index_cache = {}
+
+def signature_index(df, keys=None):
+    """df의 서명 인덱스 (캐시 재사용, 행 수가 바뀌었으면 다시 생성)"""
+    keys = keys or MATCH_KEYS
+    key = (id(df), tuple(keys))
+    cached = _sig_index_cache.get(key)
+    if cached and cached[0]() is df and cached[1] == len(df):
+        return cached[2]
+    index = SignatureIndex(df, keys)
+    _sig_index_cache[key] = (weakref.ref(df, lambda _, k=key: _sig_index_cache.pop(k, None)), len(df), index)
+    return index
+
+def _relocate_cached_row(df, pos):
+    """df의 캐시된 인덱스가 있으면 행 1개 갱신 (값 덮어쓰기 후 호출)"""
+    for key, (ref, n, index) in list(_sig_index_cache.items()):
+        if key[0] == id(df) and ref() is df and n == len(df):
+            index.relocate(df, pos)
+
 # ==============================================================================
 # [SECTION 5: UPDATE ENGINE (FULL LOGIC + APPEND)]
 # ==============================================================================
 
-def add_new_row(new_data, sheet_name):
+def add_new_row(new_data, sheet_name, allow_duplicate=False):
     """
     [Phase 5] 신규 매물을 시트 맨 마지막에 추가(Append)합니다. (IronID 자동 생성)
+    같은 종류 시트(종료/브리핑 포함)에 중복 의심 매물이 있으면 등록하지 않고 알려줍니다. (allow_duplicate=True면 무시)
     """
-    conn = st.connection("gsheets", type=GSheetsConnection)
+    import dedup_engine  # dedup_engine이 core_engine을 사용하므로 호출 시점에 로드
     try:
         # 1. 딕셔너리를 데이터프레임으로 변환
         df_new = pd.DataFrame([new_data])
@@ -254,144 +514,209 @@ def add_new_row(new_data, sheet_name):
         # 중요: sanitize_dataframe은 전체 컬럼을 검사하므로 누락된 컬럼은 빈 값으로 처리됨
         df_new = normalize_headers(df_new)
         df_new = sanitize_dataframe(df_new)
+        new_row = df_new.iloc[0].to_dict()
+
+        def duplicate_message(matches):
+            return ("⚠️ 중복 의심 매물이 있습니다: " + dedup_engine.format_matches(matches) +
+                    " - 다른 매물이 맞다면 '중복 경고 무시'를 체크하고 다시 등록하세요.")
+
+        # 3-1. 같은 종류의 다른 시트(종료/브리핑)는 캐시된 데이터로 미리 검사
+        if not allow_duplicate:
+            for other in dedup_engine.family_sheets(sheet_name):
+                if other == sheet_name: continue
+                matches = dedup_engine.find_matches(new_row, load_sheet_data(other), other)
+                if not matches.empty: return False, duplicate_message(matches)
         
-        # 4. 서버 데이터 로드 (컬럼 구조 맞추기 위해)
-        # ttl=0으로 최신 상태 가져옴
-        df_server = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=sheet_name, ttl=0))
-        
-        # 5. 컬럼 매핑 (서버에 있는 컬럼만 남기고 순서 맞춤)
-        # 서버에 없는 컬럼은 버리고, 서버에 있는데 새 데이터에 없는건 빈 값으로
-        common_cols = [c for c in df_server.columns if c in df_new.columns or c not in df_new.columns]
-        
-        # 새 데이터프레임을 서버 구조에 맞게 재편성
-        df_final_new = pd.DataFrame(columns=df_server.columns)
-        for col in df_server.columns:
-            if col in df_new.columns:
-                df_final_new[col] = df_new[col]
-            else:
-                df_final_new[col] = "" # 없는 컬럼은 빈 값
-        
-        # 6. 데이터 병합 (Append)
-        # ignore_index=True로 인덱스 재설정
-        df_updated = pd.concat([df_server, df_final_new], ignore_index=True)
+        def mutate(df_server):
+            # 3-2. 대상 시트는 저장 직전 최신 데이터로 중복 검사
+            if not allow_duplicate:
+                matches = dedup_engine.find_matches(new_row, df_server, sheet_name)
+                if not matches.empty: return False, duplicate_message(matches), "duplicate", df_server
+
+
+            # 4. 서버 데이터(최신 상태, 쓰기 조정기가 읽어 전달)에 컬럼 구조 맞추기
+            # 서버에 없는 컬럼은 버리고, 서버에 있는데 새 데이터에 없는건 빈 값으로
+            df_final_new = pd.DataFrame(columns=df_server.columns)
+            for col in df_server.columns:
+                if col in df_new.columns:
+                    df_final_new[col] = df_new[col]
+                else:
+                    df_final_new[col] = "" # 없는 컬럼은 빈 값
+            
+            # 5. 데이터 병합 (Append)
+            # ignore_index=True로 인덱스 재설정
+            df_updated = pd.concat([df_server, df_final_new], ignore_index=True)
+            return True, "✅ 신규 매물이 성공적으로 등록되었습니다.", None, df_updated
         
-        # 7. 저장 및 캐시 파괴
-        conn.update(spreadsheet=SHEET_URL, worksheet=sheet_name, data=df_updated)
+        # 6. 저장 (같은 시트 동시 요청과 묶어서 1회 쓰기) 및 캐시 파괴
+        success, msg, reason = submit_sheet_edit(sheet_name, mutate)
+        if not success: return False, (msg if reason == "duplicate" else f"신규 등록 실패: {msg}")
         st.cache_data.clear() # [핵심] 목록 즉시 갱신
+        invalidate_search_index()
         
-        return True, "✅ 신규 매물이 성공적으로 등록되었습니다."
+        return True, msg
         
     except Exception as e:
         return False, f"신규 등록 실패: {str(e)}"
 
+def _set_cell(df, idx, col, value):
+    """
+    셀 1개를 덮어씁니다. 시트 읽기 시 숫자로 추론된 컬럼(호실 등)에 빈 문자열/문자 값을 넣으면
+    pandas가 거부하므로, 이 경우 해당 컬럼을 object로 바꾼 뒤 저장합니다.
+    """
+    try:
+        df.at[idx, col] = value
+    except (TypeError, ValueError):
+        df[col] = df[col].astype(object)
+        df.at[idx, col] = value
+
+def locate_row(sheet_data, updated_row):
+    """
+    수정 대상 행의 인덱스를 찾습니다. (IronID 컬럼이 없으면 생성)
+    1차: IronID 일치 / 2차: 세컨드 매칭 (번지 + 층 + 면적 + 호실, 찾으면 IronID 부여)
+    Returns: (행 인덱스 또는 None, IronID로 찾았는지 여부)
+    """
+    target_id = updated_row.get('IronID')
+    
+    # IronID 컬럼 생성
+    if 'IronID' not in sheet_data.columns:
+        sheet_data['IronID'] = [str(uuid.uuid4()) for _ in range(len(sheet_data))]
+    
+    # 3-A. [1차 시도] IronID로 매칭
+    if target_id:
+        match_list = sheet_data.index[sheet_data['IronID'].astype(str) == str(target_id)].tolist()
+        if match_list:
+            return match_list[0], True
+    
+    # 3-B. [2차 시도] 세컨드 매칭 (번지 + 층 + 면적 서명 인덱스 조회 → 호실 입력 시 후보 중 호실 비교)
+    candidates = signature_index(sheet_data).lookup(updated_row)
+    u_ho = _match_key_scalar(updated_row.get('호실'), '호실')
+    if len(candidates) and u_ho:
+        s_ho = sheet_data['호실'].to_numpy()[candidates] if '호실' in sheet_data.columns else [""] * len(candidates)
+        candidates = candidates[np.array([_match_key_scalar(v, '호실') == u_ho for v in s_ho], dtype=bool)]
+
+    if len(candidates):
+        row_idx = sheet_data.index[candidates[0]]
+        sheet_data.at[row_idx, 'IronID'] = str(target_id) if target_id else str(uuid.uuid4())
+        return row_idx, False
+    return None, False
+
+def write_row_values(sheet_data, row_idx, updated_row):
+    """대상 행에 값 덮어쓰기 (숫자 컬럼은 숫자로 변환, '선택' 제외)"""
+    for k, v in updated_row.items():
+        if k in sheet_data.columns and k not in ['선택']:
+            if k in NUMERIC_COLS:
+                try:
+                    val_str = re.sub(r'[^0-9.-]', '', str(v)) if v else "0"
+                    v = float(val_str) if val_str else 0.0
+                except: v = 0.0
+            _set_cell(sheet_data, row_idx, k, v)
+    if any(k in MATCH_KEYS for k in updated_row):
+        _relocate_cached_row(sheet_data, sheet_data.index.get_loc(row_idx))
+
 def update_single_row(updated_row, sheet_name):
     """
     [Phase 4] IronID를 기준으로 단일 행을 업데이트합니다.
     캐시 파괴(Cache Purge)를 통해 즉시 반영을 보장합니다.
     """
-    conn = st.connection("gsheets", type=GSheetsConnection)
     try:
-        # 1. 서버 데이터 로드 (캐시 무시)
-        sheet_data = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=sheet_name, ttl=0))
-        
-        target_id = updated_row.get('IronID')
-        
-        # IronID 컬럼 생성
-        if 'IronID' not in sheet_data.columns:
-            sheet_data['IronID'] = [str(uuid.uuid4()) for _ in range(len(sheet_data))]
-        
-        row_idx = None
-        
-        # 3-A. [1차 시도] IronID로 매칭
-        if target_id:
-            match_list = sheet_data.index[sheet_data['IronID'].astype(str) == str(target_id)].tolist()
-            if match_list:
-                row_idx = match_list[0]
-        
-        # 3-B. [2차 시도] 세컨드 매칭 (번지 + 층 + 면적 + 호실) - 소수점 보정 포함
-        if row_idx is None:
-            u_addr = str(updated_row.get('번지', '')).strip()
-            u_floor = str(updated_row.get('층', '')).strip()
-            u_ho = str(updated_row.get('호실', '')).strip()
-            
-            try:
-                u_area = round(float(updated_row.get('면적', 0)), 1)
-            except: u_area = 0.0
+        # 충돌 검사 기준(불러온 시점 지문)은 세션 상태이므로 등록 전에 준비
+        expected, cols = expected_fingerprints(sheet_name, [updated_row.get('IronID')])
 
-            s_addr = sheet_data['번지'].astype(str).str.strip()
-            s_floor = sheet_data['층'].astype(str).str.strip()
-            s_ho = sheet_data['호실'].astype(str).str.strip() if '호실' in sheet_data.columns else ""
-            
-            try:
-                s_area = pd.to_numeric(sheet_data['면적'], errors='coerce').fillna(0.0).round(1)
-            except:
-                s_area = 0.0
+        def mutate(sheet_data):
+            # 1. 서버 데이터(캐시 무시, 쓰기 조정기가 읽어 전달)에서 대상 행 찾기
+            row_idx, by_id = locate_row(sheet_data, updated_row)
+            if row_idx is None:
+                return False, "❌ 원본 데이터를 찾을 수 없습니다. (ID 및 상세 조건 불일치)", None, sheet_data
 
-            cond = (s_addr == u_addr) & (s_floor == u_floor) & (s_area == u_area)
-            if u_ho: cond = cond & (s_ho == u_ho)
+            # 낙관적 동시성 검사: 불러온 뒤 다른 사용자가 이 행을 수정했는지 (이 행만 비교)
+            if by_id:
+                conflicts = find_row_conflicts(sheet_data, expected, cols)
+                if conflicts:
+                    return False, "⚠️ " + format_conflicts(conflicts) + " - 새로고침 후 다시 수정해 주세요.", None, sheet_data
             
-            backup_match = sheet_data[cond].index.tolist()
-
-            if backup_match:
-                row_idx = backup_match[0]
-                sheet_data.at[row_idx, 'IronID'] = str(target_id) if target_id else str(uuid.uuid4())
-
-        if row_idx is None:
-            return False, "❌ 원본 데이터를 찾을 수 없습니다. (ID 및 상세 조건 불일치)"
-        
-        # 4. 값 덮어쓰기
-        for k, v in updated_row.items():
-            if k in sheet_data.columns and k not in ['선택']:
-                if k in NUMERIC_COLS:
-                    try:
-                        val_str = re.sub(r'[^0-9.-]', '', str(v)) if v else "0"
-                        v = float(val_str) if val_str else 0.0
-                    except: v = 0.0
-                sheet_data.at[row_idx, k] = v
+            # 4. 값 덮어쓰기
+            write_row_values(sheet_data, row_idx, updated_row)
+            return True, "✅ 정보가 안전하게 저장되었습니다.", sheet_data.loc[[row_idx]].copy(), sheet_data
         
-        # 5. 저장 및 캐시 파괴
-        conn.update(spreadsheet=SHEET_URL, worksheet=sheet_name, data=sheet_data)
+        # 5. 저장 (같은 시트 동시 요청과 묶어서 1회 쓰기) 및 캐시 파괴
+        success, msg, saved_row = submit_sheet_edit(sheet_name, mutate)
+        if not success: return False, msg
+        remember_row_fingerprints(sheet_name, saved_row)
         st.cache_data.clear() # [핵심] 캐시 파괴로 즉시 갱신 보장
+        invalidate_search_index()
         
-        return True, "✅ 정보가 안전하게 저장되었습니다."
+        return True, msg
         
     except Exception as e:
         return False, f"저장 실패: {str(e)}"
 
+def find_changed_ids(edited_df, original_df):
+    """
+    편집 전/후 데이터프레임을 IronID 기준으로 비교하여 값이 바뀐 IronID 목록을 반환합니다. ('선택' 제외)
+    """
+    df_org = original_df.set_index('IronID')
+    df_new = edited_df.set_index('IronID')
+    
+    changed_ids = []
+    for iid in df_org.index.intersection(df_new.index):
+        row_org = df_org.loc[iid].drop(['선택'], errors='ignore').astype(str)
+        row_new = df_new.loc[iid].drop(['선택'], errors='ignore').astype(str)
+        if not row_org.equals(row_new):
+            changed_ids.append(iid)
+    return changed_ids
+
+def apply_changed_rows(sheet_data, edited_df, changed_ids):
+    """
+    서버 시트 데이터에 변경된 행 값을 덮어씁니다. (IronID 매칭, 반영 건수 반환)
+    """
+    df_new = edited_df.set_index('IronID')
+    update_cnt = 0
+    for iid in changed_ids:
+        match_idx = sheet_data.index[sheet_data['IronID'].astype(str) == str(iid)].tolist()
+        if match_idx:
+            t_idx = match_idx[0]
+            new_row = df_new.loc[iid]
+            for col in sheet_data.columns:
+                if col in new_row.index and col not in ['선택', 'IronID']:
+                    _set_cell(sheet_data, t_idx, col, new_row[col])
+            # 매칭 키(번지/층/면적)가 바뀌었을 수 있으므로 캐시된 서명 인덱스도 갱신 (write_row_values와 동일)
+            if any(k in new_row.index for k in MATCH_KEYS):
+                _relocate_cached_row(sheet_data, sheet_data.index.get_loc(t_idx))
+            update_cnt += 1
+    return update_cnt
+
 def save_updates_to_sheet(edited_df, original_df, sheet_name):
     """
     [Phase 1] 리스트 뷰 대량 수정 저장 (캐시 파괴 포함)
+    다른 사용자가 먼저 수정한 행은 건너뛰고 나머지만 저장합니다. (세 번째 반환값: 충돌 목록)
     """
-    conn = st.connection("gsheets", type=GSheetsConnection)
     try:
-        df_org = original_df.set_index('IronID')
-        df_new = edited_df.set_index('IronID')
-        
-        changed_ids = []
-        for iid in df_org.index.intersection(df_new.index):
-            row_org = df_org.loc[iid].drop(['선택'], errors='ignore').astype(str)
-            row_new = df_new.loc[iid].drop(['선택'], errors='ignore').astype(str)
-            if not row_org.equals(row_new):
-                changed_ids.append(iid)
-        
+        changed_ids = find_changed_ids(edited_df, original_df)
         if not changed_ids: return True, "변경 사항 없음", None
 
-        sheet_data = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=sheet_name, ttl=0))
-        
-        update_cnt = 0
-        for iid in changed_ids:
-            match_idx = sheet_data.index[sheet_data['IronID'].astype(str) == str(iid)].tolist()
-            if match_idx:
-                t_idx = match_idx[0]
-                new_row = df_new.loc[iid]
-                for col in sheet_data.columns:
-                    if col in new_row.index and col not in ['선택', 'IronID']:
-                        sheet_data.at[t_idx, col] = new_row[col]
-                update_cnt += 1
-                
-        conn.update(spreadsheet=SHEET_URL, worksheet=sheet_name, data=sheet_data)
+        expected, cols = expected_fingerprints(sheet_name, changed_ids)
+
+        def mutate(sheet_data):
+            conflicts = find_row_conflicts(sheet_data, expected, cols)
+            conflict_ids = {c['IronID'] for c in conflicts}
+            safe_ids = [str(iid) for iid in changed_ids if str(iid) not in conflict_ids]
+            if not safe_ids:
+                return False, "⚠️ " + format_conflicts(conflicts), conflicts, sheet_data
+            update_cnt = apply_changed_rows(sheet_data, edited_df, safe_ids)
+            saved = sheet_data[sheet_data['IronID'].astype(str).isin(safe_ids)].copy()
+            return True, "", (update_cnt, conflicts, saved), sheet_data
+
+        success, msg, result = submit_sheet_edit(sheet_name, mutate)
+        if not success:
+            return False, (msg if result else f"일괄 저장 실패: {msg}"), result
+        update_cnt, conflicts, saved = result
+        remember_row_fingerprints(sheet_name, saved)
         st.cache_data.clear() # [핵심] 캐시 파괴
+        invalidate_search_index()
         
+        if conflicts:
+            return True, f"✅ {update_cnt}건 일괄 저장 완료 / ⚠️ " + format_conflicts(conflicts), conflicts
         return True, f"✅ {update_cnt}건 일괄 저장 완료", None
         
     except Exception as e:
@@ -399,48 +724,249 @@ def save_updates_to_sheet(edited_df, original_df, sheet_name):
 
 def execute_transaction(action_type, target_rows, source_sheet, target_sheet=None):
     """
-    [Phase 2] 트랜잭션 처리 (캐시 파괴 포함)
+    [Phase 2] 트랜잭션 처리 (캐시 파괴 포함) - 작업 1건짜리 일괄 트랜잭션
     """
-    conn = st.connection("gsheets", type=GSheetsConnection)
-    try:
-        if target_rows.empty: return False, "대상 없음", None
-        
-        src_df = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=source_sheet, ttl=0))
-        target_ids = target_rows['IronID'].astype(str).tolist()
-        
-        mask = src_df['IronID'].astype(str).isin(target_ids)
+    if target_rows.empty: return False, "대상 없음", None
+    if action_type not in TXN_ACTIONS or (action_type != "delete" and not target_sheet):
+        return False, "알 수 없는 명령", None
+
+    ok, msg, detail = execute_transactions([(action_type, target_rows, source_sheet, target_sheet)])
+    if not ok: return ok, msg, detail
+    done = detail["counts"][0]
+    if action_type == "copy":
+        return True, f"✅ {done}건 복사 완료", None
+    return True, f"✅ {done}건 처리 완료 ({action_type})", None
+
+# ==============================================================================
+# [SECTION 6: TRANSACTION PLANNER (시트별 1회 읽기 / 1회 쓰기 + 롤백 기록)]
+# ==============================================================================
+
+def _op_ids(target_rows):
+    if isinstance(target_rows, pd.DataFrame):
+        return target_rows['IronID'].astype(str).tolist()
+    return [str(i) for i in target_rows]
+
+def plan_transaction(operations, sheets):
+    """
+    작업 목록을 메모리 상의 시트 상태(sheets: 시트명 → 데이터프레임)에 차례로 적용합니다.
+    앞 작업의 결과를 다음 작업이 보므로 '종료 이동 후 브리핑 복사'처럼 이어지는 작업도 한 번에 계획됩니다.
+    Returns: (성공 여부, 메시지, 작업별 처리 건수, 변경된 시트 목록)
+    """
+    counts, dirty = [], []
+    for i, (action_type, target_rows, source_sheet, target_sheet) in enumerate(operations, 1):
+        src_df = sheets[source_sheet]
+        mask = src_df['IronID'].astype(str).isin(_op_ids(target_rows))
         rows_to_process = src_df[mask]
-        
         if rows_to_process.empty:
-            return False, "❌ 대상을 찾을 수 없습니다.", None
-            
-        if action_type in ["move", "restore", "delete"]:
-            new_src = src_df[~mask]
-            
-            if action_type in ["move", "restore"] and target_sheet:
-                tgt_df = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=target_sheet, ttl=0))
-                common_cols = [c for c in rows_to_process.columns if c in tgt_df.columns]
-                new_tgt = pd.concat([tgt_df, rows_to_process[common_cols]], ignore_index=True)
-                
+            return False, f"❌ 대상을 찾을 수 없습니다. ({i}번째 작업: {action_type} / {source_sheet})", counts, dirty
+
+        if action_type in ["move", "restore", "copy"]:
+            tgt_df = sheets[target_sheet]
+            common_cols = [c for c in rows_to_process.columns if c in tgt_df.columns]
+            new_tgt = pd.concat([tgt_df, rows_to_process[common_cols]], ignore_index=True)
+            if action_type != "copy":
                 is_valid, msg = validate_data_integrity(new_tgt)
-                if not is_valid: return False, msg, None
-                
-                conn.update(spreadsheet=SHEET_URL, worksheet=target_sheet, data=new_tgt)
-            
-            conn.update(spreadsheet=SHEET_URL, worksheet=source_sheet, data=new_src)
-            st.cache_data.clear() # [핵심] 캐시 파괴
-            return True, f"✅ {len(rows_to_process)}건 처리 완료 ({action_type})", None
-            
-        elif action_type == "copy":
-            if target_sheet:
-                tgt_df = normalize_headers(conn.read(spreadsheet=SHEET_URL, worksheet=target_sheet, ttl=0))
-                common_cols = [c for c in rows_to_process.columns if c in tgt_df.columns]
-                new_tgt = pd.concat([tgt_df, rows_to_process[common_cols]], ignore_index=True)
-                conn.update(spreadsheet=SHEET_URL, worksheet=target_sheet, data=new_tgt)
-                st.cache_data.clear() # [핵심] 캐시 파괴
-                return True, f"✅ {len(rows_to_process)}건 복사 완료", None
-                
-        return False, "알 수 없는 명령", None
+                if not is_valid: return False, msg, counts, dirty
+            sheets[target_sheet] = new_tgt
+            if target_sheet not in dirty: dirty.append(target_sheet)
+
+        # 영구 삭제는 불러온 뒤 다른 사용자가 수정한 행이면 중단 (이동/복사는 서버 최신 행을 그대로 옮기므로 검사 불필요)
+        if action_type == "delete":
+            conflicts = find_row_conflicts(src_df, *expected_fingerprints(source_sheet, _op_ids(target_rows)))
+            if conflicts:
+                return False, "⚠️ " + format_conflicts(conflicts) + " - 삭제를 중단했습니다.", counts, dirty
 
+        if action_type in ["move", "restore", "delete"]:
+            sheets[source_sheet] = src_df[~mask]
+            if source_sheet not in dirty: dirty.append(source_sheet)
+
+        counts.append(len(rows_to_process))
+    return True, "계획 완료", counts, dirty
+
+def _save_rollback_record(txn_id, originals):
+    """쓰기 전 원본 시트를 롤백 기록으로 남깁니다. (자동 롤백까지 실패했을 때 수동 복구용)"""
+    path = os.path.join(ROLLBACK_DIR, txn_id)
+    os.makedirs(path, exist_ok=True)
+    for i, (sheet_name, df) in enumerate(originals.items()):
+        df.to_csv(os.path.join(path, f"{i}.csv"), index=False)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"txn_id": txn_id, "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "sheets": {f"{i}.csv": name for i, name in enumerate(originals)}}, f, ensure_ascii=False, indent=2)
+    return path
+
+@tracing.span("core.execute_transactions")
+def execute_transactions(operations):
+    """
+    이동/복구/복사/삭제 작업 묶음을 하나의 트랜잭션으로 처리합니다.
+    operations: [(작업, 대상 행 DataFrame 또는 IronID 목록, 원본 시트, 대상 시트), ...]
+    1) 관련 시트를 각각 한 번만 읽고  2) 메모리에서 최종 상태를 계산한 뒤  3) 바뀐 시트만 한 번씩 씁니다.
+    두 번째 이후 쓰기가 실패하면 이미 쓴 시트를 원본으로 되돌리고, 되돌리기도 실패하면 롤백 기록 경로를 알려줍니다.
+    Returns: (성공 여부, 메시지, 상세 dict 또는 오류 traceback)
+    """
+    storage = get_storage()
+    txn_id = time.strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+    if not operations: return False, "대상 없음", None
+    names = []
+    try:
+        for action_type, target_rows, source_sheet, target_sheet in operations:
+            if action_type not in TXN_ACTIONS or (action_type != "delete" and not target_sheet):
+                return False, "알 수 없는 명령", None
+            for name in (source_sheet, target_sheet):
+                if name and name not in names: names.append(name)
     except Exception as e:
         return False, f"트랜잭션 오류: {str(e)}", traceback.format_exc()
+
+    # 관련 시트를 모두 잠근 채 읽기 ~ 쓰기(롤백 포함) - 다른 세션의 저장이 사이에 끼어들지 않도록
+    with write_coordinator.locked(*names):
+        return _run_transaction(storage, txn_id, operations, names)
+
+def _run_transaction(storage, txn_id, operations, names):
+    written = []
+    try:
+        # 1. 관련 시트 1회씩 읽기 (종료 시트도 시트 원본에서 - 콜드 스토어는 조회 전용 사본)
+        originals = {name: normalize_headers(storage.read(name)) for name in names}
+
+        # 2. 메모리에서 최종 상태 계산 (실패 시 아무것도 쓰지 않음)
+        sheets = dict(originals)
+        ok, msg, counts, dirty = plan_transaction(operations, sheets)
+        if not ok: return False, msg, None
+
+        # 3. 바뀐 시트만 1회씩 쓰기 (여러 시트면 먼저 롤백 기록)
+        record = _save_rollback_record(txn_id, {n: originals[n] for n in dirty}) if len(dirty) > 1 else None
+        for name in dirty:
+            storage.write(name, sheets[name])
+            written.append(name)
+        if record: shutil.rmtree(record, ignore_errors=True)
+        # 종료 시트는 쓰기 후 바뀐 행만 콜드 스토어에 반영
+        for name in dirty:
+            record_archive_write(name, originals[name], sheets[name])
+
+        st.cache_data.clear() # [핵심] 캐시 파괴
+        invalidate_search_index()
+        return True, f"✅ {len(operations)}개 작업 / {sum(counts)}건 처리 완료", {"txn_id": txn_id, "counts": counts, "sheets": dirty}
+
+    except Exception as e:
+        if not written:
+            # 쓴 시트가 없으면 되돌릴 것도 없으므로 (첫 쓰기 실패 포함) 롤백 기록도 정리
+            shutil.rmtree(os.path.join(ROLLBACK_DIR, txn_id), ignore_errors=True)
+            return False, f"트랜잭션 오류: {str(e)}", traceback.format_exc()
+        # 일부 시트만 쓰인 상태 → 원본으로 되돌림
+        failed = []
+        for name in written:
+            try:
+                storage.write(name, originals[name])
+            except Exception:
+                failed.append(name)
+        st.cache_data.clear()
+        invalidate_search_index()
+        if failed:
+            return False, (f"트랜잭션 오류: {str(e)} / 롤백 실패 시트: {', '.join(failed)} "
+                           f"(원본 기록: {os.path.join(ROLLBACK_DIR, txn_id)})"), traceback.format_exc()
+        shutil.rmtree(os.path.join(ROLLBACK_DIR, txn_id), ignore_errors=True)
+        return False, f"트랜잭션 오류: {str(e)} (변경 사항을 모두 되돌렸습니다)", traceback.format_exc()
+
+# ==============================================================================
+# [SECTION 7: ROW FINGERPRINTS (낙관적 동시성 제어)]
+# ==============================================================================
+
+def fingerprint_columns(df):
+    """지문 대상 컬럼 (이름순 고정)"""
+    return sorted(c for c in df.columns if c not in FINGERPRINT_EXCLUDE)
+
+def _canonical_frame(df, cols):
+    """
+    지문 계산용 정규화: 정제 후 문자열로 통일하고, 시트 읽기 때마다 달라질 수 있는 표기(1 / 1.0, nan)를 맞춥니다.
+    """
+    frame = sanitize_dataframe(df.reindex(columns=cols, fill_value="").copy())
+    canon = {}
+    for c in cols:
+        canon[c] = (frame[c].astype(str).fillna("").str.strip()
+                    .str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+                    .replace({'nan': '', 'None': '', '<NA>': '', 'NaT': ''}))
+    return pd.DataFrame(canon, index=df.index)
+
+def compute_row_fingerprints(df, cols=None):
+    """IronID → 행 내용 지문(16진수 16자리)"""
+    if df is None or df.empty or 'IronID' not in df.columns: return {}
+    cols = cols if cols is not None else fingerprint_columns(df)
+    hashed = pd.util.hash_pandas_object(_canonical_frame(df, cols), index=False)
+    return dict(zip(df['IronID'].astype(str), hashed.map('{:016x}'.format)))
+
+# 쓰기 큐 워커가 세션 대신 반영한 행 지문 ((세션, 시트) → (지문 컬럼, {IronID: 지문}))
+# 워커는 세션 상태에 접근할 수 없으므로 여기 보관했다가 해당 세션이 다음에 지문을 쓸 때 합침
+_queued_writes = {}
+_queued_lock = threading.Lock()
+
+def remember_queued_write(session, sheet_name, cols, fps):
+    """쓰기 큐가 반영한 행 지문을 등록한 세션 몫으로 보관합니다. (워커 스레드에서 호출)"""
+    if session is None or not fps: return
+    with _queued_lock:
+        held_cols, held = _queued_writes.setdefault((session, sheet_name), (list(cols or []), {}))
+        if held_cols == list(cols or []): held.update(fps)
+        else: _queued_writes[(session, sheet_name)] = (list(cols or []), dict(fps))
+
+def _session_fingerprints(sheet_name):
+    """세션에 보관된 시트 지문 (쓰기 큐가 반영한 이 세션의 행은 반영 후 지문으로 갱신)"""
+    try:
+        saved = st.session_state.get('row_fingerprints', {}).get(sheet_name)
+    except Exception:
+        return None  # Streamlit 세션 밖 (배치/벤치마크)
+    with _queued_lock:
+        queued = _queued_writes.pop((tracing.current_session(), sheet_name), None)
+    if saved and queued and queued[0] == list(saved["cols"]):
+        saved["fp"].update(queued[1])
+    return saved
+
+def capture_row_fingerprints(sheet_name, df):
+    """불러온 시점의 행 지문을 세션에 보관합니다. (시트 로드 직후 호출)"""
+    cols = fingerprint_columns(df)
+    with tracing.span("core.capture_fingerprints"):
+        fps = compute_row_fingerprints(df, cols)
+    st.session_state.setdefault('row_fingerprints', {})[sheet_name] = {"cols": cols, "fp": fps}
+    # 새로 불러온 지문이 쓰기 큐 반영분보다 최신 (반영 시 캐시 파괴)
+    with _queued_lock:
+        _queued_writes.pop((tracing.current_session(), sheet_name), None)
+
+def expected_fingerprints(sheet_name, ids):
+    """
+    쓰기 대상 행의 불러온 시점 지문 (보관된 지문이 없으면 검사 생략)
+    Returns: (대상 IronID → 지문, 지문 컬럼)
+    """
+    saved = _session_fingerprints(sheet_name)
+    if not saved: return {}, []
+    return {str(i): saved["fp"][str(i)] for i in ids if str(i) in saved["fp"]}, saved["cols"]
+
+def remember_row_fingerprints(sheet_name, rows):
+    """직접 저장한 행은 저장한 내용 기준으로 지문 갱신 (연속 저장 시 자기 자신과 충돌 방지)"""
+    saved = _session_fingerprints(sheet_name)
+    if saved:
+        saved["fp"].update(compute_row_fingerprints(rows, saved["cols"]))
+
+def find_row_conflicts(sheet_data, expected, cols):
+    """
+    서버 최신 데이터에서 대상 행만 골라 지문을 비교합니다. (다른 행은 보지 않으므로 서로 다른 매물 동시 수정은 충돌 없음)
+    - 지문이 다르면 "수정됨", 행이 사라졌으면 "삭제됨"
+    Returns: [{IronID, 번지, 층, reason}]
+    """
+    if not expected: return []
+    server_ids = sheet_data['IronID'].astype(str)
+    touched = sheet_data[server_ids.isin(list(expected))].drop_duplicates(subset=['IronID'])
+    current = compute_row_fingerprints(touched, cols)
+
+    conflicts = []
+    for iid, fp in expected.items():
+        if iid not in current:
+            conflicts.append({"IronID": iid, "번지": "", "층": "", "reason": "삭제됨"})
+        elif current[iid] != fp:
+            row = touched[touched['IronID'].astype(str) == iid].iloc[0]
+            conflicts.append({"IronID": iid, "번지": str(row.get('번지', '')), "층": str(row.get('층', '')), "reason": "수정됨"})
+    return conflicts
+
+def format_conflicts(conflicts, limit=5):
+    """충돌 행 안내 문구 (행별)"""
+    items = []
+    for c in conflicts[:limit]:
+        floor = re.sub(r'\.0$', '', c['층'])
+        items.append(f"{c['번지'] or c['IronID'][:8]}{f' {floor}층' if floor else ''}({c['reason']})")
+    more = f" 외 {len(conflicts) - limit}건" if len(conflicts) > limit else ""
+    return f"다른 사용자가 먼저 변경한 매물 {len(conflicts)}건: " + ", ".join(items) + more
@@ -0,0 +1,199 @@
+# dedup_engine.py
+# 범공인 Pro v24 Enterprise - Duplicate Listing Detector (v25.00 Blocking + Fuzzy Score)
+# Feature: 동 + 본번 Blocking, Area/Floor/호실/Price Similarity, Six-Sheet Report, Pre-Registration Check
+
+import time
+import numpy as np
+import pandas as pd
+import core_engine as engine
+import address_index
+import tracing
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 같은 종류끼리만 비교 (임대 매물과 매매 매물은 같은 건물이어도 중복이 아님)
+SHEET_FAMILIES = {
+    "임대": ["임대", "임대(종료)", "임대브리핑"],
+    "매매": ["매매", "매매(종료)", "매매브리핑"],
+}
+
+# 유사도 가중치 (값이 없는 항목은 빼고 나머지로 정규화)
+WEIGHTS = {"부번": 0.25, "면적": 0.30, "층": 0.20, "호실": 0.10, "가격": 0.15}
+
+# 이 점수 이상이면 중복 의심
+DUPLICATE_THRESHOLD = 0.70
+
+# 비교 가능한 항목 가중치 합이 이보다 작으면 판단 보류 (번지 + 층만 같은 경우 등)
+MIN_EVIDENCE = 0.5
+
+# 면적/가격 상대 오차: 이하면 1점, 상한 이상이면 0점 (사이는 선형)
+AREA_TOLERANCE = (0.05, 0.25)
+PRICE_TOLERANCE = (0.05, 0.30)
+
+# 비교에 쓰는 컬럼 (정제 후)
+FEATURE_COLS = ['지역_동', '번지', '층', '호실', '면적', '보증금', '월차임', '매매가', 'IronID']
+
+def family_sheets(sheet_name):
+    """시트가 속한 종류의 시트 목록 (없으면 자기 자신만)"""
+    for names in SHEET_FAMILIES.values():
+        if sheet_name in names: return names
+    return [sheet_name]
+
+# ==============================================================================
+# [SECTION 2: FEATURE EXTRACTION]
+# ==============================================================================
+
+def build_features(df, sheet_name=""):
+    """
+    비교용 특징 테이블 (정제 전/후 어느 데이터든 가능)
+    block: 동 + 산 + 본번 - 같은 블록 안에서만 쌍을 비교합니다.
+    """
+    cols = [c for c in FEATURE_COLS if c in df.columns]
+    base = engine.sanitize_dataframe(df[cols].copy())
+    parsed = address_index.parse_bunji(base['번지'] if '번지' in base.columns else pd.Series("", index=base.index))
+    dong = base['지역_동'].astype(str).str.replace(r'\s+', '', regex=True) if '지역_동' in base.columns else ""
+
+    def num(col):
+        return pd.to_numeric(base[col], errors='coerce').fillna(0.0) if col in base.columns else pd.Series(0.0, index=base.index)
+
+    feats = pd.DataFrame({
+        "sheet": sheet_name,
+        "pos": np.arange(len(base)),
+        "IronID": base['IronID'].astype(str) if 'IronID' in base.columns else "",
+        "번지": base['번지'].astype(str) if '번지' in base.columns else "",
+        "부번": parsed["부번"],
+        "층": engine._match_key_values(base, '층') if '층' in base.columns else np.nan,
+        "호실": engine._match_key_values(base, '호실') if '호실' in base.columns else "",
+        "면적": num('면적'),
+        "보증금": num('보증금'), "월차임": num('월차임'), "매매가": num('매매가'),
+    }, index=base.index)
+    feats["block"] = (dong + "|" + parsed["산"].map({True: "산", False: ""}) + parsed["본번"].astype("Int64").astype(str))
+    return feats[parsed["본번"].notna()].reset_index(drop=True)
+
+# ==============================================================================
+# [SECTION 3: PAIR SCORING (열 단위 일괄 계산)]
+# ==============================================================================
+
+def _relative_similarity(a, b, tolerance):
+    """상대 오차 기반 유사도 (둘 다 0/없음이면 NaN = 비교 불가)"""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    top = np.maximum(np.abs(a), np.abs(b))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        err = np.abs(a - b) / top
+    lo, hi = tolerance
+    sim = np.clip((hi - err) / (hi - lo), 0.0, 1.0)
+    return np.where((a > 0) & (b > 0), sim, np.nan)
+
+def score_pairs(pairs, is_sale):
+    """
+    후보 쌍(열 이름 *_a / *_b) 유사도 점수 0~1
+    비교할 수 없는 항목(한쪽 값 없음)은 빼고 가중 평균, 근거가 부족하면 NaN
+    """
+    parts = {
+        "부번": np.where(pairs["부번_a"].to_numpy() == pairs["부번_b"].to_numpy(), 1.0, 0.0),
+        "면적": _relative_similarity(pairs["면적_a"], pairs["면적_b"], AREA_TOLERANCE),
+        "층": np.where(pairs["층_a"].to_numpy() == pairs["층_b"].to_numpy(), 1.0, 0.0),
+    }
+    ho_a, ho_b = pairs["호실_a"].to_numpy(dtype=object), pairs["호실_b"].to_numpy(dtype=object)
+    parts["호실"] = np.where((ho_a == "") | (ho_b == ""), np.nan, (ho_a == ho_b).astype(float))
+    if is_sale:
+        parts["가격"] = _relative_similarity(pairs["매매가_a"], pairs["매매가_b"], PRICE_TOLERANCE)
+    else:
+        dep = _relative_similarity(pairs["보증금_a"], pairs["보증금_b"], PRICE_TOLERANCE)
+        rent = _relative_similarity(pairs["월차임_a"], pairs["월차임_b"], PRICE_TOLERANCE)
+        parts["가격"] = np.where(np.isnan(dep), rent, np.where(np.isnan(rent), dep, (dep + rent) / 2))
+
+    total = np.zeros(len(pairs))
+    weight = np.zeros(len(pairs))
+    for name, values in parts.items():
+        ok = ~np.isnan(values)
+        total += np.where(ok, values, 0.0) * WEIGHTS[name]
+        weight += ok * WEIGHTS[name]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(weight >= MIN_EVIDENCE, total / weight, np.nan)
+
+def _candidate_pairs(left, right, same_frame):
+    """같은 블록끼리만 짝지음 (같은 IronID = 복사본이므로 제외)"""
+    pairs = left.merge(right, on="block", suffixes=("_a", "_b"))
+    if same_frame:
+        pairs = pairs[(pairs["sheet_a"] < pairs["sheet_b"]) |
+                      ((pairs["sheet_a"] == pairs["sheet_b"]) & (pairs["pos_a"] < pairs["pos_b"]))]
+    return pairs[pairs["IronID_a"] != pairs["IronID_b"]]
+
+# ==============================================================================
+# [SECTION 4: DETECTION]
+# ==============================================================================
+
+REPORT_COLS = ["점수", "시트1", "번지1", "층1", "면적1", "시트2", "번지2", "층2", "면적2", "IronID1", "IronID2"]
+
+def _to_report(pairs, scores, threshold):
+    keep = scores >= threshold
+    pairs = pairs[keep]
+    report = pd.DataFrame({
+        "점수": np.round(scores[keep], 2),
+        "시트1": pairs["sheet_a"].to_numpy(), "번지1": pairs["번지_a"].to_numpy(),
+        "층1": pairs["층_a"].to_numpy(), "면적1": pairs["면적_a"].to_numpy(),
+        "시트2": pairs["sheet_b"].to_numpy(), "번지2": pairs["번지_b"].to_numpy(),
+        "층2": pairs["층_b"].to_numpy(), "면적2": pairs["면적_b"].to_numpy(),
+        "IronID1": pairs["IronID_a"].to_numpy(), "IronID2": pairs["IronID_b"].to_numpy(),
+    }, columns=REPORT_COLS)
+    return report.sort_values("점수", ascending=False, kind="stable").reset_index(drop=True)
+
+@tracing.span("dedup.find_duplicates")
+def find_duplicates(frames, is_sale, threshold=DUPLICATE_THRESHOLD):
+    """
+    같은 종류 시트들(frames: 시트명 → 데이터프레임) 전체에서 중복 의심 쌍을 찾습니다.
+    Returns: 점수 내림차순 보고서 (REPORT_COLS)
+    """
+    parts = [build_features(df, name) for name, df in frames.items() if df is not None and len(df)]
+    feats = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    if feats.empty: return pd.DataFrame(columns=REPORT_COLS)
+    pairs = _candidate_pairs(feats, feats, same_frame=True)
+    return _to_report(pairs, score_pairs(pairs, is_sale), threshold)
+
+def find_matches(new_row, df, sheet_name, threshold=DUPLICATE_THRESHOLD):
+    """
+    신규 매물 1건과 중복 의심되는 기존 행 (등록 전 검사용, 같은 블록 행만 정제/비교)
+    Returns: 보고서 형식 (시트1 = 신규)
+    """
+    if df is None or not len(df): return pd.DataFrame(columns=REPORT_COLS)
+    new = build_features(pd.DataFrame([new_row]), "신규")
+    if new.empty or '번지' not in df.columns: return pd.DataFrame(columns=REPORT_COLS)
+
+    # 전체 시트는 동 → 번지 순으로 좁혀 같은 블록 후보만 남김 (번지 해석은 같은 동 행만)
+    new_dong = new["block"].iloc[0].split("|")[0]
+    if '지역_동' in df.columns:
+        df = df[(df['지역_동'].astype(str).str.replace(r'\s+', '', regex=True) == new_dong).to_numpy()]
+    elif new_dong:
+        return pd.DataFrame(columns=REPORT_COLS)
+    parsed = address_index.parse_bunji(df['번지'])
+    block = new_dong + "|" + parsed["산"].map({True: "산", False: ""}) + parsed["본번"].astype("Int64").astype(str)
+    candidates = df[(block == new["block"].iloc[0]).to_numpy()]
+    if candidates.empty: return pd.DataFrame(columns=REPORT_COLS)
+
+    pairs = _candidate_pairs(new, build_features(candidates, sheet_name), same_frame=False)
+    return _to_report(pairs, score_pairs(pairs, "매매" in sheet_name), threshold)
+
+def format_matches(matches, limit=3):
+    """중복 의심 목록 안내 문구"""
+    lines = [f"[{r['시트2']}] {r['번지2']} {r['층2']:g}층 {r['면적2']:g}평 (유사도 {r['점수']:.0%})"
+             for _, r in matches.head(limit).iterrows()]
+    more = f" 외 {len(matches) - limit}건" if len(matches) > limit else ""
+    return ", ".join(lines) + more
+
+def duplicate_report(loader=None, threshold=DUPLICATE_THRESHOLD):
+    """
+    6개 시트 전체 중복 보고서 (임대 계열 / 매매 계열 각각)
+    loader: 시트명 → 데이터프레임 (기본: 캐시된 load_sheet_data)
+    Returns: (보고서 DataFrame, 소요 초)
+    """
+    loader = loader or engine.load_sheet_data
+    t0 = time.perf_counter()
+    reports = []
+    for kind, names in SHEET_FAMILIES.items():
+        frames = {name: loader(name) for name in names}
+        reports.append(find_duplicates(frames, kind == "매매", threshold))
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLS)
+    return report, time.perf_counter() - t0
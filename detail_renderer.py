@@ -4,11 +4,13 @@
 
 import streamlit as st
 import pandas as pd
-import time
 import re
 import core_engine as engine
 import map_service as map_api
 import infra_engine
+import tracing
+import write_queue
+import archive_store
 
 def render_detail_view(item):
     """
@@ -19,6 +21,12 @@ def render_detail_view(item):
         st.session_state.selected_item = None
         st.rerun()
 
+    # 종료 시트(보관소)는 목록에 인덱스 컬럼만 있으므로 전체 행을 불러와 합침 (행 그룹 1개만 읽음)
+    if archive_store.has_store(st.session_state.current_sheet):
+        with tracing.span("archive.read_row"):
+            full = archive_store.read_row(st.session_state.current_sheet, item.get('IronID'))
+        if full: item = {**full, **dict(item)}
+
     # 데이터 정제 (NaN -> 공백)
     item = {k: (str(v).replace('nan', '') if pd.notna(v) else '') for k, v in item.items()}
     current_sheet = st.session_state.current_sheet
@@ -26,7 +34,8 @@ def render_detail_view(item):
 
     # [B] 인프라 분석 및 지도 준비
     addr_full = f"{item.get('지역_구', '')} {item.get('지역_동', '')} {item.get('번지', '')}".strip()
-    lat, lng = map_api.get_naver_geocode(addr_full)
+    with tracing.span("detail.geocode"):
+        lat, lng = map_api.get_naver_geocode(addr_full)
     
     # 줌 레벨 초기화 (네이버 지도 최적값 17)
     if 'map_zoom' not in st.session_state:
@@ -39,208 +48,234 @@ def render_detail_view(item):
 
     # --- LEFT COLUMN: MAP & INFRA CONTROL ---
     with col_left:
-        st.info(f"📍 {addr_full}")
-        
-        if lat and lng:
-            # 줌 컨트롤러
-            z1, z2, z_info = st.columns([1, 1, 4])
-            if z1.button("➕ 확대"):
-                st.session_state.map_zoom = min(st.session_state.map_zoom + 1, 20)
-                st.rerun()
-            if z2.button("➖ 축소"):
-                st.session_state.map_zoom = max(st.session_state.map_zoom - 1, 10)
-                st.rerun()
-            z_info.caption(f"현재 줌 레벨: {st.session_state.map_zoom}")
-
-            # 지도 이미지 출력 (높이 800px)
+        render_map_panel(addr_full, lat, lng)
+
+    # --- RIGHT COLUMN: 4-TAB DETAIL FORM ---
+    # 각 탭은 독립 Fragment로 동작 (저장/입력 시 해당 탭만 재실행)
+    with col_right:
+        t1, t2, t3, t4 = st.tabs(["📝 기본/주소", "📑 시설/내용", "📁 기타 정보", "💬 브리핑"])
+        with t1: render_basic_tab(item, current_sheet, is_sale_mode)
+        with t2: render_facility_tab(item, current_sheet, is_sale_mode)
+        with t3: render_etc_tab(item, current_sheet)
+        with t4: render_briefing_tab(item, is_sale_mode)
+
+    # [D] 하단 지능형 액션 바
+    st.divider()
+    render_smart_action_bar(item, current_sheet, is_sale_mode)
+
+@st.fragment
+def render_map_panel(addr_full, lat, lng):
+    """지도 + 줌 컨트롤 + 상권 분석 패널 (Fragment: 줌/분석 시 패널만 재실행)"""
+    st.info(f"📍 {addr_full}")
+    
+    if lat and lng:
+        # 줌 컨트롤러
+        z1, z2, z_info = st.columns([1, 1, 4])
+        # (클릭 시 패널 Fragment만 재실행되며, 아래 지도가 새 줌 레벨로 다시 그려짐)
+        if z1.button("➕ 확대"):
+            st.session_state.map_zoom = min(st.session_state.map_zoom + 1, 20)
+        if z2.button("➖ 축소"):
+            st.session_state.map_zoom = max(st.session_state.map_zoom - 1, 10)
+        z_info.caption(f"현재 줌 레벨: {st.session_state.map_zoom}")
+
+        # 지도 이미지 출력 (높이 800px)
+        with tracing.span("detail.map_image"):
             map_img = map_api.fetch_map_image(lat, lng, height=800, zoom_level=st.session_state.map_zoom)
-            if map_img:
-                st.image(map_img, use_container_width=True)
-            
-            naver_url = f"https://map.naver.com/v5/search/{addr_full}?c={lng},{lat},17,0,0,0,dh"
-            st.link_button("🗺️ 네이버 지도 앱에서 열기", naver_url, use_container_width=True)
-            
-            # [상권 분석 섹션]
-            st.divider()
-            if st.button("📊 상권 요약 분석 보기 (300m 반경)", use_container_width=True):
-                with st.spinner("주변 시설 및 상권을 분석 중입니다..."):
-                    infra_data = infra_engine.get_commercial_analysis(lat, lng)
-                    if infra_data:
+        if map_img:
+            st.image(map_img, use_container_width=True)
+        
+        naver_url = f"https://map.naver.com/v5/search/{addr_full}?c={lng},{lat},17,0,0,0,dh"
+        st.link_button("🗺️ 네이버 지도 앱에서 열기", naver_url, use_container_width=True)
+        
+        # [상권 분석 섹션]
+        st.divider()
+        if st.button("📊 상권 요약 분석 보기 (300m 반경)", use_container_width=True):
+            # 결과 자리를 먼저 그려두고, 도착하는 순서대로 채움 (지하철 → 시설 → 앵커)
+            sub_slot = st.empty()
+            degraded_slot = st.empty()
+            sub_slot.info("🚇 가까운 지하철역을 찾는 중입니다...")
+
+            # 분석 테이블 출력 (높이 300 고정)
+            tab_fac, tab_anchor = st.tabs(["편의 시설", "앵커 브랜드"])
+            with tab_fac:
+                fac_slot = st.empty()
+                fac_slot.caption("⏳ 주변 시설을 분석 중입니다...")
+            with tab_anchor:
+                anchor_slot = st.empty()
+                anchor_slot.caption("⏳ 앵커 브랜드를 스캔 중입니다...")
+
+            received = False
+            with tracing.trace_scope("detail.commercial_analysis"):
+                for part, value in infra_engine.iter_commercial_analysis(lat, lng):
+                    received = True
+                    if part == "subway":
                         # 1. 지하철 정보
-                        sub = infra_data.get('subway', {})
+                        sub = value
                         if sub.get('station') and sub['station'] != "정보 없음":
                              w_min = int(round(sub.get('walk', 0)))
                              if w_min == 0: w_min = 1
-                             st.success(f"🚇 **{sub['station']}** ({sub.get('line','')}) : 도보 약 {w_min}분 ({int(sub.get('dist', 0))}m)")
+                             sub_slot.success(f"🚇 **{sub['station']}** ({sub.get('line','')}) : 도보 약 {w_min}분 ({int(sub.get('dist', 0))}m)")
                              st.session_state.last_subway_info = f" ({sub['station']} 도보 {w_min}분)"
                         else:
+                             sub_slot.info("🚇 반경 1.5km 이내 지하철역 정보가 없습니다.")
                              st.session_state.last_subway_info = ""
 
-                        # 2. 분석 테이블 출력 (높이 300 고정)
-                        tab_fac, tab_anchor = st.tabs(["편의 시설", "앵커 브랜드"])
-                        
-                        with tab_fac:
-                            fac_df = infra_data.get('facilities')
-                            if fac_df is not None and not fac_df.empty:
-                                st.dataframe(fac_df, use_container_width=True, hide_index=True, height=300)
-                            else:
-                                st.info("주변 300m 이내 주요 시설 데이터가 없습니다.")
-
-                        with tab_anchor:
-                            anchor_df = infra_data.get('anchors')
-                            if anchor_df is not None and not anchor_df.empty:
-                                st.dataframe(anchor_df, use_container_width=True, hide_index=True, height=300)
-                            else:
-                                st.info("주변 1km 이내 주요 브랜드가 없습니다.")
-                    else:
-                        st.error("분석 데이터를 가져오지 못했습니다.")
+                    elif part == "facilities":
+                        # 2. 편의 시설
+                        if value is not None and not value.empty:
+                            fac_slot.dataframe(value, use_container_width=True, hide_index=True, height=300)
+                        else:
+                            fac_slot.info("주변 300m 이내 주요 시설 데이터가 없습니다.")
+
+                    elif part == "anchors":
+                        # 3. 앵커 브랜드
+                        if value is not None and not value.empty:
+                            anchor_slot.dataframe(value, use_container_width=True, hide_index=True, height=300)
+                        else:
+                            anchor_slot.info("주변 1km 이내 주요 브랜드가 없습니다.")
+
+                    elif part == "degraded" and value:
+                        degraded_slot.caption("⚠️ API 사용량 한도에 도달하여 캐시/직선거리 기반 결과를 표시합니다.")
+
+            if not received:
+                sub_slot.error("분석 데이터를 가져오지 못했습니다.")
+    else:
+        st.error("위치 정보를 찾을 수 বাতাসে 없습니다. (주소 확인 필요)")
+
+@st.fragment
+def render_basic_tab(item, current_sheet, is_sale_mode):
+    """[TAB 1] 기본 정보 (1열 배치)"""
+    with st.form("form_basic"):
+        updates_basic = {}
+        
+        if is_sale_mode:
+            fields_sale = ['구분', '지역_구', '지역_동', '번지', '해당층', '호실', 
+                           '매매가', '대지면적', '건축면적', '연면적', '전용면적', '수익률', '연락처']
+            for col in fields_sale:
+                updates_basic[col] = st.text_input(col, value=item.get(col, ''))
         else:
-            st.error("위치 정보를 찾을 수 বাতাসে 없습니다. (주소 확인 필요)")
+            fields_rent = ['구분', '지역_구', '지역_동', '번지', '층', '호실', 
+                           '보증금', '월차임', '관리비', '권리금', '면적', '연락처']
+            for col in fields_rent:
+                updates_basic[col] = st.text_input(col, value=item.get(col, ''))
 
-    # --- RIGHT COLUMN: 4-TAB DETAIL FORM ---
-    with col_right:
-        t1, t2, t3, t4 = st.tabs(["📝 기본/주소", "📑 시설/내용", "📁 기타 정보", "💬 브리핑"])
+        # 연락처 특수 기능
+        contact_val = updates_basic.get('연락처', '')
+        if contact_val:
+            clean_num = re.sub(r'[^0-9]', '', contact_val)
+            if len(clean_num) >= 9:
+                bc1, bc2 = st.columns(2)
+                bc1.markdown(f'''<a href="tel:{clean_num}" target="_self" style="text-decoration:none;">
+                    <div style="text-align:center; background-color:#e8f0fe; padding:10px; border-radius:8px; border:1px solid #ccc; font-weight:bold;">📞 전화 걸기</div></a>''', unsafe_allow_html=True)
+                bc2.markdown(f'''<a href="sms:{clean_num}" target="_self" style="text-decoration:none;">
+                    <div style="text-align:center; background-color:#e8f0fe; padding:10px; border-radius:8px; border:1px solid #ccc; font-weight:bold;">💬 문자 보내기</div></a>''', unsafe_allow_html=True)
 
-        # [TAB 1] 기본 정보 (1열 배치)
-        with t1:
-            with st.form("form_basic"):
-                updates_basic = {}
-                
-                if is_sale_mode:
-                    fields_sale = ['구분', '지역_구', '지역_동', '번지', '해당층', '호실', 
-                                   '매매가', '대지면적', '건축면적', '연면적', '전용면적', '수익률', '연락처']
-                    for col in fields_sale:
-                        updates_basic[col] = st.text_input(col, value=item.get(col, ''))
-                else:
-                    fields_rent = ['구분', '지역_구', '지역_동', '번지', '층', '호실', 
-                                   '보증금', '월차임', '관리비', '권리금', '면적', '연락처']
-                    for col in fields_rent:
-                        updates_basic[col] = st.text_input(col, value=item.get(col, ''))
-
-                # 연락처 특수 기능
-                contact_val = updates_basic.get('연락처', '')
-                if contact_val:
-                    clean_num = re.sub(r'[^0-9]', '', contact_val)
-                    if len(clean_num) >= 9:
-                        bc1, bc2 = st.columns(2)
-                        bc1.markdown(f'''<a href="tel:{clean_num}" target="_self" style="text-decoration:none;">
-                            <div style="text-align:center; background-color:#e8f0fe; padding:10px; border-radius:8px; border:1px solid #ccc; font-weight:bold;">📞 전화 걸기</div></a>''', unsafe_allow_html=True)
-                        bc2.markdown(f'''<a href="sms:{clean_num}" target="_self" style="text-decoration:none;">
-                            <div style="text-align:center; background-color:#e8f0fe; padding:10px; border-radius:8px; border:1px solid #ccc; font-weight:bold;">💬 문자 보내기</div></a>''', unsafe_allow_html=True)
-
-                st.write("")
-                if st.form_submit_button("💾 기본정보 저장", use_container_width=True):
-                    item.update(updates_basic)
-                    success, msg = engine.update_single_row(item, current_sheet)
-                    handle_save_result(success, msg, updates_basic)
-
-        # [TAB 2] 시설/내용 수정
-        with t2:
-            with st.form("form_facility"):
-                updates_fac = {}
-                
-                if is_sale_mode:
-                    fields_fac_sale = ['주용도', '기보증금', '기월세', '관리비', '주차', 'EV', '현업종']
-                    for col in fields_fac_sale:
-                        updates_fac[col] = st.text_input(col, value=item.get(col, ''))
-                    updates_fac['특이사항'] = st.text_area("특이사항 (내부용)", value=item.get('특이사항', ''), height=100)
-                else:
-                    fields_fac_rent = ['현업종', '주차', '화장실', 'E/V', '층고']
-                    for col in fields_fac_rent:
-                        updates_fac[col] = st.text_input(col, value=item.get(col, ''))
-                    
-                    updates_fac['특이사항'] = st.text_area("특이사항 (내부용)", value=item.get('특이사항', ''), height=100)
-                    updates_fac['매물특징'] = st.text_area("매물특징 (브리핑용)", value=item.get('매물특징', ''), height=150)
-
-                if st.form_submit_button("💾 시설정보 저장", use_container_width=True):
-                    item.update(updates_fac)
-                    success, msg = engine.update_single_row(item, current_sheet)
-                    handle_save_result(success, msg, updates_fac)
-
-        # [TAB 3] 기타 정보 (멀티 스마트 링크 버튼 탑재)
-        with t3:
-            with st.form("form_etc"):
-                updates_etc = {}
-                fields_etc = ['접수경로', '접수일', '사진', '광고_포스', '광고_모두', '광고_블로그', '사용승인일', '건축물용도']
-                link_targets = ['사진', '광고_포스', '광고_모두', '광고_블로그']
-                
-                for col in fields_etc:
-                    val = item.get(col, '')
-                    updates_etc[col] = st.text_input(col, value=val)
-                    
-                    # [핵심] 지정된 필드에서 http로 시작하는 값이 있을 경우 바로가기 버튼 생성
-                    if col in link_targets and val.strip().startswith('http'):
-                        st.link_button(f"🚀 {col} 바로가기 (새 창)", val.strip(), use_container_width=True)
-                
-                if st.form_submit_button("💾 기타정보 저장", use_container_width=True):
-                    item.update(updates_etc)
-                    success, msg = engine.update_single_row(item, current_sheet)
-                    handle_save_result(success, msg, updates_etc)
-
-        # [TAB 4] 카톡 브리핑 생성 (원클릭 복사 탑재)
-        with t4:
-            st.markdown("##### 💬 카톡 브리핑 생성기")
-            
-            sub_txt = st.session_state.get('last_subway_info', '')
-            
-            # 번지 필수 포함
-            b_loc = f"{item.get('지역_구','')} {item.get('지역_동','')} {item.get('번지','')}{sub_txt}"
-            b_name = f"{item.get('건물명','')} ({item.get('층','')}층)"
-            
-            if is_sale_mode:
-                b_price = f"매매 {item.get('매매가','-')}만"
-                if item.get('수익률'): b_price += f" (수익률 {item.get('수익률')}%)"
-                b_spec = f"대지 {item.get('대지면적','-')}평 / 연면 {item.get('연면적','-')}평"
-            else:
-                b_price = f"보 {item.get('보증금','-')} / 월 {item.get('월차임','-')} / 관 {item.get('관리비','-')}"
-                if item.get('권리금') and item.get('권리금') != '0': b_price += f" / 권 {item.get('권리금')}"
-                # '실' 대신 '약' 사용
-                b_spec = f"약 {item.get('면적','-')}평"
+        st.write("")
+        if st.form_submit_button("💾 기본정보 저장", use_container_width=True):
+            save_item(item, current_sheet, updates_basic)
+
+@st.fragment
+def render_facility_tab(item, current_sheet, is_sale_mode):
+    """[TAB 2] 시설/내용 수정"""
+    with st.form("form_facility"):
+        updates_fac = {}
+        
+        if is_sale_mode:
+            fields_fac_sale = ['주용도', '기보증금', '기월세', '관리비', '주차', 'EV', '현업종']
+            for col in fields_fac_sale:
+                updates_fac[col] = st.text_input(col, value=item.get(col, ''))
+            updates_fac['특이사항'] = st.text_area("특이사항 (내부용)", value=item.get('특이사항', ''), height=100)
+        else:
+            fields_fac_rent = ['현업종', '주차', '화장실', 'E/V', '층고']
+            for col in fields_fac_rent:
+                updates_fac[col] = st.text_input(col, value=item.get(col, ''))
             
-            b_feat = item.get('매물특징', '') or "문의 요망"
+            updates_fac['특이사항'] = st.text_area("특이사항 (내부용)", value=item.get('특이사항', ''), height=100)
+            updates_fac['매물특징'] = st.text_area("매물특징 (브리핑용)", value=item.get('매물특징', ''), height=150)
+
+        if st.form_submit_button("💾 시설정보 저장", use_container_width=True):
+            save_item(item, current_sheet, updates_fac)
+
+@st.fragment
+def render_etc_tab(item, current_sheet):
+    """[TAB 3] 기타 정보 (멀티 스마트 링크 버튼 탑재)"""
+    with st.form("form_etc"):
+        updates_etc = {}
+        fields_etc = ['접수경로', '접수일', '사진', '광고_포스', '광고_모두', '광고_블로그', '사용승인일', '건축물용도']
+        link_targets = ['사진', '광고_포스', '광고_모두', '광고_블로그']
+        
+        for col in fields_etc:
+            val = item.get(col, '')
+            updates_etc[col] = st.text_input(col, value=val)
             
-            # 하단 서명 삭제
-            briefing_text = f"""[매물 브리핑] (네이버 지도 기준)
+            # [핵심] 지정된 필드에서 http로 시작하는 값이 있을 경우 바로가기 버튼 생성
+            if col in link_targets and val.strip().startswith('http'):
+                st.link_button(f"🚀 {col} 바로가기 (새 창)", val.strip(), use_container_width=True)
+        
+        if st.form_submit_button("💾 기타정보 저장", use_container_width=True):
+            save_item(item, current_sheet, updates_etc)
+
+@st.fragment
+def render_briefing_tab(item, is_sale_mode):
+    """[TAB 4] 카톡 브리핑 생성 (원클릭 복사 탑재)"""
+    st.markdown("##### 💬 카톡 브리핑 생성기")
+    
+    sub_txt = st.session_state.get('last_subway_info', '')
+    
+    # 번지 필수 포함
+    b_loc = f"{item.get('지역_구','')} {item.get('지역_동','')} {item.get('번지','')}{sub_txt}"
+    b_name = f"{item.get('건물명','')} ({item.get('층','')}층)"
+    
+    if is_sale_mode:
+        b_price = f"매매 {item.get('매매가','-')}만"
+        if item.get('수익률'): b_price += f" (수익률 {item.get('수익률')}%)"
+        b_spec = f"대지 {item.get('대지면적','-')}평 / 연면 {item.get('연면적','-')}평"
+    else:
+        b_price = f"보 {item.get('보증금','-')} / 월 {item.get('월차임','-')} / 관 {item.get('관리비','-')}"
+        if item.get('권리금') and item.get('권리금') != '0': b_price += f" / 권 {item.get('권리금')}"
+        # '실' 대신 '약' 사용
+        b_spec = f"약 {item.get('면적','-')}평"
+    
+    b_feat = item.get('매물특징', '') or "문의 요망"
+    
+    # 하단 서명 삭제
+    briefing_text = f"""[매물 브리핑] (네이버 지도 기준)
 📍 위치: {b_loc}
 🏢 건물: {b_name}
 📐 스펙: {b_spec}
 💰 금액: {b_price}
 📝 특징: {b_feat}"""
-            
-            # 텍스트 에어리어 표시
-            st.text_area("브리핑 텍스트", value=briefing_text, height=220, key="briefing_area")
-            
-            # 원클릭 복사 버튼 (HTML/JS)
-            copy_button_html = f"""
-            <script>
-            function copyToClipboard() {{
-                const textToCopy = `{briefing_text}`;
-                navigator.clipboard.writeText(textToCopy).then(() => {{
-                    const btn = document.getElementById("copyBtn");
-                    btn.innerHTML = "✅ 복사 완료!";
-                    btn.style.backgroundColor = "#4caf50";
-                    btn.style.color = "white";
-                    setTimeout(() => {{
-                        btn.innerHTML = "📋 브리핑 텍스트 복사하기";
-                        btn.style.backgroundColor = "#f0f2f6";
-                        btn.style.color = "black";
-                    }}, 2000);
-                }}).catch(err => {{
-                    console.error('Failed to copy: ', err);
-                }});
-            }}
-            </script>
-            <button id="copyBtn" onclick="copyToClipboard()" 
-                style="width: 100%; padding: 10px; border-radius: 8px; border: 1px solid #ccc; 
-                       background-color: #f0f2f6; font-weight: bold; cursor: pointer; font-size: 14px;">
-                📋 브리핑 텍스트 복사하기
-            </button>
-            """
-            st.components.v1.html(copy_button_html, height=50)
-
-    # [D] 하단 지능형 액션 바
-    st.divider()
-    render_smart_action_bar(item, current_sheet, is_sale_mode)
+    
+    # 텍스트 에어리어 표시
+    st.text_area("브리핑 텍스트", value=briefing_text, height=220, key="briefing_area")
+    
+    # 원클릭 복사 버튼 (HTML/JS)
+    copy_button_html = f"""
+    <script>
+    function copyToClipboard() {{
+        const textToCopy = `{briefing_text}`;
+        navigator.clipboard.writeText(textToCopy).then(() => {{
+            const btn = document.getElementById("copyBtn");
+            btn.innerHTML = "✅ 복사 완료!";
+            btn.style.backgroundColor = "#4caf50";
+            btn.style.color = "white";
+            setTimeout(() => {{
+                btn.innerHTML = "📋 브리핑 텍스트 복사하기";
+                btn.style.backgroundColor = "#f0f2f6";
+                btn.style.color = "black";
+            }}, 2000);
+        }}).catch(err => {{
+            console.error('Failed to copy: ', err);
+        }});
+    }}
+    </script>
+    <button id="copyBtn" onclick="copyToClipboard()" 
+        style="width: 100%; padding: 10px; border-radius: 8px; border: 1px solid #ccc; 
+               background-color: #f0f2f6; font-weight: bold; cursor: pointer; font-size: 14px;">
+        📋 브리핑 텍스트 복사하기
+    </button>
+    """
+    st.components.v1.html(copy_button_html, height=50)
 
 def render_smart_action_bar(item, sheet_name, is_sale):
     """시트 상태별 맞춤형 액션 버튼"""
@@ -286,27 +321,110 @@ def render_smart_action_bar(item, sheet_name, is_sale):
             engine.execute_transaction("delete", target_df, sheet_name)
             reset_and_close()
 
+def save_item(item, current_sheet, updates):
+    """
+    상세 화면 저장: 저장 대기열에 등록하고 화면에 바로 반영합니다.
+    반영 전 값은 세션에 보관 → 시트 반영이 실패하면 render_write_status가 화면 값을 되돌림
+    """
+    source = st.session_state.selected_item
+    before = {k: (source.get(k) if source is not None else None) for k in updates}
+    item.update(updates)
+    success, msg, entry_id = write_queue.enqueue_row_update(item, current_sheet)
+    if success and entry_id:
+        st.session_state.setdefault('queued_patches', {})[entry_id] = {
+            "sheet": current_sheet, "IronID": item.get('IronID'), "before": before, "after": dict(updates)}
+    handle_save_result(success, msg, updates)
+
+def _apply_patch(patch, values):
+    """대기열 저장 건의 값을 화면 데이터(목록 / 열린 상세)에 반영"""
+    if st.session_state.get('current_sheet') == patch["sheet"] and st.session_state.get('df_main') is not None:
+        st.session_state.df_main = engine.apply_row_updates(st.session_state.df_main, patch["IronID"], values)
+        st.session_state.data_version = st.session_state.get('data_version', 0) + 1
+    selected = st.session_state.get('selected_item')
+    if selected is not None and str(selected.get('IronID')) == str(patch["IronID"]):
+        selected.update(values)
+
+def _sync_queued_patches():
+    """
+    이 세션의 대기열 저장 건 상태를 화면에 맞춥니다.
+    실패 → 저장 전 값으로 되돌림 / 반영 완료 → 추적 종료 (다시 시도·버리기는 버튼 콜백에서 처리)
+    Returns: 이번에 되돌린 건수
+    """
+    patches = st.session_state.get('queued_patches') or {}
+    queue = write_queue.get_queue()
+    reverted = 0
+    for entry_id, patch in list(patches.items()):
+        state = queue.state(entry_id)
+        if state is None:
+            patches.pop(entry_id)
+        elif state == "failed" and not patch.get("reverted"):
+            _apply_patch(patch, patch["before"])
+            patch["reverted"] = True
+            reverted += 1
+    return reverted
+
+def _retry_entry(entry_id, force=False):
+    """실패 건 재시도 (되돌렸던 화면 값을 다시 저장 값으로)"""
+    patch = (st.session_state.get('queued_patches') or {}).get(entry_id)
+    if patch and patch.get("reverted"):
+        _apply_patch(patch, patch["after"])
+        patch["reverted"] = False
+    write_queue.get_queue().retry(entry_id, force)
+
+def _discard_entry(entry_id):
+    """실패 건 버리기 (화면은 이미 저장 전 값)"""
+    (st.session_state.get('queued_patches') or {}).pop(entry_id, None)
+    write_queue.get_queue().discard(entry_id)
+
 def handle_save_result(success, msg, updates):
     """
     저장 결과 처리 및 메모리 즉시 주입 (Live Sync)
     """
     if success:
-        st.success("✅ 저장되었습니다!")
+        st.toast(msg, icon="💾")
         if st.session_state.selected_item is not None:
             st.session_state.selected_item.update(updates)
+            # 목록 데이터는 전체 재로드 대신 해당 행만 갱신 (탭 Fragment만 재실행)
+            if 'df_main' in st.session_state:
+                st.session_state.df_main = engine.apply_row_updates(
+                    st.session_state.df_main, st.session_state.selected_item.get('IronID'), updates)
+                # 목록 필터 캐시 무효화 (수정된 값으로 다시 필터링)
+                st.session_state.data_version = st.session_state.get('data_version', 0) + 1
         
-        time.sleep(0.5)
-        if 'df_main' in st.session_state: 
-            del st.session_state.df_main
-        st.rerun()
+        st.rerun(scope="fragment")
     else:
         st.error(f"❌ 저장 실패: {msg}")
 
 def reset_and_close():
     """작업 완료 후 목록으로 복귀"""
-    st.success("처리 완료!")
-    time.sleep(1.0)
+    st.toast("처리 완료!", icon="✅")
     st.session_state.selected_item = None
     if 'df_main' in st.session_state: 
         del st.session_state.df_main
     st.rerun()
+
+@st.fragment(run_every=3)
+def render_write_status():
+    """
+    저장 대기열 상태 (사이드바) - 대기 건수 / 실패 건 재시도·덮어쓰기·버리기
+    이 세션이 등록한 수정 건만 표시 (다른 사용자의 충돌 건을 덮어쓰지 않도록)
+    """
+    if _sync_queued_patches():
+        st.rerun()  # 되돌린 값으로 목록/상세 화면 다시 그리기
+    status = write_queue.get_queue().status(tracing.current_session())
+    if status["pending"]:
+        st.caption(f"⏳ 시트 반영 대기 {status['pending']}건")
+    for e in status["failed"]:
+        row = e.get("row", {})
+        with st.container(border=True):
+            st.markdown(f"❌ **{e['sheet']}** {row.get('번지', '')} {row.get('층', '')}층 저장 실패")
+            st.caption(e.get("error") or "")
+            c1, c2 = st.columns(2)
+            if e.get("conflict"):
+                c1.button("덮어쓰기", key=f"wq_force_{e['id']}", use_container_width=True,
+                          on_click=_retry_entry, args=(e["id"], True))
+            else:
+                c1.button("다시 시도", key=f"wq_retry_{e['id']}", use_container_width=True,
+                          on_click=_retry_entry, args=(e["id"],))
+            c2.button("버리기", key=f"wq_discard_{e['id']}", use_container_width=True,
+                      on_click=_discard_entry, args=(e["id"],))
@@ -0,0 +1,217 @@
+# fuzzy_search.py
+# 범공인 Pro v24 Enterprise - Fuzzy Search Module (v25.00 Typo-Tolerant)
+# Feature: 자모/초성 Decomposition, Token Trigram Index, Edit-Distance Verification, Top-K Ranked Search, 초성 Query
+
+import re
+import weakref
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 색인 대상 컬럼 (주소 + 자유 입력 텍스트)
+INDEX_COLS = ['지역_구', '지역_동', '번지', '건물명', '현업종', '매물특징', '인근역']
+
+# 토큰 구분: 공백과 문장부호 ('-'는 번지 일부이므로 유지)
+TOKEN_PATTERN = r'[^\s,./·()\[\]{}:;!?\'"~|]+'
+
+# 허용 오타 수 (검색어 자모 길이 기준): 짧은 검색어는 오타를 허용하면 엉뚱한 결과가 많아짐
+def max_edits(length):
+    if length < 5: return 0
+    if length < 12: return 1
+    return 2
+
+# 검색어 1개당 편집 거리 검증까지 가는 후보 토큰 상한 (트라이그램 공유 수 상위)
+MAX_VERIFY = 300
+
+# 검색 결과 상한 (점수 순)
+TOP_K = 500
+
+# ==============================================================================
+# [SECTION 2: 한글 분해 (자모 / 초성)]
+# ==============================================================================
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 완성형 11,172자 → 호환 자모 (str.translate용 표, 1회 생성)
+_JAMO_TABLE = {}
+_CHO_TABLE = {}
+for _code in range(0xAC00, 0xD7A4):
+    _cho, _rest = divmod(_code - 0xAC00, 588)
+    _jung, _jong = divmod(_rest, 28)
+    _JAMO_TABLE[_code] = CHOSEONG[_cho] + JUNGSEONG[_jung] + JONGSEONG[_jong]
+    _CHO_TABLE[_code] = CHOSEONG[_cho]
+
+_CHOSEONG_ONLY = re.compile(r'^[ㄱ-ㅎ]+$')
+
+def to_jamo(text):
+    """'역삼동' → 'ㅇㅕㄱㅅㅏㅁㄷㅗㅇ' (한글 외 문자는 그대로)"""
+    return str(text).translate(_JAMO_TABLE)
+
+def to_choseong(text):
+    """'역삼동' → 'ㅇㅅㄷ' (한글 외 문자는 그대로)"""
+    return str(text).translate(_CHO_TABLE)
+
+def _trigrams(jamo):
+    return {jamo[i:i + 3] for i in range(len(jamo) - 2)}
+
+def substring_distance(query, token, limit):
+    """
+    token 안의 어느 부분 문자열과 query 사이 최소 편집 거리 (부분 일치 = 0)
+    limit를 넘으면 계산을 멈추고 limit + 1 반환
+    """
+    prev = [0] * (len(token) + 1)
+    for i, qc in enumerate(query, 1):
+        cur = [i] + [0] * len(token)
+        for j, tc in enumerate(token, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (qc != tc))
+        if min(cur) > limit: return limit + 1
+        prev = cur
+    return min(prev)
+
+# ==============================================================================
+# [SECTION 3: INDEX]
+# ==============================================================================
+
+class FuzzyIndex:
+    """
+    데이터프레임 1개의 검색 인덱스 (행 위치 기준)
+    - vocab: 고유 토큰 (소문자), 토큰별 자모/초성 분해는 생성 시 1회만 계산
+    - trigram → 토큰 번호 (자모 단위라 '동'→'둥' 같은 오타는 트라이그램 몇 개만 달라짐)
+    - 토큰 → 행 위치 (CSR 배열)
+    """
+    def __init__(self, df):
+        cols = [c for c in INDEX_COLS if c in df.columns]
+        text = pd.Series("", index=df.index)
+        for c in cols:
+            text = text + " " + df[c].astype(str).where(df[c].notna(), "")
+        tokens = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        rows = np.repeat(np.arange(len(df)), text.str.lower().str.count(TOKEN_PATTERN).to_numpy())
+        token_ids, vocab = pd.factorize(tokens.to_numpy())
+
+        # 토큰 → 행 위치 (같은 행의 같은 토큰은 1번만)
+        pairs = np.unique(np.stack([token_ids, rows], axis=1), axis=0) if len(token_ids) else np.empty((0, 2), dtype=np.int64)
+        self.row_ptr = np.searchsorted(pairs[:, 0], np.arange(len(vocab) + 1))
+        self.row_pos = pairs[:, 1]
+
+        self.vocab = list(vocab)
+        self.jamo = [to_jamo(t) for t in self.vocab]
+        self.cho = [to_choseong(t) for t in self.vocab]
+        self.rows = len(df)
+
+        postings = {}
+        for tid, jamo in enumerate(self.jamo):
+            for g in _trigrams(jamo):
+                postings.setdefault(g, []).append(tid)
+        self.postings = {g: np.asarray(ids, dtype=np.int64) for g, ids in postings.items()}
+
+    # --------------------------------------------------------------------------
+    # 토큰 찾기
+    # --------------------------------------------------------------------------
+
+    def match_tokens(self, word):
+        """
+        검색어 1개와 맞는 토큰
+        Returns: [(토큰 번호, 점수 0~1)] 점수 내림차순
+        """
+        word = word.lower()
+        if _CHOSEONG_ONLY.match(word):
+            # 초성 검색: 미리 분해해 둔 초성 문자열에서 부분 일치 (앞부분 일치 우선)
+            hits = [(tid, 1.0 if cho.startswith(word) else 0.9) for tid, cho in enumerate(self.cho) if word in cho]
+            return sorted(hits, key=lambda h: (-h[1], len(self.cho[h[0]])))
+
+        query = to_jamo(word)
+        limit = max_edits(len(query))
+        grams = _trigrams(query)
+        # q-gram 조건: 편집 1회는 트라이그램을 최대 3개 바꿈 → 공유 수가 이보다 적으면 검증 불필요
+        need = len(grams) - 3 * limit
+        if need > 0:
+            lists = [self.postings[g] for g in grams if g in self.postings]
+            if not lists: return []
+            shared = np.bincount(np.concatenate(lists), minlength=len(self.vocab))
+            candidates = np.flatnonzero(shared >= need)
+            if len(candidates) > MAX_VERIFY:
+                candidates = candidates[np.argsort(-shared[candidates], kind='stable')[:MAX_VERIFY]]
+        else:
+            # 트라이그램으로 거를 수 없는 짧은 검색어: 오타 없이 부분 일치만
+            limit = 0
+            candidates = [tid for tid, jamo in enumerate(self.jamo) if query in jamo]
+
+        hits = []
+        for tid in candidates:
+            tid = int(tid)
+            dist = 0 if query in self.jamo[tid] else substring_distance(query, self.jamo[tid], limit)
+            if dist <= limit:
+                # 오타 수와 토큰 길이 차이만큼 감점 (정확히 같은 토큰이 1점)
+                extra = len(self.jamo[tid]) - len(query)
+                hits.append((tid, max(0.0, 1.0 - dist / max(len(query), 1) - 0.02 * max(extra, 0))))
+        return sorted(hits, key=lambda h: -h[1])
+
+    def rows_of(self, tid):
+        return self.row_pos[self.row_ptr[tid]:self.row_ptr[tid + 1]]
+
+    # --------------------------------------------------------------------------
+    # 행 검색
+    # --------------------------------------------------------------------------
+
+    def search(self, query, top_k=TOP_K):
+        """
+        모든 검색어(공백 구분)가 맞는 행을 점수 순으로 (검색어별 가장 잘 맞는 토큰 점수 합)
+        Returns: (행 위치 배열, 점수 배열)
+        """
+        words = re.findall(TOKEN_PATTERN, str(query or "").lower())
+        if not words: return np.empty(0, dtype=int), np.empty(0)
+        total = np.zeros(self.rows)
+        matched = np.ones(self.rows, dtype=bool)
+        for word in words:
+            best = np.zeros(self.rows)
+            for tid, score in self.match_tokens(word):
+                pos = self.rows_of(tid)
+                best[pos] = np.maximum(best[pos], score)
+            matched &= best > 0
+            total += best
+        hits = np.flatnonzero(matched)
+        order = np.argsort(-total[hits], kind='stable')[:top_k]
+        return hits[order], total[hits[order]]
+
+    def suggest(self, query, limit=5):
+        """검색어별로 가장 가까운 실제 토큰 (검색창 아래 '비슷한 검색어' 표시용)"""
+        out = []
+        for word in re.findall(TOKEN_PATTERN, str(query or "").lower()):
+            for tid, _ in self.match_tokens(word)[:limit]:
+                if self.vocab[tid] != word and self.vocab[tid] not in out:
+                    out.append(self.vocab[tid])
+        return out[:limit]
+
+# ==============================================================================
+# [SECTION 4: PER-FRAME CACHE]
+# ==============================================================================
+
+# 데이터프레임별 인덱스 (address_index와 같은 방식, 프레임이 사라지면 함께 정리)
+_index_cache = {}
+
+def get_index(df):
+    """df의 검색 인덱스 (행 수가 바뀌었거나 invalidate 되었으면 다시 생성)"""
+    cached = _index_cache.get(id(df))
+    if cached and cached[0]() is df and cached[1] == len(df):
+        return cached[2]
+    index = FuzzyIndex(df)
+    _index_cache[id(df)] = (weakref.ref(df, lambda _, k=id(df): _index_cache.pop(k, None)), len(df), index)
+    return index
+
+def invalidate(df):
+    """df의 색인 대상 컬럼 값이 바뀌었을 때 호출 (다음 검색 시 재생성)"""
+    _index_cache.pop(id(df), None)
+
+def search(df, query, top_k=TOP_K):
+    """df에서 오타 허용 검색 → (행 위치 배열, 점수 배열) 점수 내림차순"""
+    return get_index(df).search(query, top_k)
+
+def suggest(df, query, limit=5):
+    """df에서 검색어와 비슷한 실제 단어 목록"""
+    return get_index(df).suggest(query, limit)
@@ -0,0 +1,211 @@
+# geo_index.py
+# 범공인 Pro v24 Enterprise - Vectorized Geo Index Module (v25.00 Offline Nearest)
+# Feature: NumPy Haversine Matrix, Grid Spatial Index, Bundled Station/POI Table, API-Free Fallback
+
+import os
+import functools
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+EARTH_RADIUS_M = 6371000.0
+
+# 번들 테이블 - 역: (역명, 위도, 경도) 서울 주요역 좌표 시드
+#               POI: (장소명, 분류, 위도, 경도) 분류는 카카오 업종코드 또는 브랜드 키워드
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+STATION_TABLE_PATH = os.path.join(DATA_DIR, "subway_stations.csv")
+POI_TABLE_PATH = os.path.join(DATA_DIR, "poi_places.csv")
+
+# 격자 크기 (도 단위, 0.01도 ≒ 위도 1.1km / 서울 경도 0.88km)
+GRID_CELL_DEG = 0.01
+GRID_MAX_RING = 30
+
+# 도보 분속 (infra_engine과 동일 기준)
+WALK_M_PER_MIN = 67
+
+# ==============================================================================
+# [SECTION 2: VECTORIZED HAVERSINE]
+# ==============================================================================
+
+def haversine_vector(lat1, lng1, lat2, lng2):
+    """
+    동일 길이 배열 간 원소별 직선 거리(m)를 계산합니다. (스칼라 브로드캐스팅 허용)
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def haversine_matrix(lat1, lng1, lat2, lng2):
+    """
+    N개 지점 × M개 지점의 거리 행렬(N, M)을 한 번에 계산합니다.
+    """
+    lat1 = np.asarray(lat1, dtype=float)[:, None]
+    lng1 = np.asarray(lng1, dtype=float)[:, None]
+    lat2 = np.asarray(lat2, dtype=float)[None, :]
+    lng2 = np.asarray(lng2, dtype=float)[None, :]
+    return haversine_vector(lat1, lng1, lat2, lng2)
+
+# ==============================================================================
+# [SECTION 3: GRID SPATIAL INDEX]
+# ==============================================================================
+
+class GridIndex:
+    """
+    위경도 격자 기반 최근접 탐색 인덱스 (정적 테이블 전용, 스레드 안전 읽기)
+    """
+    def __init__(self, names, lats, lngs, cell_deg=GRID_CELL_DEG):
+        self.names = np.asarray(names, dtype=object)
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        self.cell_deg = cell_deg
+        # 격자 한 칸의 최소 변 길이(m) - 링 탐색 종료 조건 계산용
+        mid_lat = float(np.nanmean(self.lats)) if len(self.lats) else 37.5
+        self.cell_m = cell_deg * 111320.0 * min(1.0, np.cos(np.radians(mid_lat)))
+
+        self.cells = {}
+        keys = self._cell_keys(self.lats, self.lngs)
+        for i, key in enumerate(zip(keys[0].tolist(), keys[1].tolist())):
+            self.cells.setdefault(key, []).append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cell_keys(self, lats, lngs):
+        return (np.floor(np.asarray(lats, dtype=float) / self.cell_deg).astype(int),
+                np.floor(np.asarray(lngs, dtype=float) / self.cell_deg).astype(int))
+
+    def _ring_candidates(self, cy, cx, ring):
+        found = []
+        for dy in range(-ring, ring + 1):
+            for dx in range(-ring, ring + 1):
+                found.extend(self.cells.get((cy + dy, cx + dx), ()))
+        return found
+
+    def nearest(self, lats, lngs, max_dist=None):
+        """
+        각 질의 지점의 최근접 항목 (인덱스 배열, 거리 배열)을 반환합니다.
+        같은 격자 칸의 질의는 한 번의 거리 행렬로 묶어 계산하며, 없으면 인덱스 -1 / 거리 NaN
+        """
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+        best_idx = np.full(len(lats), -1, dtype=int)
+        best_dist = np.full(len(lats), np.nan)
+        if not len(self) or not len(lats): return best_idx, best_dist
+
+        valid = ~(np.isnan(lats) | np.isnan(lngs))
+        cy, cx = self._cell_keys(np.where(valid, lats, 0), np.where(valid, lngs, 0))
+        groups = pd.DataFrame({"cy": cy, "cx": cx})[valid].groupby(["cy", "cx"]).indices
+
+        for (gy, gx), rows in groups.items():
+            rows = np.flatnonzero(valid)[rows]
+            for ring in range(1, GRID_MAX_RING + 1):
+                cands = self._ring_candidates(gy, gx, ring)
+                if not cands: continue
+                d = haversine_matrix(lats[rows], lngs[rows], self.lats[cands], self.lngs[cands])
+                arg = d.argmin(axis=1)
+                dmin = d[np.arange(len(rows)), arg]
+                # 링 반경 안쪽에서 찾은 최근접만 확정 (바깥 링에 더 가까운 후보가 있을 수 없음)
+                if (dmin <= ring * self.cell_m).all() or ring == GRID_MAX_RING:
+                    best_idx[rows] = np.asarray(cands)[arg]
+                    best_dist[rows] = dmin
+                    break
+
+        if max_dist is not None:
+            too_far = best_dist > max_dist
+            best_idx[too_far] = -1
+            best_dist[too_far] = np.nan
+        return best_idx, best_dist
+
+    def within(self, lat, lng, radius):
+        """단일 지점 반경 radius(m) 이내 항목 (인덱스, 거리)를 거리순으로 반환합니다."""
+        ring = max(1, int(np.ceil(radius / self.cell_m)))
+        cy, cx = self._cell_keys([lat], [lng])
+        cands = np.asarray(self._ring_candidates(int(cy[0]), int(cx[0]), ring), dtype=int)
+        if not len(cands): return cands, np.array([])
+        d = haversine_vector(lat, lng, self.lats[cands], self.lngs[cands])
+        keep = d <= radius
+        order = np.argsort(d[keep])
+        return cands[keep][order], d[keep][order]
+
+# ==============================================================================
+# [SECTION 4: BUNDLED TABLES]
+# ==============================================================================
+
+def _load_table(path, name_col):
+    if not os.path.exists(path): return None
+    df = pd.read_csv(path)
+    df = df.dropna(subset=['위도', '경도']).reset_index(drop=True)
+    return GridIndex(df[name_col].astype(str), df['위도'], df['경도'])
+
+@functools.lru_cache(maxsize=1)
+def get_station_index():
+    """번들 지하철역 테이블 인덱스 (프로세스당 1회 로드)"""
+    return _load_table(STATION_TABLE_PATH, '역명')
+
+@functools.lru_cache(maxsize=1)
+def get_poi_index():
+    """번들 POI 테이블 인덱스 - 분류별 인덱스 딕셔너리 (파일이 없으면 빈 딕셔너리)"""
+    if not os.path.exists(POI_TABLE_PATH): return {}
+    df = pd.read_csv(POI_TABLE_PATH).dropna(subset=['위도', '경도'])
+    return {
+        str(cat): GridIndex(g['장소명'].astype(str), g['위도'], g['경도'])
+        for cat, g in df.groupby('분류')
+    }
+
+def pois_within(lat, lng, radius, category):
+    """번들 POI 중 분류가 일치하고 반경 이내인 장소 [(장소명, 거리m, 위도, 경도)]를 거리순 반환"""
+    index = get_poi_index().get(str(category))
+    if index is None: return []
+    try:
+        idx, dist = index.within(float(lat), float(lng), float(radius))
+    except (TypeError, ValueError):
+        return []
+    return [(index.names[i], int(round(d)), index.lats[i], index.lngs[i]) for i, d in zip(idx, dist)]
+
+def save_poi_table(records):
+    """
+    장소 레코드 [{장소명, 분류, 위도, 경도}]를 기존 POI 테이블에 병합 저장합니다.
+    """
+    df_new = pd.DataFrame(records, columns=['장소명', '분류', '위도', '경도'])
+    if os.path.exists(POI_TABLE_PATH):
+        df_new = pd.concat([pd.read_csv(POI_TABLE_PATH), df_new], ignore_index=True)
+    df_new = df_new.drop_duplicates(subset=['장소명', '분류'], keep='last')
+    os.makedirs(DATA_DIR, exist_ok=True)
+    df_new.to_csv(POI_TABLE_PATH, index=False)
+    get_poi_index.cache_clear()
+    return len(df_new)
+
+def nearest_stations(lats, lngs, max_dist=None):
+    """
+    여러 매물 좌표의 최근접 역을 API 호출 없이 일괄 계산합니다.
+    Returns: DataFrame[인근역, 역거리, 역도보] (질의 순서 유지)
+    """
+    index = get_station_index()
+    n = len(lats)
+    if index is None:
+        return pd.DataFrame({"인근역": [""] * n, "역거리": [np.nan] * n, "역도보": [np.nan] * n})
+
+    lats = pd.to_numeric(pd.Series(lats), errors='coerce').to_numpy()
+    lngs = pd.to_numeric(pd.Series(lngs), errors='coerce').to_numpy()
+    idx, dist = index.nearest(lats, lngs, max_dist=max_dist)
+    found = idx >= 0
+    return pd.DataFrame({
+        "인근역": np.where(found, index.names[np.maximum(idx, 0)], ""),
+        "역거리": np.where(found, np.round(dist), np.nan),
+        "역도보": np.where(found, np.round(dist / WALK_M_PER_MIN, 1), np.nan),
+    })
+
+def nearest_station(lat, lng, max_dist=None):
+    """단일 좌표 최근접 역 (역명, 거리m, 역좌표) - 없으면 None"""
+    index = get_station_index()
+    if index is None: return None
+    try:
+        idx, dist = index.nearest([float(lat)], [float(lng)], max_dist=max_dist)
+    except (TypeError, ValueError):
+        return None
+    if idx[0] < 0: return None
+    i = idx[0]
+    return index.names[i], int(round(dist[0])), (index.lats[i], index.lngs[i])
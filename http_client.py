@@ -0,0 +1,162 @@
+# http_client.py
+# 범공인 Pro v24 Enterprise - Shared HTTP Client Module (v25.00 Pooled)
+# Feature: Connection Pool, Per-Host Timeout, Jittered Retry, Circuit Breaker, Endpoint Metrics
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+import threading
+import random
+import time
+import metrics
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 커넥션 풀 크기 (호스트 수 / 호스트당 최대 연결 수)
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+
+# 호스트별 타임아웃 (connect, read) - 느린 업스트림이 워커를 붙잡지 않도록 상한 고정
+DEFAULT_TIMEOUT = (2.0, 5.0)
+HOST_TIMEOUTS = {
+    "dapi.kakao.com": (1.0, 2.0),
+    "apis-navi.kakaomobility.com": (1.0, 2.0),
+    "maps.apigw.ntruss.com": (1.5, 4.0),
+}
+
+# 재시도 정책 (지수 백오프 + Full Jitter)
+# 429(쿼터 초과)는 재시도해도 쿼터만 소모하므로 제외
+MAX_RETRIES = 2
+BACKOFF_BASE_SEC = 0.2
+BACKOFF_CAP_SEC = 2.0
+RETRY_STATUS = {500, 502, 503, 504}
+
+# 서킷 브레이커 (연속 실패 N회 시 일정 시간 차단)
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SEC = 30.0
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """서킷이 열린 호스트로의 호출을 즉시 거부할 때 발생합니다."""
+
+
+# ==============================================================================
+# [SECTION 2: SESSION & CIRCUIT BREAKER]
+# ==============================================================================
+
+_session = None
+_session_lock = threading.Lock()
+
+_breakers = {}
+_breaker_lock = threading.Lock()
+
+def get_session():
+    """
+    프로세스 전역 공유 세션을 반환합니다. (Keep-Alive 커넥션 재사용)
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+def _breaker_state(host):
+    with _breaker_lock:
+        return _breakers.setdefault(host, {"failures": 0, "opened_at": None, "probe_at": None})
+
+def _breaker_allow(host):
+    """
+    서킷 상태 확인 (Open → 쿨다운 경과 시 Half-Open으로 시험 호출 1건만 허용)
+    시험 호출 결과가 기록될 때까지 다른 호출은 거부합니다.
+    (시험 호출이 결과 없이 사라진 경우 대비, 쿨다운이 한 번 더 지나면 새 시험 호출 허용)
+    """
+    state = _breaker_state(host)
+    with _breaker_lock:
+        if state["opened_at"] is None:
+            return True
+        now = time.monotonic()
+        if state["probe_at"] is not None and now - state["probe_at"] < BREAKER_COOLDOWN_SEC:
+            return False
+        if now - state["opened_at"] >= BREAKER_COOLDOWN_SEC:
+            state["probe_at"] = now
+            return True
+        return False
+
+def _breaker_record(host, ok):
+    state = _breaker_state(host)
+    with _breaker_lock:
+        if ok:
+            state["failures"] = 0
+            state["opened_at"] = None
+        elif state["probe_at"] is not None:
+            # Half-Open 시험 호출 실패 → 즉시 재차단 (쿨다운 다시 시작)
+            state["opened_at"] = time.monotonic()
+        else:
+            state["failures"] += 1
+            if state["failures"] >= BREAKER_FAILURE_THRESHOLD:
+                state["opened_at"] = time.monotonic()
+        state["probe_at"] = None
+
+def get_breaker_status():
+    """호스트별 서킷 상태 요약을 반환합니다."""
+    with _breaker_lock:
+        return {
+            host: ("CLOSED" if s["opened_at"] is None else "HALF_OPEN" if s["probe_at"] is not None else "OPEN", s["failures"])
+            for host, s in _breakers.items()
+        }
+
+# ==============================================================================
+# [SECTION 3: REQUEST API]
+# ==============================================================================
+
+def _backoff_delay(attempt):
+    """Full Jitter 백오프: 0 ~ min(cap, base * 2^attempt) 사이 무작위 대기"""
+    return random.uniform(0, min(BACKOFF_CAP_SEC, BACKOFF_BASE_SEC * (2 ** attempt)))
+
+def get(url, endpoint=None, timeout=None, retries=MAX_RETRIES, **kwargs):
+    """
+    공유 세션으로 GET 요청을 수행합니다. (requests.get 대체)
+    - 응답 코드와 무관하게 Response를 반환하며, 네트워크 오류는 재시도 후 예외로 전달합니다.
+    - 서킷이 열린 호스트는 CircuitOpenError로 즉시 실패합니다.
+    - 시도마다 metrics 레지스트리에 호출 수/지연시간/오류 분류를 기록합니다.
+    """
+    host = urlparse(url).netloc
+    endpoint = endpoint or f"{host}{urlparse(url).path}"
+    timeout = timeout or HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT)
+
+    if not _breaker_allow(host):
+        metrics.record_call(endpoint, 0.0, error="CircuitOpen")
+        raise CircuitOpenError(f"Circuit open for {host}")
+
+    session = get_session()
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            metrics.record_call(endpoint, time.perf_counter() - started, error=type(e).__name__)
+            _breaker_record(host, ok=False)
+            if attempt < retries and _breaker_allow(host):
+                time.sleep(_backoff_delay(attempt))
+                attempt += 1
+                continue
+            raise
+
+        metrics.record_call(endpoint, time.perf_counter() - started, status=response.status_code)
+        if response.status_code in RETRY_STATUS:
+            _breaker_record(host, ok=False)
+            if attempt < retries and _breaker_allow(host):
+                time.sleep(_backoff_delay(attempt))
+                attempt += 1
+                continue
+        else:
+            _breaker_record(host, ok=True)
+        return response
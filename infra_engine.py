@@ -1,7 +1,12 @@
-import requests
+import http_client
+import api_guard
+import geo_index
+import tracing
 import pandas as pd
 import re
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # ==========================================
 # 1. API 환경 설정
@@ -18,20 +23,98 @@ NAVER_VPC_HEADERS = {
 
 KAKAO_REST_KEY = "72e1d9f46c8c70448510d2f6215ad512"
 KAKAO_HEADERS = {"Authorization": f"KakaoAK {KAKAO_REST_KEY}"}
-TIMEOUT_SEC = 2.0  # 경로 탐색을 위해 타임아웃 소폭 증가
+# 타임아웃/재시도/서킷 브레이커는 http_client의 호스트별 설정을 따름
 
 # ==========================================
 # 2. 유틸리티 함수
 # ==========================================
-def _call_kakao_local(endpoint, params):
+# 장소 검색 결과 캐시 유지 시간 (초) - 주변 시설은 자주 바뀌지 않음
+LOCAL_CACHE_TTL_SEC = 24 * 3600
+
+# 쿼터 소진 시 직선거리 기반 대체 검색용 장소 레지스트리 ((검색 종류, 코드/키워드) -> {id: 장소})
+KNOWN_PLACES_PER_KEY = 500
+_known_places = {}
+_known_lock = threading.Lock()
+
+def _place_key(endpoint, params):
+    return (endpoint, params.get('category_group_code') or params.get('query', ''))
+
+def _remember_places(endpoint, params, documents):
+    """API 응답으로 받은 장소 좌표를 레지스트리에 누적 (대체 검색 재료)"""
+    with _known_lock:
+        bucket = _known_places.setdefault(_place_key(endpoint, params), {})
+        for doc in documents:
+            if doc.get('id') and doc.get('x') and doc.get('y'):
+                bucket[doc['id']] = {k: doc.get(k) for k in ('id', 'place_name', 'x', 'y')}
+        while len(bucket) > KNOWN_PLACES_PER_KEY:
+            bucket.pop(next(iter(bucket)))
+
+def _degraded_local_search(endpoint, params):
+    """
+    [Fallback] 쿼터 소진 시 레지스트리에 쌓인 장소를 직선 거리로 재정렬하여 반환
+    """
+    with _known_lock:
+        places = list(_known_places.get(_place_key(endpoint, params), {}).values())
+    radius = float(params.get('radius', 20000))
+    found = []
+    for place in places:
+        d = calculate_haversine(params.get('y'), params.get('x'), place['y'], place['x'])
+        if d <= radius:
+            found.append(dict(place, distance=str(d)))
+
+    # 번들 POI/역 테이블 보강 (레지스트리에 없는 장소)
+    seen_names = {p['place_name'] for p in found}
+    category = _place_key(endpoint, params)[1]
+    for name, d, lat, lng in geo_index.pois_within(params.get('y'), params.get('x'), radius, category):
+        if name not in seen_names:
+            found.append({"id": f"poi:{name}", "place_name": name, "x": str(lng), "y": str(lat), "distance": str(d)})
+            seen_names.add(name)
+    if category == "SW8":
+        station = geo_index.nearest_station(params.get('y'), params.get('x'), max_dist=radius)
+        if station and station[0] not in seen_names:
+            name, d, (lat, lng) = station
+            found.append({"id": f"station:{name}", "place_name": name, "x": str(lng), "y": str(lat), "distance": str(d)})
+
+    found.sort(key=lambda p: int(p['distance']))
+    return found[:int(params.get('size', 15))]
+
+def export_known_places():
+    """레지스트리에 누적된 장소를 번들 POI 테이블로 저장합니다. (오프라인 대체 검색 재료)"""
+    with _known_lock:
+        records = [
+            {"장소명": p['place_name'], "분류": key[1], "위도": float(p['y']), "경도": float(p['x'])}
+            for key, bucket in _known_places.items() for p in bucket.values()
+        ]
+    return geo_index.save_poi_table(records)
+
+def _fetch_kakao_local(endpoint, params):
     url = f"https://dapi.kakao.com/v2/local/search/{endpoint}.json"
+    response = http_client.get(url, endpoint=f"kakao.local.{endpoint}", headers=KAKAO_HEADERS, params=params)
+    if response.status_code == 429:
+        raise api_guard.QuotaExceeded("Kakao local quota exceeded")
+    if response.status_code == 200:
+        documents = response.json().get('documents', [])
+        _remember_places(endpoint, params, documents)
+        return documents
+    return None  # 일시 오류는 캐시하지 않음
+
+def _call_kakao_local(endpoint, params):
+    key = ("local", endpoint) + tuple(sorted((k, str(v)) for k, v in params.items()))
     try:
-        response = requests.get(url, headers=KAKAO_HEADERS, params=params, timeout=TIMEOUT_SEC)
-        if response.status_code == 200:
-            return response.json().get('documents', [])
-        return []
+        with tracing.span(f"kakao.local.{endpoint}"):
+            docs = api_guard.guarded_call(
+                "kakao", key, lambda: _fetch_kakao_local(endpoint, params),
+                ttl=LOCAL_CACHE_TTL_SEC,
+                cache_if=lambda docs: docs is not None,
+                fallback=lambda: _degraded_local_search(endpoint, params)
+            )
     except Exception:
+        docs = None  # 네트워크 오류 / 5xx 재시도 소진 / 서킷 열림
+    if docs is None:
+        # 오류로 인한 빈 결과는 '주변에 없음'이 아니므로 대체값으로 표시 (배치는 저장하지 않고 재시도)
+        api_guard.mark_degraded()
         return []
+    return docs
 
 def _extract_exit_number(place_name):
     if not place_name or not isinstance(place_name, str): return ""
@@ -53,6 +136,7 @@ def calculate_haversine(lat1, lon1, lat2, lon2):
         return int(R * c)
     except Exception: return 0
 
+@tracing.span("kakao.mobility.directions")
 def _get_pedestrian_route(origin_lng, origin_lat, dest_lng, dest_lat):
     """
     실제 보행자 경로(도보) 분석 함수
@@ -67,7 +151,9 @@ def _get_pedestrian_route(origin_lng, origin_lat, dest_lng, dest_lat):
     }
     
     try:
-        response = requests.get(url, headers=KAKAO_HEADERS, params=params, timeout=TIMEOUT_SEC)
+        if not api_guard.get_bucket("kakao").try_acquire():
+            raise api_guard.QuotaExceeded("Kakao mobility quota exceeded")
+        response = http_client.get(url, endpoint="kakao.mobility.directions", headers=KAKAO_HEADERS, params=params)
         if response.status_code == 200:
             routes = response.json().get('routes', [])
             if routes:
@@ -85,83 +171,125 @@ def _get_pedestrian_route(origin_lng, origin_lat, dest_lng, dest_lat):
 # 3. 핵심 분석 함수 (v24.31.0 로직 단순화 적용)
 # ==========================================
 
-def get_commercial_analysis(lat, lng):
-    """
-    [v24.31.0] 로직 단순화 버전
-    1. 지하철역 분석 (카카오 API 단순 거리)
-    2. 주변 시설 및 앵커 브랜드 스캔
-    """
-    result = {
+# 주변 필수 시설 업종 코드 / 앵커 브랜드 목록 (상세 분석 및 배치 공용)
+FACILITY_CATEGORIES = {"편의점": "CS2", "은행": "BK9", "카페": "CE7", "병원": "HP8", "약국": "PM9", "음식점": "FD6"}
+ANCHOR_BRANDS = ["스타벅스", "맥도날드", "올리브영", "다이소", "버거킹", "써브웨이", "메가커피", "파리바게뜨", "컴포즈커피", "배스킨라빈스"]
+
+# 스트리밍 분석 동시 호출 수 (시설 6건 + 앵커 10건을 병렬 처리)
+ANALYSIS_WORKERS = 8
+
+def _empty_commercial_result():
+    return {
         "subway": {
             "station": "정보 없음", "exit": "", "dist": 0, "walk": 0,
             "coords": {"origin": (0, 0), "target": (0, 0)}
         },
         "facilities": pd.DataFrame(columns=['장소명', '업종', '거리(m)', '도보(분)']),
-        "anchors": pd.DataFrame(columns=["브랜드", "지점명", "거리(m)", "도보(분)"])
+        "anchors": pd.DataFrame(columns=["브랜드", "지점명", "거리(m)", "도보(분)"]),
+        "degraded": False
     }
 
+@tracing.span("infra.subway")
+def _analyze_subway(lat, lng):
+    """[Step 1] 최근접 지하철역 (카카오 단순 거리, 미응답 시 번들 역 테이블)"""
+    sub_params = {"category_group_code": "SW8", "x": lng, "y": lat, "radius": 1500, "sort": "distance"}
+    subways = _call_kakao_local("category", sub_params)
+    if not subways:
+        # [Offline Fallback] 카카오 미응답 시 번들 역 테이블 기준 직선 거리
+        subways = _degraded_local_search("category", sub_params)
+    if not subways:
+        return _empty_commercial_result()["subway"]
+
+    target_node = subways[0]
+    # 역 이름 정제 (괄호 제거)
+    raw_name = target_node.get('place_name', '')
+    name = re.sub(r'\(.*\)', '', raw_name).strip().split()[0]
+    
+    # 카카오가 주는 거리값 그대로 사용
+    dist = int(target_node.get('distance', 0))
+    
+    return {
+        "station": name, 
+        "exit": "", # 불필요한 정보 삭제
+        "dist": dist, 
+        "walk": round(dist / 67, 1), # 단순 도보 시간 계산
+        "coords": {"origin": (lat, lng), "target": (target_node['y'], target_node['x'])}
+    }
+
+def _build_facilities(results):
+    """[Step 2] 주변 10대 필수 시설 리스트 - results: {업종명: 검색결과}"""
+    all_places = []
+    for cat_name, items in results.items():
+        for item in items:
+            d = int(item.get('distance', 0))
+            all_places.append({
+                "장소명": item.get('place_name'),
+                "업종": cat_name,
+                "거리(m)": d,
+                "도보(분)": round(d / 67, 1)
+            })
+    if not all_places:
+        return _empty_commercial_result()["facilities"]
+    df_fac = pd.DataFrame(all_places)
+    return df_fac.sort_values(by="거리(m)").head(10).reset_index(drop=True)
+
+def _build_anchors(results):
+    """[Step 3] Top 10 앵커 브랜드 스캔 - results: {브랜드: 검색결과} (브랜드 순서 유지)"""
+    anchors_list = []
+    for anchor in ANCHOR_BRANDS:
+        data = results.get(anchor)
+        if data:
+            n = data[0]
+            d = int(n.get('distance', 0))
+            anchors_list.append({"브랜드": anchor, "지점명": n.get('place_name'), "거리(m)": d, "도보(분)": round(d/67, 1)})
+        else:
+            anchors_list.append({"브랜드": anchor, "지점명": "없음", "거리(m)": "-", "도보(분)": "-"})
+    return pd.DataFrame(anchors_list)
+
+def iter_commercial_analysis(lat, lng):
+    """
+    상권 분석을 단계별로 스트리밍합니다. (지하철 → 편의 시설 → 앵커 브랜드 순으로 yield)
+    모든 호출을 동시에 시작하고, 지하철 결과가 도착하는 즉시 먼저 반환합니다.
+    Yields: (part, value) - part는 "subway" / "facilities" / "anchors" / "degraded"
+    """
+    if not lat or not lng:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS)
     try:
-        if not lat or not lng: return result
-
-        # [v24.31.0] 지하철 분석 로직 단순화: 뺑뺑이 길찾기 삭제
-        sub_params = {"category_group_code": "SW8", "x": lng, "y": lat, "radius": 1500, "sort": "distance"}
-        subways = _call_kakao_local("category", sub_params)
-
-        if subways:
-            target_node = subways[0]
-            # 역 이름 정제 (괄호 제거)
-            raw_name = target_node.get('place_name', '')
-            name = re.sub(r'\(.*\)', '', raw_name).strip().split()[0]
-            
-            # 카카오가 주는 거리값 그대로 사용
-            dist = int(target_node.get('distance', 0))
-            
-            result["subway"] = {
-                "station": name, 
-                "exit": "", # 불필요한 정보 삭제
-                "dist": dist, 
-                "walk": round(dist / 67, 1), # 단순 도보 시간 계산
-                "coords": {"origin": (lat, lng), "target": (target_node['y'], target_node['x'])}
-            }
-
-        # [Step 2] 주변 10대 필수 시설 리스트 (기존 유지)
-        target_cats = {"편의점": "CS2", "은행": "BK9", "카페": "CE7", "병원": "HP8", "약국": "PM9", "음식점": "FD6"}
-        all_places = []
-        for cat_name, code in target_cats.items():
-            p = {"category_group_code": code, "x": lng, "y": lat, "radius": 300, "sort": "distance", "size": 5}
-            items = _call_kakao_local("category", p)
-            for item in items:
-                d = int(item.get('distance', 0))
-                all_places.append({
-                    "장소명": item.get('place_name'),
-                    "업종": cat_name,
-                    "거리(m)": d,
-                    "도보(분)": round(d / 67, 1)
-                })
-        
-        if all_places:
-            df_fac = pd.DataFrame(all_places)
-            df_fac = df_fac.sort_values(by="거리(m)").head(10).reset_index(drop=True)
-            result["facilities"] = df_fac
-
-        # [Step 3] Top 10 앵커 브랜드 스캔 (기존 유지)
-        target_anchors = ["스타벅스", "맥도날드", "올리브영", "다이소", "버거킹", "써브웨이", "메가커피", "파리바게뜨", "컴포즈커피", "배스킨라빈스"]
-        anchors_list = []
-        for anchor in target_anchors:
-            p = {"query": anchor, "x": lng, "y": lat, "radius": 1000, "sort": "distance"}
-            data = _call_kakao_local("keyword", p)
-            if data:
-                n = data[0]
-                d = int(n.get('distance', 0))
-                anchors_list.append({"브랜드": anchor, "지점명": n.get('place_name'), "거리(m)": d, "도보(분)": round(d/67, 1)})
-            else:
-                anchors_list.append({"브랜드": anchor, "지점명": "없음", "거리(m)": "-", "도보(분)": "-"})
-        result["anchors"] = pd.DataFrame(anchors_list)
+        # 워커 스레드의 구간도 호출한 실행(rerun)의 트레이스에 기록
+        call_local = tracing.bind(_call_kakao_local)
+        f_subway = pool.submit(tracing.bind(_analyze_subway), lat, lng)
+        f_fac = {
+            cat_name: pool.submit(call_local, "category",
+                                  {"category_group_code": code, "x": lng, "y": lat, "radius": 300, "sort": "distance", "size": 5})
+            for cat_name, code in FACILITY_CATEGORIES.items()
+        }
+        f_anchor = {
+            anchor: pool.submit(call_local, "keyword",
+                                {"query": anchor, "x": lng, "y": lat, "radius": 1000, "sort": "distance"})
+            for anchor in ANCHOR_BRANDS
+        }
 
+        yield "subway", f_subway.result()
+        yield "facilities", _build_facilities({k: f.result() for k, f in f_fac.items()})
+        yield "anchors", _build_anchors({k: f.result() for k, f in f_anchor.items()})
+        yield "degraded", api_guard.is_exhausted("kakao")
     except Exception as e:
         print(f"[Commercial Analysis Error] {e}")
-        return result
+    finally:
+        # 소비자가 중간에 멈춰도 남은 호출은 백그라운드에서 마무리 (결과는 캐시에 적재)
+        pool.shutdown(wait=False)
 
+def get_commercial_analysis(lat, lng):
+    """
+    [v24.31.0] 로직 단순화 버전 (스트리밍 결과를 한 번에 모아 반환)
+    1. 지하철역 분석 (카카오 API 단순 거리)
+    2. 주변 시설 및 앵커 브랜드 스캔
+    """
+    result = _empty_commercial_result()
+    for part, value in iter_commercial_analysis(lat, lng):
+        result[part] = value
     return result
 
 def get_demand_analysis(lat, lng):
@@ -198,3 +326,33 @@ def get_demand_analysis(lat, lng):
             return pd.DataFrame(demand).sort_values(by="거리(m)").head(15).reset_index(drop=True)
         return default_df
     except Exception: return default_df
+
+def get_location_features(lat, lng):
+    """
+    [배치용] 목록 필터/정렬에 쓰일 입지 요약값을 계산합니다.
+    Returns: {인근역, 역거리, 역도보, 앵커수, 시설밀도}
+    """
+    features = {"인근역": "", "역거리": None, "역도보": None, "앵커수": 0, "시설밀도": 0}
+    if not lat or not lng: return features
+
+    # 1. 최근접 지하철역
+    sub_params = {"category_group_code": "SW8", "x": lng, "y": lat, "radius": 1500, "sort": "distance"}
+    subways = _call_kakao_local("category", sub_params) or _degraded_local_search("category", sub_params)
+    if subways:
+        node = subways[0]
+        dist = int(node.get('distance', 0) or 0)
+        features["인근역"] = re.sub(r'\(.*\)', '', node.get('place_name', '')).strip().split()[0]
+        features["역거리"] = dist
+        features["역도보"] = round(dist / 67, 1)
+
+    # 2. 앵커 브랜드 수 (1km 이내 입점 브랜드 개수)
+    for anchor in ANCHOR_BRANDS:
+        if _call_kakao_local("keyword", {"query": anchor, "x": lng, "y": lat, "radius": 1000, "sort": "distance", "size": 1}):
+            features["앵커수"] += 1
+
+    # 3. 시설 밀도 (300m 이내 필수 시설 개수, 업종별 최대 15개)
+    for code in FACILITY_CATEGORIES.values():
+        items = _call_kakao_local("category", {"category_group_code": code, "x": lng, "y": lat, "radius": 300, "size": 15})
+        features["시설밀도"] += len(items)
+
+    return features
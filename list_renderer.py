@@ -6,104 +6,264 @@ import streamlit as st
 import pandas as pd
 import math
 import time
+import threading
+from collections import OrderedDict
 import core_engine as engine
+import sort_engine
+import sql_engine
+import address_index
+import fuzzy_search
+import tracing
+import metrics
 import map_service as map_api
 import detail_renderer 
 
 # 한 페이지에 표시할 매물 수
 ITEMS_PER_PAGE = 30
 
-def show_main_list():
+# 카드 마크다운 캐시 (IronID + 행 내용 해시 → 마크다운, 프로세스 공용 LRU)
+CARD_CACHE_MAX = 3000
+CARD_SOURCE_COLS = ['지역_구', '지역_동', '번지', '구분', '현업종', '매매가', '수익률', '보증금', '월차임',
+                    '관리비', '권리금', '층', '면적', '인근역', '역거리', '역도보']
+_card_cache = OrderedDict()
+_card_cache_lock = threading.Lock()
+
+# 리스트 모드 컬럼 프로필 (브라우저로 전송할 컬럼 목록, None = 전체)
+COLUMN_PROFILES = {
+    "compact": ['구분', '지역_동', '번지', '층', '면적', '보증금', '월차임', '매매가', '수익률'],
+    "pricing": ['구분', '지역_구', '지역_동', '번지', '층', '호실', '면적', '보증금', '월차임', '관리비', '권리금',
+                '매매가', '수익률', '대지면적', '연면적', '인근역', '역거리'],
+    "admin": ['구분', '지역_구', '지역_동', '번지', '호실', '연락처', '접수경로', '접수일',
+              '광고_포스', '광고_모두', '광고_블로그', '사용승인일', '건축물용도'],
+    "full": None,
+}
+PROFILE_LABELS = {"compact": "간단히", "pricing": "금액", "admin": "관리", "full": "전체"}
+EDITOR_ROW_PX = 35
+
+# 역세권 필터 옵션 (라벨 -> 역까지 최대 거리 m)
+STATION_RADIUS_OPTIONS = {"전체": None, "300m 이내": 300, "500m 이내": 500, "1km 이내": 1000}
+
+# 필터 결과 캐시 키에 포함되는 세션 필터 키
+FILTER_KEYS = ['selected_cat', 'selected_gu', 'selected_dong', 'exact_bunji', 'search_keyword', 'fuzzy_search',
+               'min_price', 'max_price', 'min_yield', 'max_yield', 'min_land', 'max_land',
+               'min_dep', 'max_dep', 'min_rent', 'max_rent', 'is_no_kwon', 'min_kwon', 'max_kwon',
+               'min_area', 'max_area', 'min_fl', 'max_fl', 'station_radius']
+
+# 스크롤 모드 (블록 단위 추가 로드, 화면에는 최근 블록만 유지)
+SCROLL_VIEW_LABEL = '📜 스크롤 모드'
+SCROLL_BLOCK_SIZE = 30
+SCROLL_MAX_BLOCKS = 5
+SCROLL_MORE_LABEL = "▼ 더 보기"
+
+def current_filter_state():
+    """세션의 필터 값을 모아 딕셔너리로 반환합니다."""
+    return {k: st.session_state.get(k) for k in FILTER_KEYS}
+
+def get_sql_mirror(is_sale):
     """
-    메인 리스트 및 상세 페이지 렌더링 컨트롤러 (Full Logic)
+    SQL 엔진 사용 시 현재 데이터의 미러를 반환합니다. (미사용/동기화 중이면 None → pandas 필터)
+    데이터 지문은 데이터 버전별로 세션에 캐시합니다.
     """
-    # [A] 상세 보기 모드 진입 확인 (최우선 처리)
-    if st.session_state.selected_item is not None:
-        detail_renderer.render_detail_view(st.session_state.selected_item)
-        return
-
-    # [B] 데이터 필터링 로직 (Null-Safe 방어 로직 적용)
+    if not sql_engine.is_enabled(): return None
+    # 오타 허용 검색은 검색 인덱스가 있는 pandas 경로로 처리
+    if st.session_state.get('fuzzy_search') and st.session_state.get('search_keyword'): return None
     df = st.session_state.df_main
-    df_f = df.copy()
+    key = _data_key(df, is_sale)
+    cached = st.session_state.get('sql_fingerprint')
+    if cached is None or cached[0] != key:
+        with tracing.span("sql.fingerprint"):
+            cached = (key, sql_engine.fingerprint(df))
+        st.session_state.sql_fingerprint = cached
+    return sql_engine.get_mirror(st.session_state.current_sheet, df, is_sale, fp=cached[1])
+
+def _sql_filter(flt):
+    """SQL 미러용 필터 (역세권 라벨 → 반경 m)"""
+    return dict(flt, _station_radius_m=STATION_RADIUS_OPTIONS.get(flt.get('station_radius')))
+
+def filter_listings(df, flt, is_sale):
+    """
+    필터 값(flt)에 맞는 매물만 남깁니다. (Null-Safe 방어 로직 적용, 세션 비의존)
+    """
+    # 0. 번지 검색: 주소 인덱스로 해당 행만 먼저 추림 ('123-4' = '123-04', '123-*', '120~130', '산 12')
+    bunji_hits = address_index.lookup(df, flt['exact_bunji']) if flt.get('exact_bunji') else None
+    df_f = df.iloc[bunji_hits].copy() if bunji_hits is not None else df.copy()
 
     # 1. 항목/지역 필터
-    if st.session_state.selected_cat:
-        df_f = df_f[df_f['구분'].isin(st.session_state.selected_cat)]
-    if st.session_state.selected_gu:
-        df_f = df_f[df_f['지역_구'].isin(st.session_state.selected_gu)]
-    if st.session_state.selected_dong:
-        df_f = df_f[df_f['지역_동'].isin(st.session_state.selected_dong)]
+    if flt.get('selected_cat'):
+        df_f = df_f[df_f['구분'].isin(flt.get('selected_cat'))]
+    if flt.get('selected_gu'):
+        df_f = df_f[df_f['지역_구'].isin(flt.get('selected_gu'))]
+    if flt.get('selected_dong'):
+        df_f = df_f[df_f['지역_동'].isin(flt.get('selected_dong'))]
     
-    # 2. 검색 필터 (번지 정확 일치 & 키워드 포함)
-    if st.session_state.exact_bunji:
-        df_f = df_f[df_f['번지'].astype(str).str.strip() == st.session_state.exact_bunji.strip()]
-    if st.session_state.search_keyword:
-        kw = st.session_state.search_keyword
+    # 2. 검색 필터 (번지 정확 일치 - 해석 불가 검색어만 & 키워드 포함)
+    if flt.get('exact_bunji') and bunji_hits is None:
+        df_f = df_f[df_f['번지'].astype(str).str.strip() == flt.get('exact_bunji').strip()]
+    if flt.get('search_keyword') and flt.get('fuzzy_search'):
+        # 오타/초성 허용 검색: 주소·텍스트 컬럼 트라이그램 인덱스 (필터 용도이므로 상위 N건으로 자르지 않음)
+        hits, _ = fuzzy_search.search(df, flt.get('search_keyword'), top_k=len(df))
+        df_f = df_f[df_f.index.isin(df.index[hits])]
+    elif flt.get('search_keyword'):
+        kw = flt.get('search_keyword')
         mask = df_f.astype(str).apply(lambda x: x.str.contains(kw, case=False)).any(axis=1)
         df_f = df_f[mask]
 
     # 3. 금액/면적/층수 정밀 필터 (Null-Safe Check)
-    is_sale = "매매" in st.session_state.current_sheet
     if is_sale:
         # 매매가
-        if st.session_state.min_price is not None:
-            df_f = df_f[df_f['매매가'] >= st.session_state.min_price]
-        if st.session_state.max_price is not None:
-            df_f = df_f[df_f['매매가'] <= st.session_state.max_price]
+        if flt.get('min_price') is not None:
+            df_f = df_f[df_f['매매가'] >= flt.get('min_price')]
+        if flt.get('max_price') is not None:
+            df_f = df_f[df_f['매매가'] <= flt.get('max_price')]
             
         # 수익률 (매매 모드 전용 키 사용)
-        if st.session_state.get('min_yield') is not None:
-            df_f = df_f[df_f['수익률'] >= st.session_state.min_yield]
-        if st.session_state.get('max_yield') is not None:
-            df_f = df_f[df_f['수익률'] <= st.session_state.max_yield]
+        if flt.get('min_yield') is not None:
+            df_f = df_f[df_f['수익률'] >= flt.get('min_yield')]
+        if flt.get('max_yield') is not None:
+            df_f = df_f[df_f['수익률'] <= flt.get('max_yield')]
             
         # 대지면적 (매매 모드 전용 키 사용 - min_land)
-        if st.session_state.min_land is not None:
-            df_f = df_f[df_f['대지면적'] >= st.session_state.min_land]
-        if st.session_state.max_land is not None:
-            df_f = df_f[df_f['대지면적'] <= st.session_state.max_land]
+        if flt.get('min_land') is not None:
+            df_f = df_f[df_f['대지면적'] >= flt.get('min_land')]
+        if flt.get('max_land') is not None:
+            df_f = df_f[df_f['대지면적'] <= flt.get('max_land')]
 
     else:
         # 보증금
-        if st.session_state.min_dep is not None:
-            df_f = df_f[df_f['보증금'] >= st.session_state.min_dep]
-        if st.session_state.max_dep is not None:
-            df_f = df_f[df_f['보증금'] <= st.session_state.max_dep]
+        if flt.get('min_dep') is not None:
+            df_f = df_f[df_f['보증금'] >= flt.get('min_dep')]
+        if flt.get('max_dep') is not None:
+            df_f = df_f[df_f['보증금'] <= flt.get('max_dep')]
         
         # 월차임
-        if st.session_state.min_rent is not None:
-            df_f = df_f[df_f['월차임'] >= st.session_state.min_rent]
-        if st.session_state.max_rent is not None:
-            df_f = df_f[df_f['월차임'] <= st.session_state.max_rent]
+        if flt.get('min_rent') is not None:
+            df_f = df_f[df_f['월차임'] >= flt.get('min_rent')]
+        if flt.get('max_rent') is not None:
+            df_f = df_f[df_f['월차임'] <= flt.get('max_rent')]
         
         # 권리금 필터
-        if st.session_state.is_no_kwon:
+        if flt.get('is_no_kwon'):
             df_f = df_f[df_f['권리금'] == 0]
         else:
-            if st.session_state.min_kwon is not None:
-                df_f = df_f[df_f['권리금'] >= st.session_state.min_kwon]
-            if st.session_state.max_kwon is not None:
-                df_f = df_f[df_f['권리금'] <= st.session_state.max_kwon]
+            if flt.get('min_kwon') is not None:
+                df_f = df_f[df_f['권리금'] >= flt.get('min_kwon')]
+            if flt.get('max_kwon') is not None:
+                df_f = df_f[df_f['권리금'] <= flt.get('max_kwon')]
 
     # 공통 필터 (실면적)
-    if st.session_state.min_area is not None:
-        df_f = df_f[df_f['면적'] >= st.session_state.min_area]
-    if st.session_state.max_area is not None:
-        df_f = df_f[df_f['면적'] <= st.session_state.max_area]
+    if flt.get('min_area') is not None:
+        df_f = df_f[df_f['면적'] >= flt.get('min_area')]
+    if flt.get('max_area') is not None:
+        df_f = df_f[df_f['면적'] <= flt.get('max_area')]
     
     # 층수 필터 (음수 보존)
     if '층' in df_f.columns:
         df_f['floor_val'] = df_f['층'].astype(str).str.extract(r'(-?\d+)')[0].fillna(1).astype(float)
         
-        if st.session_state.min_fl is not None:
-            df_f = df_f[df_f['floor_val'] >= st.session_state.min_fl]
-        if st.session_state.max_fl is not None:
-            df_f = df_f[df_f['floor_val'] <= st.session_state.max_fl]
+        if flt.get('min_fl') is not None:
+            df_f = df_f[df_f['floor_val'] >= flt.get('min_fl')]
+        if flt.get('max_fl') is not None:
+            df_f = df_f[df_f['floor_val'] <= flt.get('max_fl')]
             
         df_f = df_f.drop(columns=['floor_val'])
 
+    # 역세권 필터 (배치로 사전 계산된 역거리 기준, 미계산 매물은 제외)
+    radius = STATION_RADIUS_OPTIONS.get(flt.get('station_radius'))
+    if radius and '역거리' in df_f.columns:
+        dist = pd.to_numeric(df_f['역거리'], errors='coerce')
+        df_f = df_f[dist.notna() & (dist <= radius)]
+
+    return df_f
+
+def current_sort_state():
+    """세션의 정렬 설정 (정렬 기준, 내림차순 여부)"""
+    return sort_engine.SORT_OPTIONS.get(st.session_state.get('sort_field')), bool(st.session_state.get('sort_desc'))
+
+def _data_key(df, is_sale):
+    return (id(df), len(df), st.session_state.get('data_version', 0), is_sale)
+
+def get_sort_permutation(df, is_sale):
+    """
+    전체 데이터의 정렬 순열을 데이터 버전별로 캐시합니다. (기준/방향별 1회 계산)
+    """
+    field, desc = current_sort_state()
+    cache = st.session_state.get('sort_cache')
+    if cache is None or cache['data_key'] != _data_key(df, is_sale):
+        cache = {'data_key': _data_key(df, is_sale), 'perms': {}}
+        st.session_state.sort_cache = cache
+    if (field, desc) not in cache['perms']:
+        with tracing.span("list.sort"):
+            cache['perms'][(field, desc)] = sort_engine.sort_permutation(df, field, is_sale, desc)
+    return cache['perms'][(field, desc)]
+
+def get_listing_order(is_sale):
+    """
+    필터 + 정렬 결과를 df_main 행 위치 배열로 반환합니다.
+    - 필터 결과는 (데이터 버전 + 필터 상태) 키로 세션에 캐시 (페이지/블록 이동 시 재필터 없음)
+    - 정렬은 캐시된 전체 순열에서 필터 결과만 골라내므로 기준을 바꿔도 재정렬/재필터 없음
+    """
+    df = st.session_state.df_main
+    flt = current_filter_state()
+    key = _data_key(df, is_sale) + (repr(sorted(flt.items())),)
+    mirror = get_sql_mirror(is_sale)
+    cached = st.session_state.get('filter_cache')
+    if cached is None or cached['key'] != key:
+        cached = {'key': key, 'positions': None, 'orders': {}, 'cursor_index': {}}
+        st.session_state.filter_cache = cached
+
+    sort_key = current_sort_state()
+    if sort_key not in cached['orders']:
+        if mirror is not None:
+            # SQL 미러: 필터 + 정렬을 한 번의 쿼리로
+            with tracing.span("sql.order"):
+                cached['orders'][sort_key] = mirror.order(_sql_filter(flt), *sort_key)
+        else:
+            if cached['positions'] is None:
+                with tracing.span("list.filter"):
+                    df_f = filter_listings(df, flt, is_sale)
+                cached['positions'] = df.index.get_indexer(df_f.index)
+            cached['orders'][sort_key] = sort_engine.order_subset(get_sort_permutation(df, is_sale), cached['positions'], len(df))
+    return cached['orders'][sort_key]
+
+def get_cursor_index(order):
+    """정렬 결과의 IronID → 순번 사전 (get_listing_order 결과와 같은 캐시에 보관)"""
+    cached = st.session_state.filter_cache
+    sort_key = current_sort_state()
+    if sort_key not in cached['cursor_index']:
+        cached['cursor_index'][sort_key] = sort_engine.cursor_index(st.session_state.df_main, order)
+    return cached['cursor_index'][sort_key]
+
+def _move_page(cursor):
+    """페이지 이동 (커서가 가리키는 행부터 표시, 커서 없으면 첫 페이지)"""
+    st.session_state.page_cursor = cursor
+    st.session_state.page_num = cursor["pos"] // ITEMS_PER_PAGE + 1 if cursor else 1
+
+def show_main_list():
+    """
+    메인 리스트 및 상세 페이지 렌더링 컨트롤러 (Full Logic)
+    """
+    # [A] 상세 보기 모드 진입 확인 (최우선 처리)
+    if st.session_state.selected_item is not None:
+        detail_renderer.render_detail_view(st.session_state.selected_item)
+        return
+
+    # [B] 데이터 필터링 (필터 상태가 직전과 같으면 캐시된 결과 재사용)
+    is_sale = "매매" in st.session_state.current_sheet
+    df = st.session_state.df_main
+    scroll_mode = st.session_state.view_mode == SCROLL_VIEW_LABEL
+    field, desc = current_sort_state()
+
+    # SQL 미러가 준비되어 있으면 페이지 모드는 건수 + 현재 페이지 행만 조회
+    mirror = None if scroll_mode else get_sql_mirror(is_sale)
+    if mirror is not None:
+        sql_flt = _sql_filter(current_filter_state())
+        with tracing.span("sql.count"):
+            total_count = mirror.count(sql_flt)
+    else:
+        order = get_listing_order(is_sale)
+        total_count = len(order)
+
     # [C] 결과 집계 및 페이지 계산
-    total_count = len(df_f)
     if total_count == 0:
         # 신규 등록 버튼만 표시하고 종료 (빈 결과 UX 개선)
         c_sel1, c_sel2, c_new, c_pg = st.columns([1, 1, 1.5, 2])
@@ -114,14 +274,58 @@ def show_main_list():
         st.warning("🔍 검색 결과가 없습니다.")
         return
 
+    # 스크롤 모드: 페이지 이동 없이 블록을 이어 붙임 (상단 바는 선택/등록만 표시)
+    if scroll_mode:
+        c_sel1, c_sel2, c_new, c_cnt = st.columns([1, 1, 1.5, 2])
+        if c_sel1.button("✅ 전체 선택", use_container_width=True):
+            st.session_state.df_main.loc[df.index[order], '선택'] = True
+            st.session_state.editor_key_version += 1
+            st.rerun()
+        if c_sel2.button("⬜ 전체 해제", use_container_width=True):
+            st.session_state.df_main['선택'] = False
+            st.session_state.editor_key_version += 1
+            st.rerun()
+        if c_new.button("➕ 신규 매물 등록", use_container_width=True):
+            st.session_state.selected_item = None
+            st.session_state.is_adding_new = True
+            st.rerun()
+        c_cnt.markdown(f"<div style='text-align:center; padding-top:5px; font-weight:bold;'>검색 결과 {total_count}건</div>", unsafe_allow_html=True)
+        render_scroll_view(order, is_sale)
+        return
+
     total_pages = math.ceil(total_count / ITEMS_PER_PAGE)
-    if st.session_state.page_num > total_pages: st.session_state.page_num = 1
-    
-    start_idx = (st.session_state.page_num - 1) * ITEMS_PER_PAGE
+
+    # 정렬 결과 구간 조회 / 커서 위치 찾기 (SQL: LIMIT·OFFSET 및 키셋 COUNT 쿼리, pandas: 캐시된 순서 배열)
+    if mirror is not None:
+        take = lambda start, count: mirror.page(sql_flt, field, desc, start, count)
+        locate = lambda c: mirror.locate(sql_flt, field, desc, c, total_count)
+    else:
+        take = lambda start, count: order[start:start + count]
+        locate = lambda c: sort_engine.locate_cursor(df, order, c, field, is_sale, desc, get_cursor_index(order))
+
+    def cursor_at(pos):
+        rows = take(pos, 1)
+        return sort_engine.row_cursor(df, rows[0], pos, field, is_sale) if len(rows) else None
+
+    # 페이지 시작 위치: 커서(첫 행 IronID/정렬 값)로 찾아 행 추가·수정 후에도 보던 위치 유지
+    cursor = st.session_state.get('page_cursor')
+    if cursor:
+        with tracing.span("list.locate_cursor"):
+            start_idx = locate(cursor)
+    else:
+        start_idx = min(st.session_state.page_num - 1, total_pages - 1) * ITEMS_PER_PAGE
     end_idx = start_idx + ITEMS_PER_PAGE
+    st.session_state.page_num = start_idx // ITEMS_PER_PAGE + 1
+    # 이전 이동은 페이지 경계에 맞춰 정렬 (첫 페이지는 커서 없이 None)
+    prev_idx = max(0, start_idx - ITEMS_PER_PAGE) // ITEMS_PER_PAGE * ITEMS_PER_PAGE
+    nav = {
+        "has_prev": start_idx > 0,
+        "prev": cursor_at(prev_idx) if prev_idx > 0 else None,
+        "next": cursor_at(end_idx),
+    }
     
-    # 현재 페이지 데이터
-    df_page = df_f.iloc[start_idx:end_idx]
+    # 현재 페이지 데이터 (페이지 행만 추출)
+    df_page = df.iloc[take(start_idx, ITEMS_PER_PAGE)]
 
     # [D] 상단 컨트롤 바
     c_sel1, c_sel2, c_new, c_pg = st.columns([1, 1, 1.5, 2])
@@ -147,99 +351,234 @@ def show_main_list():
     # 페이지네이션 UI
     with c_pg:
         c_p1, c_p2, c_p3 = st.columns([1, 2, 1])
-        if c_p1.button("◀", key="prev_pg") and st.session_state.page_num > 1:
-            st.session_state.page_num -= 1
+        if c_p1.button("◀", key="prev_pg") and start_idx > 0:
+            _move_page(nav["prev"])
             st.rerun()
         c_p2.markdown(f"<div style='text-align:center; padding-top:5px; font-weight:bold;'>PAGE {st.session_state.page_num} / {total_pages} ({total_count}건)</div>", unsafe_allow_html=True)
-        if c_p3.button("▶", key="next_pg") and st.session_state.page_num < total_pages:
-            st.session_state.page_num += 1
+        if c_p3.button("▶", key="next_pg") and nav["next"] is not None:
+            _move_page(nav["next"])
             st.rerun()
 
+    # [E]~[G] 카드/리스트 + 하단 페이지네이션 + 액션바 (Fragment: 체크박스 조작 시 이 영역만 재실행)
+    render_page_body(df_page, is_sale, nav)
+
+@st.fragment
+@tracing.trace_scope("list.page_body")
+def render_page_body(df_page, is_sale, nav):
+    """
+    현재 페이지 본문 영역 (사이드바/필터링은 재실행하지 않음)
+    """
     # [E] 뷰 모드에 따른 렌더링
     if st.session_state.view_mode == '🗂️ 카드 모드':
         render_card_view(df_page, is_sale)
     else:
         render_list_view_editor(df_page)
 
-    # [F] 하단 페이지네이션
+    # [F] 하단 페이지네이션 (페이지 이동은 상단 바 갱신을 위해 전체 재실행)
     st.write("")
     c_b1, c_b2, c_b3 = st.columns([1, 2, 1])
-    if c_b1.button("◀ 이전 페이지", key="prev_pg_btm", use_container_width=True) and st.session_state.page_num > 1:
-        st.session_state.page_num -= 1
+    if c_b1.button("◀ 이전 페이지", key="prev_pg_btm", use_container_width=True) and nav["has_prev"]:
+        _move_page(nav["prev"])
         st.rerun()
-    if c_b3.button("다음 페이지 ▶", key="next_pg_btm", use_container_width=True) and st.session_state.page_num < total_pages:
-        st.session_state.page_num += 1
+    if c_b3.button("다음 페이지 ▶", key="next_pg_btm", use_container_width=True) and nav["next"] is not None:
+        _move_page(nav["next"])
         st.rerun()
 
     # [G] 하단 액션바
     render_action_bar()
 
+def _scroll_sentinel(loaded):
+    """
+    목록 끝 감지용 보이지 않는 iframe - 화면 하단에 가까워지면 '더 보기' 버튼을 대신 눌러줍니다.
+    (loaded 값을 넣어 블록이 추가될 때마다 새로 마운트되도록 함)
+    """
+    sentinel_html = f"""
+    <script>
+    // block {loaded}
+    const doc = window.parent.document;
+    const observer = new window.parent.IntersectionObserver((entries) => {{
+        if (!entries.some(e => e.isIntersecting)) return;
+        observer.disconnect();
+        const btn = Array.from(doc.querySelectorAll('button')).find(b => b.innerText.includes('{SCROLL_MORE_LABEL}'));
+        if (btn) btn.click();
+    }}, {{ rootMargin: '800px' }});
+    observer.observe(window.frameElement);
+    </script>
+    """
+    st.components.v1.html(sentinel_html, height=1)
+
+def _set_scroll_blocks(n):
+    # 버튼 콜백 - 클릭 시 Fragment만 재실행되므로 별도 rerun 불필요
+    st.session_state.scroll_blocks = n
+
+@st.fragment
+@tracing.trace_scope("list.scroll_view")
+def render_scroll_view(order, is_sale):
+    """
+    스크롤 모드 카드 목록 (블록 추가 시 이 영역만 재실행, 필터 결과는 캐시 재사용)
+    - 최근 SCROLL_MAX_BLOCKS개 블록만 그려 카드 수가 무한히 늘지 않도록 유지
+    - 현재 블록을 그린 뒤 다음 블록의 카드 본문을 미리 만들어 캐시에 적재
+    """
+    df = st.session_state.df_main
+    total_count = len(order)
+    total_blocks = math.ceil(total_count / SCROLL_BLOCK_SIZE)
+    loaded = min(max(1, st.session_state.get('scroll_blocks', 1)), total_blocks)
+    first = max(0, loaded - SCROLL_MAX_BLOCKS)
+
+    # 앞쪽으로 접힌 블록 복귀 (창을 한 블록 뒤로 이동)
+    if first > 0:
+        st.button(f"▲ 이전 항목 보기 ({first * SCROLL_BLOCK_SIZE}건 접힘)", key="scroll_back", use_container_width=True,
+                  on_click=_set_scroll_blocks, args=(loaded - 1,))
+
+    start_idx, end_idx = first * SCROLL_BLOCK_SIZE, loaded * SCROLL_BLOCK_SIZE
+    render_card_view(df.iloc[order[start_idx:end_idx]], is_sale)
+
+    if loaded < total_blocks:
+        remain = total_count - end_idx
+        st.button(f"{SCROLL_MORE_LABEL} ({min(end_idx, total_count)} / {total_count}건, 남은 {remain}건)",
+                  key="scroll_more", use_container_width=True, on_click=_set_scroll_blocks, args=(loaded + 1,))
+        _scroll_sentinel(loaded)
+
+        # 다음 블록 카드 본문 선계산 (화면 요소는 이미 전송된 뒤라 체감 지연 없음)
+        get_card_texts(df.iloc[order[end_idx:end_idx + SCROLL_BLOCK_SIZE]], is_sale)
+    else:
+        st.caption(f"모든 매물을 불러왔습니다. ({total_count}건)")
+
+    render_action_bar()
+
+def _col(df, name, default=""):
+    """컬럼이 없거나 빈 칸(NaN)이면 기본값으로 채운 Series 반환 (NaN이 섞이면 이어 붙인 카드 문자열 전체가 NaN)"""
+    return df[name].fillna(default) if name in df.columns else pd.Series(default, index=df.index)
+
+def _money(df, name):
+    """금액 컬럼을 천 단위 콤마 문자열로 일괄 변환"""
+    vals = pd.to_numeric(_col(df, name, 0), errors='coerce').fillna(0).astype('int64')
+    return vals.map('{:,}'.format)
+
+def build_card_texts(df, is_sale):
+    """
+    카드 본문 마크다운을 페이지 컬럼 단위로 한 번에 생성합니다. (행 단위 Series 박싱 없음)
+    """
+    if df.empty: return pd.Series([], dtype=object)
+
+    biz_info = ("(" + _col(df, '현업종', '-').astype(str) + ")") if '현업종' in df.columns else ""
+    info = ("**" + _col(df, '지역_구').astype(str) + " " + _col(df, '지역_동').astype(str) + " " + _col(df, '번지').astype(str) + "** "
+            + "[" + _col(df, '구분').astype(str) + "] " + biz_info + "\n")
+
+    if is_sale:
+        # 매매: 매매가 / 수익률 표시
+        info = info + "💰 매매 " + _money(df, '매매가') + " / 수익률 " + _col(df, '수익률', 0).astype(str) + "%"
+    else:
+        # 임대: 보 / 월 / 관 / 권 (관리비 추가)
+        info = (info + "💰 보 " + _money(df, '보증금') + " / 월 " + _money(df, '월차임')
+                + " / 관 " + _money(df, '관리비') + " / 권 " + _money(df, '권리금'))
+
+    info = info + "\n📐 " + _col(df, '층').astype(str) + "층 / " + _col(df, '면적').astype(str) + "평"
+
+    # 역세권 정보 (사전 계산된 경우에만)
+    if '인근역' in df.columns and '역거리' in df.columns:
+        dist = pd.to_numeric(df['역거리'], errors='coerce')
+        has_station = df['인근역'].notna() & (df['인근역'].astype(str) != "") & dist.notna()
+        station_line = ("\n🚇 " + df['인근역'].astype(str) + " " + dist.fillna(0).astype('int64').map('{:,}'.format)
+                        + "m (도보 " + _col(df, '역도보').astype(str) + "분)")
+        info = info + station_line.where(has_station, "")
+
+    return info
+
+def _card_cache_keys(df, is_sale):
+    """IronID + 카드 표시 컬럼 내용 해시 (내용이 바뀐 카드만 다시 생성)"""
+    cols = [c for c in CARD_SOURCE_COLS if c in df.columns]
+    row_hash = pd.util.hash_pandas_object(df[cols].astype(str), index=False)
+    mode = "S" if is_sale else "R"
+    return df['IronID'].astype(str) + ":" + row_hash.astype(str) + ":" + mode
+
+@tracing.span("list.card_texts")
+def get_card_texts(df_page, is_sale):
+    """
+    캐시 우선으로 카드 마크다운 목록을 반환합니다. (누락분만 일괄 생성 후 캐시 적재)
+    """
+    keys = _card_cache_keys(df_page, is_sale).tolist()
+    texts = []
+    with _card_cache_lock:
+        for k in keys:
+            text = _card_cache.get(k)
+            if text is not None: _card_cache.move_to_end(k)
+            texts.append(text)
+    missing = [i for i, t in enumerate(texts) if t is None]
+    metrics.record_cache("list.card_text", "hit", len(keys) - len(missing))
+    metrics.record_cache("list.card_text", "miss", len(missing))
+    if missing:
+        built = build_card_texts(df_page.iloc[missing], is_sale).tolist()
+        with _card_cache_lock:
+            for i, text in zip(missing, built):
+                texts[i] = text
+                _card_cache[keys[i]] = text
+            while len(_card_cache) > CARD_CACHE_MAX:
+                _card_cache.popitem(last=False)
+    return texts
+
+@tracing.span("list.render_cards")
 def render_card_view(df_page, is_sale):
     """
     카드 형태의 리스트 출력 (현업종/관리비 추가, 체크박스 동기화)
     """
     version = st.session_state.editor_key_version
+    df_main = st.session_state.df_main
+    selected_ids = set(df_main.loc[df_main['선택'] == True, 'IronID'].astype(str))
+    texts = get_card_texts(df_page, is_sale)
     
-    for idx, row in df_page.iterrows():
+    for idx, iid, info in zip(df_page.index, df_page['IronID'], texts):
         with st.container(border=True):
             c1, c2, c3 = st.columns([0.5, 8, 1.5])
             
-            iid = row['IronID']
-            is_checked = st.session_state.df_main.loc[st.session_state.df_main['IronID'] == iid, '선택'].values[0]
-            
-            new_chk = c1.checkbox("", value=bool(is_checked), key=f"chk_card_{iid}_{version}")
+            is_checked = str(iid) in selected_ids
+            new_chk = c1.checkbox("", value=is_checked, key=f"chk_card_{iid}_{version}")
             
+            # 선택 상태만 갱신 (같은 Fragment 안의 액션바가 바로 아래에서 새 상태로 그려짐)
             if new_chk != is_checked:
-                st.session_state.df_main.loc[st.session_state.df_main['IronID'] == iid, '선택'] = new_chk
-                st.rerun()
-            
-            # 주소 중심 제목 + 현업종 추가
-            cur_biz = row.get('매물특징', '')[:10] if pd.notna(row.get('매물특징')) else '-'
-            # 실제로는 '현업종' 컬럼이 있으면 그걸 쓰고, 없으면 매물특징 앞부분을 쓰거나 '-' 처리
-            # 여기서는 core_engine에서 '현업종'을 별도로 가져오지 않고 '매물특징'에 통합했거나
-            # new_item_renderer에서는 '현업종'을 입력받음.
-            # 데이터 로드 시 '현업종'이 별도 컬럼으로 존재한다면 그것을 사용.
-            # core_engine.py 설정을 보면 '매물특징'으로 통합된 키워드 중에 '현업종'은 없음.
-            # 따라서 '현업종' 컬럼이 존재한다면 사용.
+                df_main.loc[df_main['IronID'] == iid, '선택'] = new_chk
             
-            biz_info = f"({row.get('현업종', '-')})" if '현업종' in row else ""
-            
-            addr_info = f"**{row.get('지역_구')} {row.get('지역_동')} {row.get('번지')}**"
-            type_info = f"[{row.get('구분')}] {biz_info}"
-            info = f"{addr_info} {type_info}\n"
-            
-            if is_sale:
-                # 매매: 매매가 / 수익률 표시
-                info += f"💰 매매 {int(row.get('매매가',0)):,} / 수익률 {row.get('수익률', 0)}%"
-            else:
-                # 임대: 보 / 월 / 관 / 권 (관리비 추가)
-                info += f"💰 보 {int(row.get('보증금',0)):,} / 월 {int(row.get('월차임',0)):,} / 관 {int(row.get('관리비',0)):,} / 권 {int(row.get('권리금',0)):,}"
-                
-            info += f"\n📐 {row.get('층')}층 / {row.get('면적')}평"
+            # 주소 중심 제목 + 현업종 ('현업종' 컬럼이 존재할 때만) + 금액/면적/역세권
             c2.markdown(info)
             
             if c3.button("상세보기", key=f"btn_detail_{iid}_{version}", use_container_width=True):
-                st.session_state.selected_item = row
+                st.session_state.selected_item = df_page.loc[idx]
                 st.rerun()
 
-def render_list_view_editor(df_page):
+def project_columns(df_page, profile):
     """
-    리스트 모드 (st.data_editor 활용 - 그리드 고정 및 상세 이동)
+    보기 프로필에 해당하는 컬럼만 골라 편집기 전송용 프레임을 만듭니다. (없는 컬럼은 무시)
+    IronID는 보내지 않고 행 인덱스로 원본(df_main)과 연결합니다.
     """
-    df_editor = df_page.copy()
+    wanted = COLUMN_PROFILES.get(profile)
+    if wanted is None:
+        cols = [c for c in df_page.columns if c not in ['선택', 'IronID']]
+    else:
+        cols = [c for c in wanted if c in df_page.columns]
+    df_editor = df_page.loc[:, cols]
+    df_editor.insert(0, "선택", st.session_state.df_main.loc[df_page.index, '선택'].astype(bool))
     df_editor.insert(0, "🔍", False)
+    return df_editor
+
+@tracing.span("list.render_editor")
+def render_list_view_editor(df_page):
+    """
+    리스트 모드 (st.data_editor 활용 - 그리드 고정 및 상세 이동, 컬럼 프로필로 전송량 축소)
+    """
+    profile = st.radio("표시 컬럼", list(COLUMN_PROFILES.keys()), key='column_profile',
+                       format_func=lambda p: PROFILE_LABELS.get(p, p), horizontal=True, label_visibility="collapsed")
+    df_editor = project_columns(df_page, profile)
     
-    # [핵심] 너비 및 높이 물리적 고정
+    # [핵심] 너비 물리적 고정
     column_config = {
         "🔍": st.column_config.CheckboxColumn(width="small", label="상세보기"),
         "선택": st.column_config.CheckboxColumn(width="small"),
-        "IronID": None
     }
 
     # 모든 데이터 컬럼 비활성화 (정렬/이동 차단)
     disabled_cols = [col for col in df_editor.columns if col not in ['선택', '🔍']]
 
-    # [핵심] 높이 고정 (height=600) -> 헤더 박제
+    # [핵심] 높이 고정 (최대 600, 행 수에 맞춰 축소) -> 헤더 박제
     edited_df = st.data_editor(
         df_editor,
         column_config=column_config,
@@ -247,28 +586,27 @@ def render_list_view_editor(df_page):
         hide_index=True,
         use_container_width=True,
         num_rows="fixed", # 행 추가/삭제 방지 (무적 설정)
-        height=600,       # 충분한 높이 확보 (헤더 고정)
+        height=min(600, EDITOR_ROW_PX * (len(df_editor) + 1) + 3),
         key=f"editor_main_{st.session_state.editor_key_version}"
     )
 
     # 이벤트 처리 1: 상세 페이지 이동 (돋보기 체크 감지)
     if edited_df['🔍'].any():
-        target_row = edited_df[edited_df['🔍'] == True].iloc[0]
-        original_row = st.session_state.df_main[st.session_state.df_main['IronID'] == target_row['IronID']].iloc[0]
-        st.session_state.selected_item = original_row
+        target_idx = edited_df.index[edited_df['🔍'] == True][0]
+        st.session_state.selected_item = st.session_state.df_main.loc[target_idx]
         st.rerun()
 
     # 이벤트 처리 2: 선택 상태 동기화 (수동 저장 버튼)
     if st.button("💾 리스트 선택 상태 저장 (체크박스 반영)", use_container_width=True):
-        for index, row in edited_df.iterrows():
-            st.session_state.df_main.loc[st.session_state.df_main['IronID'] == row['IronID'], '선택'] = row['선택']
+        st.session_state.df_main.loc[edited_df.index, '선택'] = edited_df['선택'].astype(bool)
         st.success("선택 상태가 저장되었습니다.")
         time.sleep(0.5)
-        st.rerun()
+        st.rerun(scope="fragment")
 
+@st.fragment
 def render_action_bar():
     """
-    하단 일괄 작업 바 (트랜잭션 연결)
+    하단 일괄 작업 바 (트랜잭션 연결, 독립 Fragment)
     """
     selected_rows = st.session_state.df_main[st.session_state.df_main['선택'] == True]
     if selected_rows.empty: return
@@ -0,0 +1,142 @@
+# location_batch.py
+# 범공인 Pro v24 Enterprise - Location Feature Batch Module (v25.00 Offline Precompute)
+# Feature: Headless Batch Job, Resume-Safe Checkpoint, Bounded Concurrency, Columnar Store
+#
+# 저장소(입지 정보 테이블)는 location_features 모듈
+# 사용법: python location_batch.py [--sheet 임대] [--workers 4] [--force] [--offline-stations]
+
+import sys
+import time
+import hashlib
+import argparse
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import core_engine as engine
+import map_service as map_api
+import infra_engine
+import api_guard
+import geo_index
+import metrics
+import location_features
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 동시 실행 워커 수 / 체크포인트 주기 (건)
+DEFAULT_WORKERS = 4
+CHECKPOINT_EVERY = 25
+
+# 대상 시트 (브리핑 시트는 원본 시트와 중복이므로 제외)
+BATCH_SHEETS = ["임대", "매매", "임대(종료)", "매매(종료)"]
+
+# ==============================================================================
+# [SECTION 2: ADDRESS KEY]
+# ==============================================================================
+
+def _address_of(row):
+    return f"{row.get('지역_구', '')} {row.get('지역_동', '')} {row.get('번지', '')}".strip()
+
+def _address_hash(address):
+    return hashlib.md5(address.encode("utf-8")).hexdigest()[:12]
+
+# ==============================================================================
+# [SECTION 3: BATCH ENGINE]
+# ==============================================================================
+
+def _compute_row(sheet_name, iid, address):
+    """
+    단일 매물의 입지 정보 계산 (지오코딩 → 인프라 분석)
+    좌표를 얻지 못했거나 쿼터 소진 · 업스트림 오류로 대체값이 섞이면 None (저장하지 않고 다음 실행에서 재시도)
+    """
+    degraded = api_guard.degraded_count()
+    lat, lng = map_api.get_naver_geocode(address)
+    if not lat or not lng: return None
+    features = infra_engine.get_location_features(lat, lng)
+    if api_guard.degraded_count() != degraded: return None
+    return {
+        "IronID": iid, "시트": sheet_name, "주소해시": _address_hash(address),
+        "위도": float(lat), "경도": float(lng),
+        **features, "계산시각": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def run_batch(sheet_names=None, workers=DEFAULT_WORKERS, force=False):
+    """
+    시트별 전체 매물의 입지 정보를 계산하여 저장합니다.
+    - 이미 계산된 매물(IronID + 주소 동일, 좌표 있음)은 건너뛰므로 중단 후 재실행 시 이어서 진행
+    - 좌표 없음 / 대체값 결과는 저장하지 않으므로 다음 실행에서 다시 계산
+    - 워커 수만큼만 동시에 외부 API를 호출 (api_guard 속도 제한과 함께 동작)
+    """
+    df_store = location_features.load_feature_store()
+    computed = df_store[df_store['위도'].notna()]
+    done = set() if force else set(zip(computed['IronID'].astype(str), computed['주소해시'].astype(str)))
+
+    for sheet_name in (sheet_names or BATCH_SHEETS):
+        df = engine.fetch_sheet_frame(sheet_name)
+        if df is None or df.empty or 'IronID' not in df.columns:
+            print(f"[Batch] {sheet_name}: 대상 없음 (IronID 미생성 시트는 앱에서 1회 로드 필요)")
+            continue
+
+        jobs = []
+        for row in df.to_dict('records'):
+            iid, address = str(row.get('IronID', '')).strip(), _address_of(row)
+            if not iid or iid == 'nan' or not address: continue
+            if (iid, _address_hash(address)) in done: continue
+            jobs.append((iid, address))
+
+        print(f"[Batch] {sheet_name}: {len(jobs)}건 계산 시작 (전체 {len(df)}건, 워커 {workers})")
+        pending, retry = [], 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_compute_row, sheet_name, iid, addr): iid for iid, addr in jobs}
+            for n, future in enumerate(as_completed(futures), 1):
+                try:
+                    result = future.result()
+                    if result is None: retry += 1
+                    else: pending.append(result)
+                except Exception as e:
+                    print(f"[Batch Error] {futures[future]}: {e}")
+                if len(pending) >= CHECKPOINT_EVERY or n == len(futures):
+                    df_store = pd.concat([df_store, pd.DataFrame(pending, columns=location_features.STORE_COLS)], ignore_index=True)
+                    df_store = df_store.drop_duplicates(subset=['IronID'], keep='last')
+                    location_features.save_feature_store(df_store)
+                    pending = []
+                    print(f"[Batch] {sheet_name}: {n}/{len(futures)} 저장")
+        if retry:
+            print(f"[Batch] {sheet_name}: {retry}건 좌표 없음/쿼터 소진/API 오류 - 다음 실행에서 재시도")
+
+    return df_store
+
+def refresh_stations_offline(df_store=None):
+    """
+    저장된 좌표로 최근접 역 정보를 API 호출 없이 일괄 재계산합니다. (번들 역 테이블 기준)
+    카카오 역 정보가 비어 있는 행만 채웁니다.
+    """
+    df_store = location_features.load_feature_store() if df_store is None else df_store
+    if df_store.empty: return df_store
+
+    missing = df_store['인근역'].isna() | (df_store['인근역'].astype(str).str.strip() == "")
+    if missing.any():
+        found = geo_index.nearest_stations(df_store.loc[missing, '위도'], df_store.loc[missing, '경도'], max_dist=1500)
+        found.index = df_store.index[missing]
+        df_store.loc[missing, ['인근역', '역거리', '역도보']] = found[['인근역', '역거리', '역도보']]
+        location_features.save_feature_store(df_store)
+    print(f"[Batch] 오프라인 역 정보 보강: {int(missing.sum())}건")
+    return df_store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="매물 입지 정보 일괄 계산")
+    parser.add_argument("--sheet", action="append", choices=engine.SHEET_NAMES, help="대상 시트 (반복 지정 가능)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--force", action="store_true", help="기존 결과 무시하고 전체 재계산")
+    parser.add_argument("--offline-stations", action="store_true", help="API 호출 없이 저장된 좌표로 역 정보만 보강")
+    args = parser.parse_args()
+    if args.offline_stations:
+        result = refresh_stations_offline()
+    else:
+        result = run_batch(args.sheet, workers=max(1, args.workers), force=args.force)
+    print(f"[Batch] 완료: 총 {len(result)}건 저장 → {location_features.FEATURES_PATH}")
+    # 배치 중 외부 API 호출량/캐시 적중률 기록 (쿼터 사용 추적용)
+    for row in metrics.endpoint_table():
+        print(f"[Batch] {row['endpoint']}: {row['calls']}회, 오류 {row['errors']}회, p95 {row['p95_ms']}ms")
+    print(f"[Batch] {metrics.dump()[1]}")
+    sys.exit(0)
@@ -0,0 +1,54 @@
+# location_features.py
+# 범공인 Pro v24 Enterprise - Location Feature Store Module (v25.00 Offline Precompute)
+# Feature: Columnar Feature Store (Parquet), Atomic Save, IronID Join onto Listing Frames
+#
+# 배치(location_batch)와 화면(core_engine)이 함께 쓰는 저장소 - core_engine을 import하지 않음
+
+import os
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 결과 저장 위치 (Parquet 컬럼 저장소)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+FEATURES_PATH = os.path.join(DATA_DIR, "location_features.parquet")
+
+# 입지 정보 컬럼 (목록 화면에 결합되는 컬럼)
+FEATURE_COLS = ["인근역", "역거리", "역도보", "앵커수", "시설밀도"]
+STORE_COLS = ["IronID", "시트", "주소해시", "위도", "경도"] + FEATURE_COLS + ["계산시각"]
+
+# ==============================================================================
+# [SECTION 2: FEATURE STORE]
+# ==============================================================================
+
+def load_feature_store():
+    """저장된 입지 정보 테이블을 로드합니다. (없으면 빈 테이블)"""
+    if not os.path.exists(FEATURES_PATH):
+        return pd.DataFrame(columns=STORE_COLS)
+    try:
+        return pd.read_parquet(FEATURES_PATH)
+    except Exception as e:
+        print(f"[Feature Store Error] {e}")
+        return pd.DataFrame(columns=STORE_COLS)
+
+def save_feature_store(df_store):
+    """임시 파일에 쓴 뒤 교체하여 중단 시에도 기존 파일이 깨지지 않도록 저장합니다."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = FEATURES_PATH + ".tmp"
+    df_store.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, FEATURES_PATH)
+
+def attach_location_features(df):
+    """
+    목록 데이터프레임에 사전 계산된 입지 정보를 IronID 기준으로 결합합니다.
+    (저장소가 없거나 비어 있으면 원본 그대로 반환)
+    """
+    if df is None or 'IronID' not in df.columns: return df
+    df_store = load_feature_store()
+    if df_store.empty: return df
+
+    df = df.drop(columns=[c for c in FEATURE_COLS if c in df.columns])
+    latest = df_store.drop_duplicates(subset=['IronID'], keep='last').set_index('IronID')[FEATURE_COLS]
+    return df.join(latest, on='IronID')
@@ -2,7 +2,9 @@
 # Feature: Naver Map API Integration (Dynamic Height Support)
 
 import streamlit as st
-import requests
+import http_client
+import api_guard
+import tracing
 
 # .streamlit/secrets.toml 파일에 [naver_map] 섹션이 정의되어 있어야 합니다.
 try:
@@ -13,13 +15,28 @@ except Exception:
     NAVER_CLIENT_ID = ""
     NAVER_CLIENT_SECRET = ""
 
+# 결과 캐시 유지 시간 (초) - 주소 좌표는 사실상 불변, 지도 이미지는 하루 단위 갱신
+GEOCODE_CACHE_TTL_SEC = 30 * 24 * 3600
+MAP_CACHE_TTL_SEC = 24 * 3600
+
+@tracing.span("naver.geocode")
 def get_naver_geocode(address):
     """
     주소를 입력받아 위도(Latitude), 경도(Longitude)를 반환합니다.
+    (동일 주소 동시 요청은 1회 호출로 합치고, 쿼터 소진 시 캐시된 좌표로 대체)
     """
     if not address:
         return None, None
-    
+    try:
+        return api_guard.guarded_call(
+            "naver", ("geocode", address), lambda: _fetch_geocode(address),
+            ttl=GEOCODE_CACHE_TTL_SEC, cache_if=lambda yx: yx[0] is not None
+        )
+    except api_guard.QuotaExceeded:
+        print("Geocoding Error: Naver quota exhausted")
+        return None, None
+
+def _fetch_geocode(address):
     url = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
     
     headers = {
@@ -28,7 +45,9 @@ def get_naver_geocode(address):
     }
     
     try:
-        response = requests.get(url, headers=headers, params={"query": address})
+        response = http_client.get(url, endpoint="naver.geocode", headers=headers, params={"query": address})
+        if response.status_code == 429:
+            raise api_guard.QuotaExceeded("Naver geocode quota exceeded")
         
         if response.status_code == 200:
             data = response.json()
@@ -38,10 +57,13 @@ def get_naver_geocode(address):
                 return y, x
         return None, None
             
+    except api_guard.QuotaExceeded:
+        raise
     except Exception as e:
         print(f"Geocoding Error: {e}")
         return None, None
 
+@tracing.span("naver.static_map")
 def fetch_map_image(lat, lng, zoom_level=16, height=300):
     """
     위도, 경도, 줌 레벨, 높이를 받아 정적 지도 이미지(Binary)를 반환합니다.
@@ -49,7 +71,17 @@ def fetch_map_image(lat, lng, zoom_level=16, height=300):
     """
     if not lat or not lng:
         return None
-    
+    try:
+        return api_guard.guarded_call(
+            "naver", ("static_map", str(lat), str(lng), int(zoom_level), int(height)),
+            lambda: _fetch_map_image(lat, lng, zoom_level, height),
+            ttl=MAP_CACHE_TTL_SEC, cache_if=lambda img: img is not None
+        )
+    except api_guard.QuotaExceeded:
+        print("Map Fetch Error: Naver quota exhausted")
+        return None
+
+def _fetch_map_image(lat, lng, zoom_level, height):
     url = "https://maps.apigw.ntruss.com/map-static/v2/raster"
     
     headers = {
@@ -71,7 +103,9 @@ def fetch_map_image(lat, lng, zoom_level=16, height=300):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, endpoint="naver.static_map", headers=headers, params=params)
+        if response.status_code == 429:
+            raise api_guard.QuotaExceeded("Naver static map quota exceeded")
         
         if response.status_code == 200:
             return response.content
@@ -79,6 +113,8 @@ def fetch_map_image(lat, lng, zoom_level=16, height=300):
             print(f"Naver Static Map API Error: {response.status_code}")
             return None
             
+    except api_guard.QuotaExceeded:
+        raise
     except Exception as e:
         print(f"Map Fetch Error: {e}")
         return None
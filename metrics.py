@@ -0,0 +1,189 @@
+# metrics.py
+# 범공인 Pro v24 Enterprise - Metrics Registry Module (v25.00 API Observability)
+# Feature: Labeled Counters, Latency Histograms, Error Classes, Cache Hit Rates, Per-Session Usage, File Dump
+
+import os
+import json
+import time
+import bisect
+import threading
+from collections import deque
+import tracing
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 지연시간 히스토그램 버킷 상한 (ms, 마지막은 초과분)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# 백분위 계산용 최근 표본 수 (히스토그램과 별도)
+LATENCY_WINDOW = 200
+
+# 세션별 사용량을 보관할 최대 세션 수 (오래된 세션부터 제거)
+MAX_SESSIONS = 200
+
+# 파일 덤프 기본 경로 (스냅샷 1건 = JSON 1줄)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+METRICS_DUMP_PATH = os.path.join(DATA_DIR, "metrics.jsonl")
+
+# ==============================================================================
+# [SECTION 2: REGISTRY]
+# ==============================================================================
+
+_counters = {}
+_histograms = {}
+_sessions = {}
+_lock = threading.Lock()
+
+def _key(name, labels):
+    return (name, tuple(sorted((labels or {}).items())))
+
+def inc(name, labels=None, n=1):
+    """카운터 증가"""
+    with _lock:
+        k = _key(name, labels)
+        _counters[k] = _counters.get(k, 0) + n
+
+def observe(name, seconds, labels=None):
+    """지연시간(초) 1건을 히스토그램에 기록"""
+    ms = seconds * 1000
+    with _lock:
+        h = _histograms.setdefault(_key(name, labels), {
+            "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1), "count": 0, "sum_ms": 0.0, "max_ms": 0.0,
+            "recent": deque(maxlen=LATENCY_WINDOW)
+        })
+        h["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        h["count"] += 1
+        h["sum_ms"] += ms
+        h["max_ms"] = max(h["max_ms"], ms)
+        h["recent"].append(ms)
+
+def _count_session(endpoint):
+    session = tracing.current_session()
+    if not session: return
+    with _lock:
+        usage = _sessions.pop(session, None) or {"first_seen": time.strftime("%Y-%m-%d %H:%M:%S"), "calls": {}}
+        usage["calls"][endpoint] = usage["calls"].get(endpoint, 0) + 1
+        _sessions[session] = usage  # 최근 사용 세션을 뒤로
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.pop(next(iter(_sessions)))
+
+# ==============================================================================
+# [SECTION 3: API / CACHE RECORDERS]
+# ==============================================================================
+
+def record_call(endpoint, elapsed, status=None, error=None):
+    """
+    외부 API 호출 1건 기록 (http_client에서 시도마다 호출)
+    - 호출 수 / 지연시간 히스토그램 / 오류 분류 / 세션별 호출 수
+    """
+    labels = {"endpoint": endpoint}
+    inc("api.calls", labels)
+    observe("api.latency", elapsed, labels)
+    err_class = error or (f"HTTP {status}" if status is not None and status >= 400 else None)
+    if err_class:
+        inc("api.errors", {"endpoint": endpoint, "error": err_class})
+    _count_session(endpoint)
+
+def record_cache(cache, result, n=1):
+    """
+    캐시 조회 결과 기록
+    result: "hit"(신선) / "coalesced"(동시 호출 합류) / "stale"(쿼터 소진 시 만료 캐시)
+            / "fallback"(대체 계산) / "miss"(실제 호출)
+    """
+    if n: inc("cache.lookups", {"cache": cache, "result": result}, n)
+
+# ==============================================================================
+# [SECTION 4: QUERY & DUMP]
+# ==============================================================================
+
+def _percentile(ordered, q):
+    if not ordered: return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def endpoint_table():
+    """
+    엔드포인트별 호출 수, 오류 수, 지연시간(평균/p50/p95/최대), 오류 분류를 반환합니다.
+    """
+    with _lock:
+        counters = dict(_counters)
+        hists = {k: (dict(h), list(h["recent"])) for k, h in _histograms.items() if k[0] == "api.latency"}
+    rows = []
+    for (name, labels), (h, recent) in sorted(hists.items()):
+        endpoint = dict(labels)["endpoint"]
+        errors = {dict(lb)["error"]: n for (nm, lb), n in counters.items()
+                  if nm == "api.errors" and dict(lb).get("endpoint") == endpoint}
+        ordered = sorted(recent)
+        rows.append({
+            "endpoint": endpoint,
+            "calls": counters.get(_key("api.calls", {"endpoint": endpoint}), 0),
+            "errors": sum(errors.values()),
+            "avg_ms": round(h["sum_ms"] / h["count"], 1) if h["count"] else 0.0,
+            "p50_ms": round(_percentile(ordered, 0.50), 1),
+            "p95_ms": round(_percentile(ordered, 0.95), 1),
+            "max_ms": round(h["max_ms"], 1),
+            "error_classes": errors,
+        })
+    return rows
+
+def latency_histogram(endpoint):
+    """엔드포인트 지연시간 버킷 분포 [(구간 라벨, 건수)]"""
+    with _lock:
+        h = _histograms.get(_key("api.latency", {"endpoint": endpoint}))
+        buckets = list(h["buckets"]) if h else [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    labels = [f"≤{b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    return list(zip(labels, buckets))
+
+def cache_table():
+    """캐시별 조회 결과 건수와 적중률 (업스트림 호출 없이 응답한 비율, 대체 계산 제외)"""
+    with _lock:
+        lookups = {k: n for k, n in _counters.items() if k[0] == "cache.lookups"}
+    per_cache = {}
+    for (_, labels), n in lookups.items():
+        lb = dict(labels)
+        row = per_cache.setdefault(lb["cache"], {"cache": lb["cache"], "hit": 0, "coalesced": 0, "stale": 0, "fallback": 0, "miss": 0})
+        row[lb["result"]] = row.get(lb["result"], 0) + n
+    rows = []
+    for cache, row in sorted(per_cache.items()):
+        total = row["hit"] + row["coalesced"] + row["stale"] + row["fallback"] + row["miss"]
+        row["hit_rate"] = round((row["hit"] + row["coalesced"] + row["stale"]) / total * 100, 1) if total else 0.0
+        rows.append(row)
+    return rows
+
+def session_table():
+    """세션별 엔드포인트 호출 수 (호출 많은 순)"""
+    with _lock:
+        snapshot = {s: {"first_seen": u["first_seen"], "calls": dict(u["calls"])} for s, u in _sessions.items()}
+    rows = [{"session": s[:8], "first_seen": u["first_seen"], "total": sum(u["calls"].values()), **u["calls"]}
+            for s, u in snapshot.items()]
+    return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+def snapshot():
+    """전체 지표 스냅샷 (덤프/화면 공용)"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "endpoints": endpoint_table(),
+        "histograms": {r["endpoint"]: dict(latency_histogram(r["endpoint"])) for r in endpoint_table()},
+        "caches": cache_table(),
+        "sessions": session_table(),
+    }
+
+def dump(path=METRICS_DUMP_PATH):
+    """
+    현재 스냅샷을 JSONL 파일에 한 줄로 이어 씁니다.
+    Returns: (성공 여부, 메시지)
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot(), ensure_ascii=False) + "\n")
+        return True, f"스냅샷 저장 → {path}"
+    except Exception as e:
+        return False, str(e)
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _sessions.clear()
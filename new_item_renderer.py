@@ -127,6 +127,7 @@ def render_new_item_form():
         st.divider()
         
         # [D] 제출 버튼 및 로직
+        allow_duplicate = st.checkbox("중복 경고 무시 (비슷한 매물이 있어도 등록)", value=False)
         submit_btn = st.form_submit_button("🚀 신규 매물 등록 완료", use_container_width=True)
         
         if submit_btn:
@@ -136,7 +137,7 @@ def render_new_item_form():
                 st.stop()
             
             # 2. 데이터 저장 (Core Engine 호출)
-            success, msg = engine.add_new_row(input_data, current_sheet)
+            success, msg = engine.add_new_row(input_data, current_sheet, allow_duplicate=allow_duplicate)
             
             # 3. 결과 처리
             if success:
@@ -152,5 +153,7 @@ def render_new_item_form():
                 st.session_state.is_adding_new = False
                 st.session_state.selected_item = None
                 st.rerun()
+            elif msg.startswith("⚠️"):
+                st.warning(msg)
             else:
                 st.error(f"❌ 등록 실패: {msg}")
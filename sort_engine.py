@@ -0,0 +1,113 @@
+# sort_engine.py
+# 범공인 Pro v24 Enterprise - Listing Sort Engine Module (v25.00 Keyset Paging)
+# Feature: Sort Key Extraction, Precomputed Permutations, Subset Ordering Without Re-Sort, Stable Cursors
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 화면 라벨 -> 정렬 기준 (None = 시트 순서 그대로)
+SORT_OPTIONS = {
+    "기본 (시트 순서)": None,
+    "가격": "price",
+    "면적": "area",
+    "평당가": "unit_price",
+    "층": "floor",
+    "접수일": "date",
+    "역거리": "station",
+}
+
+# ==============================================================================
+# [SECTION 2: SORT KEYS & PERMUTATIONS]
+# ==============================================================================
+
+def _num(df, name):
+    if name not in df.columns: return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[name], errors='coerce')
+
+def sort_values(df, field, is_sale):
+    """
+    정렬 기준 값 배열(float, 값 없음 = NaN)을 반환합니다.
+    - 가격: 매매가(매매) / 월차임(임대)
+    - 평당가: 가격 ÷ 면적(평), 면적 0은 값 없음 처리
+    - 접수일: 날짜를 정수 타임스탬프로 변환
+    """
+    if field == "price":
+        vals = _num(df, '매매가' if is_sale else '월차임')
+    elif field == "area":
+        vals = _num(df, '면적')
+    elif field == "unit_price":
+        area = _num(df, '면적')
+        vals = _num(df, '매매가' if is_sale else '월차임') / area.where(area > 0)
+    elif field == "floor":
+        vals = pd.to_numeric(df['층'].astype(str).str.extract(r'(-?\d+)')[0], errors='coerce') if '층' in df.columns else _num(df, '층')
+    elif field == "date":
+        if '접수일' not in df.columns: return np.full(len(df), np.nan)
+        dates = pd.to_datetime(df['접수일'].astype(str).str.strip(), errors='coerce')
+        vals = pd.Series(dates.to_numpy().astype('datetime64[s]').astype('int64').astype(float), index=df.index).where(dates.notna())
+    elif field == "station":
+        vals = _num(df, '역거리')
+    else:
+        vals = pd.Series(np.arange(len(df), dtype=float), index=df.index)
+    return vals.to_numpy(dtype=float)
+
+def sort_permutation(df, field, is_sale, descending=False):
+    """
+    전체 데이터의 정렬 순열(행 위치 배열)을 계산합니다.
+    안정 정렬이므로 같은 값은 시트 순서를 유지하고, 값이 없는 행은 방향과 무관하게 맨 뒤로 보냅니다.
+    """
+    n = len(df)
+    if field is None: return np.arange(n)
+    vals = sort_values(df, field, is_sale)
+    keys = -vals if descending else vals
+    missing = np.isnan(keys)
+    # lexsort: 마지막 키가 1순위 (결측 여부 → 값 → 원래 위치)
+    return np.lexsort((np.arange(n), np.where(missing, 0.0, keys), missing))
+
+def order_subset(perm, positions, n):
+    """
+    정렬 순열에서 부분집합(필터 결과 행 위치)만 골라 순서대로 반환합니다. (재정렬 없이 O(n))
+    """
+    mask = np.zeros(n, dtype=bool)
+    mask[np.asarray(positions, dtype=int)] = True
+    return perm[mask[perm]]
+
+# ==============================================================================
+# [SECTION 3: STABLE CURSORS]
+# ==============================================================================
+
+def row_cursor(df, row_pos, pos, field, is_sale):
+    """df의 row_pos 행(정렬 결과 pos번째)을 가리키는 커서"""
+    row = df.iloc[[row_pos]]
+    value = float(sort_values(row, field, is_sale)[0]) if field else None
+    return {"iid": str(row['IronID'].iloc[0]), "value": value, "pos": int(pos)}
+
+def cursor_index(df, order):
+    """
+    정렬 결과의 IronID → 순번 사전 (같은 IronID가 여럿이면 앞선 순번)
+    정렬 결과와 함께 캐시해 두면 커서 찾기가 매 재실행 O(1)
+    """
+    ids = df['IronID'].to_numpy()[order].astype(str)
+    return dict(zip(ids[::-1], range(len(ids) - 1, -1, -1)))
+
+def locate_cursor(df, order, cursor, field, is_sale, descending=False, index=None):
+    """
+    커서가 가리키는 행의 현재 위치를 찾습니다.
+    1) 같은 IronID 행이 결과에 남아 있으면 그 위치 (index: cursor_index 결과, 없으면 새로 계산)
+    2) 행이 빠졌으면 정렬 값 기준으로 들어갈 자리 (키셋 방식)
+    3) 둘 다 불가하면 저장된 위치
+    """
+    if not cursor or not len(order): return 0
+    if index is None: index = cursor_index(df, order)
+    pos = index.get(cursor["iid"], -1)
+    if pos < 0 and field and cursor.get("value") is not None and not np.isnan(cursor["value"]):
+        vals = sort_values(df.iloc[order], field, is_sale)
+        valid = vals[~np.isnan(vals)]
+        pos = int(np.searchsorted(-valid if descending else valid,
+                                  -cursor["value"] if descending else cursor["value"], side='left'))
+    if pos < 0:
+        pos = cursor.get("pos", 0)
+    return int(min(max(pos, 0), len(order) - 1))
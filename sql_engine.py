@@ -0,0 +1,262 @@
+# sql_engine.py
+# 범공인 Pro v24 Enterprise - Listing SQL Engine Module (v25.00 Embedded Query)
+# Feature: In-Memory SQLite Mirror, Indexed Filters, Parameterized Page Queries, Keyset Locate, Background Sync
+
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import sort_engine
+import address_index
+import tracing
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 설정: .streamlit/secrets.toml
+# [query]
+# engine = "sql"               # "pandas"(기본) / "sql"
+
+# 필터/정렬에 쓰는 원본 컬럼 (없으면 NULL 컬럼으로 생성)
+TEXT_COLS = ["구분", "지역_구", "지역_동", "IronID"]
+NUMERIC_COLS = ["매매가", "수익률", "대지면적", "보증금", "월차임", "권리금", "면적", "역거리"]
+
+# 인덱스 대상 (정렬 키 컬럼은 별도로 모두 인덱스)
+INDEX_COLS = ["구분", "지역_구", "지역_동", "_bunji", "IronID"] + NUMERIC_COLS + ["_floor"]
+
+# 보관할 미러 수 (시트 6개 + 편집 직후 이전 버전 여유분)
+MIRROR_MAX = 8
+
+# 정렬 기준 -> 미러 컬럼
+SORT_COLS = {field: f"_s_{field}" for field in sort_engine.SORT_OPTIONS.values() if field}
+
+# ==============================================================================
+# [SECTION 2: MIRROR]
+# ==============================================================================
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def fingerprint(df):
+    """데이터 내용 지문 (세션이 달라도 같은 내용이면 같은 미러 공유, '선택' 제외)"""
+    body = df.drop(columns=['선택'], errors='ignore')
+    hashed = pd.util.hash_pandas_object(body, index=False).to_numpy()
+    return hashlib.blake2b(hashed.tobytes() + repr(list(body.columns)).encode(), digest_size=16).hexdigest()
+
+class ListingMirror:
+    """
+    시트 데이터 1벌의 SQLite 사본 (행 번호 _pos = df_main 행 위치)
+    구글 시트가 원본이며, 미러는 조회 전용입니다.
+    """
+    def __init__(self, key, is_sale):
+        self.key = key
+        self.is_sale = is_sale
+        self.ready = False
+        self.error = None
+        self.rows = 0
+        self.columns = set()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def build(self, df):
+        """미러 테이블 생성 + 인덱스 (백그라운드 스레드에서 호출)"""
+        try:
+            n = len(df)
+            table = pd.DataFrame({"_pos": np.arange(n)})
+            for c in TEXT_COLS:
+                table[c] = df[c].astype(str).to_numpy() if c in df.columns else None
+            for c in NUMERIC_COLS:
+                table[c] = pd.to_numeric(df[c], errors='coerce').to_numpy() if c in df.columns else np.nan
+            table["_bunji"] = df['번지'].astype(str).str.strip().to_numpy() if '번지' in df.columns else ""
+            # 번지 해석 결과 (address_index와 같은 규칙, 해석 불가면 _bon NULL)
+            parsed = address_index.parse_bunji(df['번지'] if '번지' in df.columns else pd.Series("", index=df.index))
+            table["_san"] = parsed["산"].astype(int).to_numpy()
+            table["_bon"] = parsed["본번"].to_numpy()
+            table["_bu"] = parsed["부번"].to_numpy()
+            # 층수 필터와 동일: 첫 정수, 없으면 1층
+            table["_floor"] = (df['층'].astype(str).str.extract(r'(-?\d+)')[0].fillna(1).astype(float).to_numpy()
+                               if '층' in df.columns else np.nan)
+            # 통합 검색: 모든 컬럼 문자열을 구분자로 이어 붙임 (컬럼 경계를 넘는 오탐 방지)
+            text = df.drop(columns=['선택'], errors='ignore').astype(str).fillna("")
+            search = text.iloc[:, 0] if len(text.columns) else pd.Series("", index=df.index)
+            for c in text.columns[1:]:
+                search = search + "\x1f" + text[c]
+            table["_search"] = search.str.lower().to_numpy()
+            for field, col in SORT_COLS.items():
+                table[col] = sort_engine.sort_values(df, field, self.is_sale)
+
+            with self._lock:
+                table.to_sql("listings", self._conn, index=False)
+                for c in INDEX_COLS + list(SORT_COLS.values()):
+                    self._conn.execute(f"CREATE INDEX {_q('ix' + c)} ON listings ({_q(c)})")
+                self._conn.execute("CREATE INDEX ix_address ON listings (_san, _bon, _bu)")
+                self._conn.commit()
+                self.rows = n
+                self.columns = set(df.columns)
+                self.ready = True
+        except Exception as e:
+            self.error = str(e)
+            print(f"[SQL Mirror Error] {e}")
+
+    def _execute(self, sql, params):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --------------------------------------------------------------------------
+    # 필터 / 정렬 → SQL (list_renderer.filter_listings와 같은 조건)
+    # --------------------------------------------------------------------------
+
+    def where(self, flt):
+        clauses, params = [], []
+
+        def _in(col, values):
+            clauses.append(f"{_q(col)} IN ({','.join('?' * len(values))})")
+            params.extend(str(v) for v in values)
+
+        def _cmp(col, op, value):
+            if value is not None:
+                clauses.append(f"{_q(col)} {op} ?")
+                params.append(float(value))
+
+        if flt.get('selected_cat'): _in('구분', flt['selected_cat'])
+        if flt.get('selected_gu'): _in('지역_구', flt['selected_gu'])
+        if flt.get('selected_dong'): _in('지역_동', flt['selected_dong'])
+        if flt.get('exact_bunji'):
+            q = address_index.parse_query(flt['exact_bunji'])
+            if q is None:
+                clauses.append("_bunji = ?")
+                params.append(flt['exact_bunji'].strip())
+            else:
+                clauses.append("_san = ? AND _bon BETWEEN ? AND ?")
+                params.extend([int(q["산"]), q["lo"], q["hi"]])
+                if q["부번"] is not None:
+                    clauses.append("_bu = ?")
+                    params.append(q["부번"])
+        if flt.get('search_keyword'):
+            clauses.append("instr(_search, ?) > 0")
+            params.append(str(flt['search_keyword']).lower())
+
+        if self.is_sale:
+            _cmp('매매가', '>=', flt.get('min_price')); _cmp('매매가', '<=', flt.get('max_price'))
+            _cmp('수익률', '>=', flt.get('min_yield')); _cmp('수익률', '<=', flt.get('max_yield'))
+            _cmp('대지면적', '>=', flt.get('min_land')); _cmp('대지면적', '<=', flt.get('max_land'))
+        else:
+            _cmp('보증금', '>=', flt.get('min_dep')); _cmp('보증금', '<=', flt.get('max_dep'))
+            _cmp('월차임', '>=', flt.get('min_rent')); _cmp('월차임', '<=', flt.get('max_rent'))
+            if flt.get('is_no_kwon'):
+                clauses.append(f"{_q('권리금')} = 0")
+            else:
+                _cmp('권리금', '>=', flt.get('min_kwon')); _cmp('권리금', '<=', flt.get('max_kwon'))
+
+        _cmp('면적', '>=', flt.get('min_area')); _cmp('면적', '<=', flt.get('max_area'))
+        _cmp('_floor', '>=', flt.get('min_fl')); _cmp('_floor', '<=', flt.get('max_fl'))
+
+        # 역세권 (반경 m는 list_renderer에서 변환해 전달, 미계산 매물은 NULL이라 제외)
+        if '역거리' in self.columns:
+            _cmp('역거리', '<=', flt.get('_station_radius_m'))
+
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def order_by(field, desc):
+        """sort_engine.sort_permutation과 같은 순서: 값 없음은 맨 뒤, 같은 값은 시트 순서"""
+        if not field: return " ORDER BY _pos"
+        col = SORT_COLS[field]
+        return f" ORDER BY ({col} IS NULL), {col} {'DESC' if desc else 'ASC'}, _pos"
+
+    # --------------------------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------------------------
+
+    def count(self, flt):
+        where, params = self.where(flt)
+        return self._execute("SELECT COUNT(*) FROM listings" + where, params)[0][0]
+
+    def page(self, flt, field, desc, offset, limit):
+        """정렬 결과의 offset번째부터 limit개 행 위치 (현재 페이지만 조회)"""
+        where, params = self.where(flt)
+        sql = "SELECT _pos FROM listings" + where + self.order_by(field, desc) + " LIMIT ? OFFSET ?"
+        return np.array([r[0] for r in self._execute(sql, params + [int(limit), int(max(offset, 0))])], dtype=int)
+
+    def order(self, flt, field, desc):
+        """필터 + 정렬 결과 전체 행 위치 (스크롤 모드 / 전체 선택용)"""
+        where, params = self.where(flt)
+        return np.array([r[0] for r in self._execute("SELECT _pos FROM listings" + where + self.order_by(field, desc), params)], dtype=int)
+
+    def locate(self, flt, field, desc, cursor, total):
+        """
+        커서 행의 현재 순번 (sort_engine.locate_cursor와 같은 규칙, 앞선 행 수를 세는 키셋 방식)
+        """
+        if not cursor or not total: return 0
+        where, params = self.where(flt)
+        cond = where or " WHERE 1=1"
+        col = SORT_COLS.get(field) if field else None
+        before_op = ">" if desc else "<"
+        pos = -1
+
+        found = self._execute(f"SELECT {col or '_pos'}, _pos FROM listings{cond} AND IronID = ? ORDER BY _pos LIMIT 1",
+                              params + [str(cursor["iid"])])
+        if found:
+            value, row_pos = found[0]
+            if not col:
+                sql, extra = " AND _pos < ?", [row_pos]
+            elif value is None:
+                sql, extra = f" AND ({col} IS NOT NULL OR _pos < ?)", [row_pos]
+            else:
+                sql, extra = f" AND {col} IS NOT NULL AND ({col} {before_op} ? OR ({col} = ? AND _pos < ?))", [value, value, row_pos]
+            pos = self._execute("SELECT COUNT(*) FROM listings" + cond + sql, params + extra)[0][0]
+        elif col and cursor.get("value") is not None and not np.isnan(cursor["value"]):
+            pos = self._execute(f"SELECT COUNT(*) FROM listings{cond} AND {col} IS NOT NULL AND {col} {before_op} ?",
+                                params + [float(cursor["value"])])[0][0]
+        if pos < 0:
+            pos = cursor.get("pos", 0)
+        return int(min(max(pos, 0), total - 1))
+
+# ==============================================================================
+# [SECTION 3: MIRROR REGISTRY & BACKGROUND SYNC]
+# ==============================================================================
+
+_mirrors = OrderedDict()
+_registry_lock = threading.Lock()
+
+def is_enabled():
+    """secrets [query] engine = "sql" 일 때만 사용 (기본은 pandas 필터)"""
+    try:
+        import streamlit as st
+        return st.secrets.get("query", {}).get("engine") == "sql"
+    except Exception:
+        return False
+
+def _sync(mirror, df):
+    with tracing.span("sql.sync"):
+        mirror.build(df)
+
+def get_mirror(sheet_name, df, is_sale, fp=None):
+    """
+    준비된 미러를 반환합니다. 없으면 백그라운드 동기화를 시작하고 None (그동안은 pandas 경로 사용)
+    fp: 호출 측에서 캐시한 데이터 지문 (없으면 계산)
+    """
+    key = (sheet_name, is_sale, fp or fingerprint(df))
+    with _registry_lock:
+        mirror = _mirrors.get(key)
+        if mirror is not None:
+            _mirrors.move_to_end(key)
+            return mirror if mirror.ready else None
+        mirror = ListingMirror(key, is_sale)
+        _mirrors[key] = mirror
+        while len(_mirrors) > MIRROR_MAX:
+            _mirrors.popitem(last=False)
+    threading.Thread(target=tracing.bind(_sync), args=(mirror, df.copy()), name="sql-sync", daemon=True).start()
+    return None
+
+def get_status():
+    """미러 목록 (시트, 행 수, 준비 여부, 오류)"""
+    with _registry_lock:
+        return [{"sheet": k[0], "rows": m.rows, "ready": m.ready, "error": m.error} for k, m in _mirrors.items()]
+
+def reset():
+    with _registry_lock:
+        _mirrors.clear()
@@ -0,0 +1,187 @@
+# storage_backend.py
+# 범공인 Pro v24 Enterprise - Storage Backend Module (v25.00 Offline Stand-in)
+# Feature: Pluggable Sheet Storage, Google Sheets Backend, Local CSV Stand-in, Injected Latency/Bandwidth
+
+import os
+import io
+import time
+import threading
+from abc import ABC, abstractmethod
+import pandas as pd
+import metrics
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 설정: .streamlit/secrets.toml
+# [storage]
+# backend = "local"            # "gsheets"(기본) / "local"
+# path = "data/sheets"         # local: 시트별 CSV 보관 폴더
+# latency_ms = 300             # local: 호출마다 더해지는 왕복 지연
+# bandwidth_kbps = 2000        # local: 전송 속도 (0 = 무제한)
+
+DEFAULT_LOCAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sheets")
+
+# ==============================================================================
+# [SECTION 2: BACKENDS]
+# ==============================================================================
+
+class SheetBackend(ABC):
+    """
+    시트 저장소 공통 인터페이스
+    - read: 편집용 최신 데이터 (캐시 무시)
+    - export: 로드용 CSV 원본 (헤더 표준화 전)
+    - write: 시트 전체 덮어쓰기
+    """
+    name = "base"
+
+    @abstractmethod
+    def read(self, sheet_name):
+        """편집용 최신 데이터 (캐시 무시)"""
+
+    def export(self, sheet_name):
+        return self.read(sheet_name)
+
+    @abstractmethod
+    def write(self, sheet_name, df):
+        """시트 전체 덮어쓰기"""
+
+def _timed(backend, op, fn):
+    """저장소 호출 1건을 지표(storage.*)로 기록합니다."""
+    t0 = time.perf_counter()
+    try:
+        result = fn()
+        metrics.record_call(f"storage.{backend.name}.{op}", time.perf_counter() - t0)
+        return result
+    except Exception as e:
+        metrics.record_call(f"storage.{backend.name}.{op}", time.perf_counter() - t0, error=type(e).__name__)
+        raise
+
+class GSheetsBackend(SheetBackend):
+    """구글 시트 (st.connection 기반, 기본값)"""
+    name = "gsheets"
+
+    def __init__(self, sheet_url, sheet_gids):
+        self.sheet_url = sheet_url
+        self.sheet_gids = sheet_gids
+        self._conn = None
+
+    def _connection(self):
+        # 배치 작업(export만 사용)에서는 Streamlit 연결을 만들지 않도록 지연 생성
+        if self._conn is None:
+            import streamlit as st
+            from streamlit_gsheets import GSheetsConnection
+            self._conn = st.connection("gsheets", type=GSheetsConnection)
+        return self._conn
+
+    def read(self, sheet_name):
+        return _timed(self, "read", lambda: self._connection().read(spreadsheet=self.sheet_url, worksheet=sheet_name, ttl=0))
+
+    def export(self, sheet_name):
+        gid = self.sheet_gids.get(sheet_name)
+        return _timed(self, "export", lambda: pd.read_csv(f"{self.sheet_url}/export?format=csv&gid={gid}"))
+
+    def write(self, sheet_name, df):
+        return _timed(self, "write", lambda: self._connection().update(spreadsheet=self.sheet_url, worksheet=sheet_name, data=df))
+
+class LocalSheetBackend(SheetBackend):
+    """
+    로컬 CSV 파일 기반 시트 대역 (오프라인 개발/벤치마크용)
+    시트 1개 = CSV 1개. 호출마다 latency_ms + 전송량/bandwidth_kbps 만큼 지연을 주입해 네트워크 비용을 재현합니다.
+    """
+    name = "local"
+
+    def __init__(self, root=DEFAULT_LOCAL_DIR, latency_ms=0.0, bandwidth_kbps=0.0):
+        self.root = root
+        self.latency_ms = float(latency_ms or 0)
+        self.bandwidth_kbps = float(bandwidth_kbps or 0)
+        self._lock = threading.Lock()
+        self.stats = {"reads": 0, "writes": 0, "bytes_read": 0, "bytes_written": 0, "simulated_sec": 0.0}
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, sheet_name):
+        return os.path.join(self.root, f"{sheet_name}.csv")
+
+    def _simulate(self, nbytes):
+        delay = self.latency_ms / 1000
+        if self.bandwidth_kbps > 0:
+            delay += nbytes / (self.bandwidth_kbps * 1024)
+        if delay > 0: time.sleep(delay)
+        return delay
+
+    def _read(self, sheet_name):
+        path = self._path(sheet_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"시트 없음: {sheet_name}")
+        with open(path, "rb") as f:
+            payload = f.read()
+        delay = self._simulate(len(payload))
+        with self._lock:
+            self.stats["reads"] += 1
+            self.stats["bytes_read"] += len(payload)
+            self.stats["simulated_sec"] += delay
+        return pd.read_csv(io.BytesIO(payload))
+
+    def _write(self, sheet_name, df):
+        payload = df.to_csv(index=False).encode("utf-8")
+        delay = self._simulate(len(payload))
+        tmp = self._path(sheet_name) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, self._path(sheet_name))  # 쓰기 도중 실패해도 기존 시트 보존
+        with self._lock:
+            self.stats["writes"] += 1
+            self.stats["bytes_written"] += len(payload)
+            self.stats["simulated_sec"] += delay
+
+    def read(self, sheet_name):
+        return _timed(self, "read", lambda: self._read(sheet_name))
+
+    def export(self, sheet_name):
+        return _timed(self, "export", lambda: self._read(sheet_name))
+
+    def write(self, sheet_name, df):
+        return _timed(self, "write", lambda: self._write(sheet_name, df))
+
+    def seed(self, sheet_name, df):
+        """지연 주입/통계 없이 시트를 채웁니다. (초기 데이터 준비용)"""
+        df.to_csv(self._path(sheet_name), index=False)
+
+    def reset_stats(self):
+        with self._lock:
+            for k in self.stats: self.stats[k] = 0.0 if k == "simulated_sec" else 0
+
+# ==============================================================================
+# [SECTION 3: BACKEND SELECTION]
+# ==============================================================================
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def _configured_backend(sheet_url, sheet_gids):
+    """secrets의 [storage] 설정으로 백엔드 생성 (설정/Streamlit 없으면 구글 시트)"""
+    try:
+        import streamlit as st
+        conf = dict(st.secrets.get("storage", {}))
+    except Exception:
+        conf = {}
+    if conf.get("backend") == "local":
+        return LocalSheetBackend(conf.get("path", DEFAULT_LOCAL_DIR),
+                                 latency_ms=conf.get("latency_ms", 0), bandwidth_kbps=conf.get("bandwidth_kbps", 0))
+    return GSheetsBackend(sheet_url, sheet_gids)
+
+def get_backend(sheet_url, sheet_gids):
+    """현재 저장소 백엔드 (최초 호출 시 설정에 따라 생성)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _configured_backend(sheet_url, sheet_gids)
+        return _backend
+
+def use_backend(backend):
+    """저장소 백엔드 교체 (벤치마크/오프라인 점검용). 이전 백엔드를 반환합니다."""
+    global _backend
+    with _backend_lock:
+        prev, _backend = _backend, backend
+        return prev
@@ -0,0 +1,255 @@
+# tracing.py
+# 범공인 Pro v24 Enterprise - Latency Tracing Module (v25.00 Span Timer)
+# Feature: Per-Rerun Trace, Nested Span Timer, Worker Thread Binding, Rolling Percentiles, JSONL Export
+
+import os
+import json
+import time
+import uuid
+import threading
+import functools
+from collections import deque
+
+# 세션 식별용 (Streamlit 밖 배치 실행에서는 없음)
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 보관할 완료 트레이스 수 / 구간별 지연시간 표본 수
+TRACE_HISTORY = 50
+SPAN_WINDOW = 500
+
+# 한 트레이스에 기록할 최대 구간 수 (카드 렌더링 등 반복 구간 폭주 방지)
+MAX_SPANS_PER_TRACE = 500
+
+# JSONL 내보내기 기본 경로
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TRACE_EXPORT_PATH = os.path.join(DATA_DIR, "traces.jsonl")
+
+# ==============================================================================
+# [SECTION 2: TRACE & SPAN RECORDING]
+# ==============================================================================
+
+class Trace:
+    """
+    스크립트 실행 1회(rerun) 동안의 구간 기록
+    """
+    def __init__(self, label, session=None):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.session = session
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.duration_ms = None
+        self.aborted = False
+        self.spans = []
+        self.lock = threading.Lock()
+
+    def add_span(self, name, start, elapsed, depth, thread, error=None):
+        with self.lock:
+            if len(self.spans) >= MAX_SPANS_PER_TRACE: return
+            self.spans.append({
+                "name": name,
+                "start_ms": round((start - self.t0) * 1000, 2),
+                "duration_ms": round(elapsed * 1000, 2),
+                "depth": depth,
+                "thread": thread,
+                "error": error,
+            })
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "trace_id": self.trace_id, "label": self.label, "session": self.session,
+                "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+                "duration_ms": self.duration_ms, "aborted": self.aborted,
+                "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+            }
+
+_local = threading.local()
+_completed = deque(maxlen=TRACE_HISTORY)
+_samples = {}
+_lock = threading.Lock()
+
+def _stack():
+    if not hasattr(_local, "stack"): _local.stack = []
+    return _local.stack
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+def _script_session():
+    if get_script_run_ctx is None: return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+def current_session():
+    """
+    현재 실행의 Streamlit 세션 ID (워커 스레드는 bind로 전달된 트레이스 기준, 없으면 None)
+    """
+    trace = current_trace()
+    if trace is not None and trace.session: return trace.session
+    return _script_session()
+
+def begin_trace(label="rerun"):
+    """현재 스레드에서 새 트레이스를 시작하고 반환합니다."""
+    trace = Trace(label, session=_script_session())
+    _local.trace = trace
+    _local.stack = []
+    return trace
+
+def end_trace(trace=None, aborted=False):
+    """
+    트레이스를 마감하고 완료 목록에 보관합니다. (중복 호출 무시)
+    aborted=True면 st.rerun/st.stop 등으로 끝까지 실행되지 않은 경우로, 마지막 구간 종료 시각을 끝으로 봅니다.
+    """
+    trace = trace or current_trace()
+    if trace is None or trace.duration_ms is not None: return
+    with trace.lock:
+        if aborted:
+            ends = [s["start_ms"] + s["duration_ms"] for s in trace.spans]
+            trace.duration_ms = round(max(ends), 2) if ends else 0.0
+            trace.aborted = True
+        else:
+            trace.duration_ms = round((time.perf_counter() - trace.t0) * 1000, 2)
+    with _lock:
+        _completed.append(trace)
+    if current_trace() is trace:
+        _local.trace = None
+
+def _record_sample(name, elapsed):
+    with _lock:
+        _samples.setdefault(name, deque(maxlen=SPAN_WINDOW)).append(elapsed)
+
+class span:
+    """
+    구간 타이머 (with 문 / 데코레이터 겸용)
+    - 활성 트레이스가 있으면 폭포수용 구간으로 기록
+    - 트레이스와 무관하게 구간별 누적 지연시간 표본은 항상 기록
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = _stack()
+        self.depth = len(stack)
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        stack = _stack()
+        if stack: stack.pop()
+        _record_sample(self.name, elapsed)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_span(self.name, self.start, elapsed, self.depth, threading.current_thread().name,
+                           error=exc_type.__name__ if exc_type else None)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+class trace_scope(span):
+    """
+    Fragment 재실행처럼 app.py를 거치지 않는 실행용 구간
+    활성 트레이스가 있으면 일반 구간으로, 없으면 단독 트레이스로 기록합니다.
+    """
+    def __enter__(self):
+        self.owned = current_trace() is None
+        if self.owned: begin_trace(self.name)
+        return super().__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        super().__exit__(exc_type, exc, tb)
+        if self.owned: end_trace()
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with trace_scope(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+def bind(fn):
+    """
+    현재 트레이스를 워커 스레드로 전달하는 래퍼 (ThreadPoolExecutor 제출용)
+    """
+    trace = current_trace()
+    if trace is None: return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        prev_trace, prev_stack = current_trace(), getattr(_local, "stack", [])
+        _local.trace, _local.stack = trace, []
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.trace, _local.stack = prev_trace, prev_stack
+    return wrapper
+
+# ==============================================================================
+# [SECTION 3: QUERY & EXPORT]
+# ==============================================================================
+
+def _percentile(ordered, q):
+    if not ordered: return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def get_recent_traces(limit=None):
+    """완료된 트레이스 목록 (최신순, dict)"""
+    with _lock:
+        traces = list(_completed)[::-1]
+    return [t.to_dict() for t in traces[:limit]]
+
+def get_span_stats():
+    """
+    구간별 최근 표본 기준 호출 수와 지연시간(p50/p95/p99/최대, ms)을 반환합니다.
+    """
+    with _lock:
+        snapshot = {name: sorted(v) for name, v in _samples.items()}
+    rows = []
+    for name, ordered in sorted(snapshot.items()):
+        rows.append({
+            "span": name, "count": len(ordered),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        })
+    return rows
+
+def traces_to_jsonl(traces=None):
+    """트레이스를 한 줄에 하나씩 JSON으로 직렬화합니다."""
+    traces = get_recent_traces() if traces is None else traces
+    return "".join(json.dumps(t, ensure_ascii=False) + "\n" for t in traces)
+
+def export_jsonl(path=TRACE_EXPORT_PATH):
+    """
+    보관 중인 트레이스를 JSONL 파일에 이어 씁니다.
+    Returns: (성공 여부, 메시지)
+    """
+    try:
+        traces = get_recent_traces()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(traces_to_jsonl(traces))
+        return True, f"{len(traces)}건 저장 → {path}"
+    except Exception as e:
+        return False, str(e)
+
+def reset():
+    with _lock:
+        _completed.clear()
+        _samples.clear()
@@ -0,0 +1,98 @@
+# unified_renderer.py
+# 범공인 Pro v24 Enterprise - Unified Search Renderer (v25.00 Cross-Sheet)
+# Feature: All-Sheet Search Form, Sheet-Tagged Result List, Direct Jump to Detail View in Source Sheet
+
+import streamlit as st
+import pandas as pd
+import core_engine as engine
+import list_renderer
+import unified_search
+
+def _format_result(row):
+    """결과 1행 요약 (시트 / 주소 / 층·면적 / 금액)"""
+    def num(v):
+        return f"{float(v):,.0f}" if pd.notna(v) and str(v) != "" else "-"
+    price = f"매 {num(row['매매가'])}" if "매매" in str(row['시트']) else f"보 {num(row['보증금'])} / 월 {num(row['월차임'])}"
+    name = f" {row['건물명']}" if pd.notna(row['건물명']) and str(row['건물명']).strip() else ""
+    return (f"`{row['시트']}` **{row['지역_구']} {row['지역_동']} {row['번지']}**{name} [{row['구분']}]  \n"
+            f"📐 {row['층']}층 / {row['면적']}평 · 💰 {price}")
+
+def open_result(sheet_name, row):
+    """
+    검색 결과를 원래 시트의 상세 화면으로 엽니다. (버튼 콜백)
+    시트가 다르면 이전 시트 기준 필터/목록 캐시만 정리하고 대상 시트를 불러옵니다. (전체 캐시 파괴 없음)
+    """
+    if sheet_name != st.session_state.current_sheet or st.session_state.get('df_main') is None:
+        for key in list_renderer.FILTER_KEYS + ['filter_cache', 'sort_cache', 'sql_fingerprint', 'df_main']:
+            st.session_state.pop(key, None)
+        st.session_state.current_sheet = sheet_name
+        st.session_state.page_num = 1
+        st.session_state.page_cursor = None
+        st.session_state.scroll_blocks = 1
+        st.session_state.df_main = engine.load_sheet_data(sheet_name)
+        if st.session_state.df_main is not None:
+            engine.capture_row_fingerprints(sheet_name, st.session_state.df_main)
+
+    df = st.session_state.df_main
+    if df is None: return
+    # IronID로 찾고, 없으면 세컨드 매칭 (번지 + 층 + 면적)
+    hits = df.index[df['IronID'].astype(str) == str(row.get('IronID'))] if 'IronID' in df.columns else []
+    if len(hits):
+        st.session_state.selected_item = df.loc[hits[0]]
+    else:
+        candidates = engine.signature_index(df).lookup(row)
+        if len(candidates):
+            st.session_state.selected_item = df.iloc[candidates[0]]
+        else:
+            st.session_state.unified_missing = f"[{sheet_name}] 시트에서 매물을 찾지 못했습니다. (삭제되었거나 이동된 매물)"
+            return
+    st.session_state.is_adding_new = False
+
+def render_unified_search():
+    """
+    전체 시트 검색 화면 (6개 시트를 동시에 불러와 한 번에 검색)
+    """
+    st.subheader("🔎 전체 시트 검색")
+
+    c1, c2 = st.columns([3, 2])
+    keyword = c1.text_input("검색어 (건물명, 특징, 동 등)", key='u_keyword')
+    bunji = c2.text_input("번지 (예: 123-4, 123-*, 120~130)", key='u_bunji')
+    c3, c4 = st.columns([3, 2])
+    sheets = c3.multiselect("대상 시트", engine.SHEET_NAMES, key='u_sheets', placeholder="전체 시트")
+    fuzzy = c4.checkbox("오타 허용 (초성 가능)", key='u_fuzzy')
+
+    ranges = {}
+    with st.expander("금액 / 면적 / 층 범위"):
+        for col in unified_search.RANGE_COLS:
+            r1, r2 = st.columns(2)
+            lo = r1.number_input(f"최소 {col}", key=f'u_min_{col}', value=None, step=1.0)
+            hi = r2.number_input(f"최대 {col}", key=f'u_max_{col}', value=None, step=1.0)
+            if lo is not None or hi is not None: ranges[col] = (lo, hi)
+
+    refresh = st.button("🔄 시트 다시 불러오기")
+    with st.spinner("전체 시트 불러오는 중..."):
+        index = unified_search.get_combined(force=refresh)
+    loaded = ", ".join(f"{name} {n:,}" for name, n in index.sheet_rows.items())
+    st.caption(f"{loaded} (불러오기 {index.load_secs:.1f}초)")
+    for name, err in index.errors.items():
+        st.warning(f"[{name}] 불러오기 실패: {err}")
+    if st.session_state.get('unified_missing'):
+        st.warning(st.session_state.pop('unified_missing'))
+
+    if not (keyword or bunji or ranges):
+        st.info("검색어, 번지 또는 범위를 입력하세요.")
+        return
+
+    results, total = index.search(keyword, bunji, ranges, fuzzy, sheets)
+    if total == 0:
+        st.warning("🔍 검색 결과가 없습니다.")
+        return
+    more = f" (상위 {len(results)}건 표시)" if total > len(results) else ""
+    st.markdown(f"**검색 결과 {total:,}건**{more}")
+
+    for i, row in results.iterrows():
+        with st.container(border=True):
+            t1, t2 = st.columns([5, 1])
+            t1.markdown(_format_result(row))
+            t2.button("상세보기", key=f"u_open_{i}_{row['IronID']}", use_container_width=True,
+                      on_click=open_result, args=(row['시트'], row.to_dict()))
@@ -0,0 +1,143 @@
+# unified_search.py
+# 범공인 Pro v24 Enterprise - Unified Search Module (v25.00 Cross-Sheet)
+# Feature: Concurrent Six-Sheet Load, Sheet-Tagged Combined Index, Keyword/번지/Range Query, Source Sheet + IronID Results
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import core_engine as engine
+import address_index
+import fuzzy_search
+import tracing
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 동시에 내려받는 시트 수 (시트 6개를 한 번에)
+LOAD_WORKERS = 6
+
+# 통합 인덱스 유지 시간 (초) - load_sheet_data 캐시와 같은 주기로 갱신
+CACHE_TTL_SEC = 60
+
+# 범위 검색 가능 컬럼
+RANGE_COLS = ['보증금', '월차임', '매매가', '면적', '층']
+
+# 결과 표시 컬럼 (없는 컬럼은 빈 값)
+RESULT_COLS = ['시트', '구분', '지역_구', '지역_동', '번지', '층', '면적', '보증금', '월차임', '매매가', '건물명', 'IronID']
+
+# 결과 최대 표시 건수 (전체 건수는 따로 반환)
+RESULT_LIMIT = 50
+
+# ==============================================================================
+# [SECTION 2: CONCURRENT LOAD]
+# ==============================================================================
+
+def _load_frame(sheet_name):
+    """종료 시트는 보관소 인덱스(재동기화 주기 안에서는 다운로드 없음), 나머지는 시트 내려받기"""
+    df = engine.load_archive_index(sheet_name)
+    return df if df is not None else engine.fetch_sheet_frame(sheet_name)
+
+def load_sheets(sheet_names=None, loader=None):
+    """
+    여러 시트를 동시에 내려받아 정제합니다. (Streamlit 캐시/세션 비의존)
+    loader: 시트명 → 데이터프레임 (기본: 종료 시트는 보관소, 나머지는 fetch_sheet_frame)
+    Returns: ({시트명: 데이터프레임}, {시트명: 오류 메시지}, 소요 초)
+    """
+    sheet_names = list(sheet_names or engine.SHEET_NAMES)
+    loader = loader or _load_frame
+    frames, errors = {}, {}
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as pool:
+        futures = {name: pool.submit(tracing.bind(loader), name) for name in sheet_names}
+        for name, future in futures.items():
+            try:
+                df = future.result()
+                if df is not None: frames[name] = df
+            except Exception as e:
+                errors[name] = str(e)
+                print(f"[Unified Load Error] {name}: {e}")
+    return frames, errors, time.perf_counter() - t0
+
+# ==============================================================================
+# [SECTION 3: COMBINED INDEX]
+# ==============================================================================
+
+class CombinedIndex:
+    """
+    시트 여러 개를 하나로 합친 검색 대상 ('시트' 컬럼 = 원래 시트)
+    - 키워드: 행별 전체 컬럼 문자열(소문자)을 미리 이어 붙여 둠 (SQL 미러의 _search와 같은 방식)
+    - 번지 / 오타 허용: 합친 프레임에 address_index / fuzzy_search 인덱스 (첫 검색 시 생성)
+    """
+    def __init__(self, frames, errors=None, load_secs=0.0):
+        parts = [df.drop(columns=['선택'], errors='ignore').assign(시트=name)
+                 for name, df in frames.items() if df is not None and len(df)]
+        self.df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=RESULT_COLS)
+        self.sheet_rows = {name: len(df) for name, df in frames.items() if df is not None}
+        self.errors = errors or {}
+        self.load_secs = load_secs
+        self.loaded_at = time.time()
+
+        text = self.df.astype(str).fillna("")
+        search = text.iloc[:, 0] if len(text.columns) else pd.Series("", index=self.df.index)
+        for c in text.columns[1:]:
+            search = search + "\x1f" + text[c]
+        self.search_text = search.str.lower()
+
+    def search(self, keyword="", bunji="", ranges=None, fuzzy=False, sheets=None, limit=RESULT_LIMIT):
+        """
+        키워드 / 번지 / 범위(컬럼 → (최소, 최대), None은 제한 없음) 조건을 모두 만족하는 행
+        Returns: (결과 데이터프레임 RESULT_COLS, 전체 건수) - 오타 허용이면 점수 순, 아니면 시트 순서
+        """
+        df = self.df
+        mask = np.ones(len(df), dtype=bool)
+        if sheets:
+            mask &= df['시트'].isin(sheets).to_numpy()
+        if bunji:
+            hits = address_index.lookup(df, bunji)
+            if hits is None:
+                mask &= (df['번지'].astype(str).str.strip() == bunji.strip()).to_numpy() if '번지' in df.columns else False
+            else:
+                mask &= np.isin(np.arange(len(df)), hits)
+        for col, (lo, hi) in (ranges or {}).items():
+            if col not in df.columns or (lo is None and hi is None): continue
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy()
+            if lo is not None: mask &= values >= lo
+            if hi is not None: mask &= values <= hi
+
+        order = None
+        if keyword and fuzzy:
+            hits, _ = fuzzy_search.search(df, keyword, top_k=len(df))
+            order = hits[mask[hits]]
+        elif keyword:
+            mask &= self.search_text.str.contains(str(keyword).lower(), regex=False).to_numpy()
+        if order is None:
+            order = np.flatnonzero(mask)
+
+        result = df.iloc[order[:limit]].reindex(columns=RESULT_COLS)
+        return result.reset_index(drop=True), len(order)
+
+# ==============================================================================
+# [SECTION 4: PROCESS CACHE]
+# ==============================================================================
+
+# 세션 공용 통합 인덱스 (시트 전환 시 캐시 파괴와 무관하게 유지, TTL 경과 후 다음 검색에서 갱신)
+_cache = {"index": None}
+_cache_lock = threading.Lock()
+
+def get_combined(force=False, sheet_names=None, loader=None):
+    """통합 인덱스 (없거나 오래됐으면 전체 시트를 동시에 다시 불러옴)"""
+    with _cache_lock:
+        index = _cache["index"]
+        if force or index is None or time.time() - index.loaded_at > CACHE_TTL_SEC:
+            with tracing.span("unified.load"):
+                frames, errors, secs = load_sheets(sheet_names, loader)
+            index = _cache["index"] = CombinedIndex(frames, errors, secs)
+        return index
+
+def invalidate():
+    """시트 내용이 바뀐 뒤 다음 검색에서 다시 불러오도록 합니다."""
+    with _cache_lock:
+        _cache["index"] = None
@@ -0,0 +1,151 @@
+# write_coordinator.py
+# 범공인 Pro v24 Enterprise - Sheet Write Coordinator Module (v25.00 Multi-User Safe)
+# Feature: Per-Sheet Write Lock, Ordered Multi-Sheet Locking, Group Commit Window, Batch Size Metrics
+
+import time
+import threading
+from contextlib import contextmanager
+import metrics
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 같은 시트에 대한 수정 요청을 모으는 시간 (초) - 이 사이에 들어온 요청은 1회 읽기 + 1회 쓰기로 처리
+BATCH_WINDOW_SEC = 0.05
+
+# 한 번에 묶는 최대 요청 수 (초과분은 다음 묶음으로)
+BATCH_MAX = 50
+
+# 묶음 대표의 처리 결과를 기다리는 최대 시간 (초) - 대표 스레드가 비정상 종료해도 대기 요청이 멈추지 않도록
+FOLLOWER_TIMEOUT_SEC = 60
+
+# ==============================================================================
+# [SECTION 2: PER-SHEET LOCKS]
+# ==============================================================================
+
+# Streamlit 세션들은 한 프로세스 안의 스레드이므로, 프로세스 공용 잠금으로 시트 전체 덮어쓰기 경합을 막습니다.
+_locks = {}
+_registry_lock = threading.Lock()
+
+def sheet_lock(sheet_name):
+    """시트별 잠금 (재진입 가능)"""
+    with _registry_lock:
+        lock = _locks.get(sheet_name)
+        if lock is None:
+            lock = _locks[sheet_name] = threading.RLock()
+        return lock
+
+@contextmanager
+def locked(*sheet_names):
+    """
+    여러 시트를 읽기-수정-쓰기 하는 동안 잠급니다.
+    항상 시트 이름 순서로 잠가 트랜잭션끼리 서로 기다리며 멈추는 일(교착)을 막습니다.
+    """
+    names = sorted({n for n in sheet_names if n})
+    held = []
+    t0 = time.perf_counter()
+    try:
+        for name in names:
+            lock = sheet_lock(name)
+            lock.acquire()
+            held.append(lock)
+        metrics.observe("write.lock_wait", time.perf_counter() - t0)
+        yield
+    finally:
+        for lock in reversed(held):
+            lock.release()
+
+# ==============================================================================
+# [SECTION 3: GROUP COMMIT]
+# ==============================================================================
+
+class _Request:
+    def __init__(self, mutate):
+        self.mutate = mutate
+        self.result = None
+        self.done = threading.Event()
+
+class _Batch:
+    def __init__(self):
+        self.requests = []
+        self.closed = False
+
+_open_batches = {}
+_batch_lock = threading.Lock()
+
+def submit(sheet_name, mutate, read, write):
+    """
+    시트 수정 1건을 등록하고 결과를 기다립니다.
+    먼저 들어온 요청이 묶음 대표가 되어 BATCH_WINDOW_SEC 동안 다른 요청을 모은 뒤,
+    시트를 한 번 읽고 → 각 요청의 mutate를 차례로 적용하고 → 한 번 씁니다.
+
+    mutate(sheet_data) → (성공 여부, 메시지, 부가 결과, 수정된 sheet_data)
+      - 실패로 돌려주는 경우 sheet_data를 건드리지 않아야 합니다. (같은 묶음의 다른 요청은 계속 반영)
+      - 대표 요청의 스레드에서 실행되므로 st.session_state 등 세션 상태를 쓰면 안 됩니다.
+        (충돌 검사 기준 등은 호출 전에 준비하고, 캐시 파괴 등 후처리는 반환 후 호출 측에서)
+    read(sheet_name) / write(sheet_name, df): 저장소 입출력
+    Returns: mutate가 돌려준 (성공 여부, 메시지, 부가 결과) - 시트 쓰기 실패·대기 시간 초과 시 (False, 오류 메시지, None)
+    """
+    req = _Request(mutate)
+    with _batch_lock:
+        batch = _open_batches.get(sheet_name)
+        leader = batch is None or batch.closed or len(batch.requests) >= BATCH_MAX
+        if leader:
+            batch = _open_batches[sheet_name] = _Batch()
+        batch.requests.append(req)
+
+    if leader:
+        try:
+            time.sleep(BATCH_WINDOW_SEC)
+            _close(sheet_name, batch)
+            _commit(sheet_name, batch.requests, read, write)
+        finally:
+            # 대표가 도중에 중단돼도(BaseException 포함) 묶음을 닫고 모든 요청에 결과를 채워 깨움
+            _close(sheet_name, batch)
+            _finish(batch.requests, "저장 실패: 묶음 처리가 중단되었습니다")
+    elif not req.done.wait(FOLLOWER_TIMEOUT_SEC):
+        return False, "저장 실패: 저장 대기 시간 초과 (잠시 후 반영 여부를 확인하세요)", None
+    return req.result
+
+def _close(sheet_name, batch):
+    """묶음을 닫아 새 요청이 더 붙지 않게 함 (여러 번 호출해도 안전)"""
+    with _batch_lock:
+        batch.closed = True
+        if _open_batches.get(sheet_name) is batch:
+            del _open_batches[sheet_name]
+
+def _finish(requests, error_msg):
+    """결과가 비어 있는 요청은 실패로 채운 뒤 대기 중인 요청을 모두 깨움"""
+    for req in requests:
+        if req.result is None:
+            req.result = (False, error_msg, None)
+        req.done.set()
+
+def _commit(sheet_name, requests, read, write):
+    """묶음 1개 처리: 잠금 → 1회 읽기 → 요청별 적용 → (성공 건이 있으면) 1회 쓰기"""
+    metrics.inc("write.batches", {"sheet": sheet_name})
+    metrics.inc("write.requests", {"sheet": sheet_name}, n=len(requests))
+    with locked(sheet_name):
+        try:
+            sheet_data = read(sheet_name)
+        except Exception as e:
+            for req in requests:
+                req.result = (False, f"저장 실패: {str(e)}", None)
+            return
+
+        applied = []
+        for req in requests:
+            try:
+                ok, msg, payload, sheet_data = req.mutate(sheet_data)
+            except Exception as e:
+                ok, msg, payload = False, f"저장 실패: {str(e)}", None
+            req.result = (ok, msg, payload)
+            if ok: applied.append(req)
+
+        if applied:
+            try:
+                write(sheet_name, sheet_data)
+            except Exception as e:
+                for req in applied:
+                    req.result = (False, f"저장 실패: {str(e)}", None)
@@ -0,0 +1,329 @@
+# write_queue.py
+# 범공인 Pro v24 Enterprise - Write-Behind Queue Module (v25.00 Non-Blocking Save)
+# Feature: Durable Local Journal, Background Flush Worker, Same-Row Edit Merge, Retry Backoff, Restart Replay
+
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+import core_engine as engine
+import archive_store
+import write_coordinator
+import tracing
+
+# ==============================================================================
+# [SECTION 1: GLOBAL CONFIGURATION]
+# ==============================================================================
+
+# 저널 파일 (기록 1건 = JSON 1줄, 추가 후 fsync)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+JOURNAL_PATH = os.path.join(DATA_DIR, "write_journal.jsonl")
+
+# 워커가 모아서 반영하는 주기 (초) - 이 사이에 들어온 같은 행 수정은 1건으로 병합
+FLUSH_INTERVAL_SEC = 1.0
+
+# 일시 오류(네트워크 등) 재시도 횟수 / 대기 (지수 증가)
+MAX_ATTEMPTS = 5
+RETRY_BASE_SEC = 2.0
+
+# 저널 줄 수가 이 값을 넘고 대기 건이 없으면 완료 기록을 정리
+COMPACT_AFTER_LINES = 500
+
+# ==============================================================================
+# [SECTION 2: QUEUE]
+# ==============================================================================
+
+class WriteQueue:
+    """
+    매물 수정 쓰기 지연(Write-Behind) 큐
+    - enqueue: 저널에 기록하는 즉시 응답 (시트 왕복 없음)
+    - 워커: 시트별로 대기 건을 모아 1회 읽기 + 같은 행 병합 + 1회 쓰기
+    - 재시작 시 완료되지 않은 저널 기록을 다시 대기열에 올림
+    """
+    def __init__(self, journal_path=JOURNAL_PATH, flush_interval=FLUSH_INTERVAL_SEC):
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.entries = OrderedDict()      # id → 수정 건 (status: pending / failed)
+        self.last_written = {}            # (시트, IronID) → (반영 후 지문, 세션)
+        self._cond = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._lines = 0
+        self._busy = False
+        self._replay()
+        self._worker = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._worker.start()
+
+    # --------------------------------------------------------------------------
+    # 저널
+    # --------------------------------------------------------------------------
+
+    def _append(self, record):
+        with self._file_lock:
+            self._append_locked(record)
+
+    def _append_locked(self, record):
+        """_file_lock을 잡은 상태에서 기록 1줄 추가"""
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._lines += 1
+
+    def _replay(self):
+        """저널을 읽어 완료/폐기되지 않은 수정 건을 복원합니다."""
+        if not os.path.exists(self.journal_path): return
+        restored = OrderedDict()
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                self._lines += 1
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # 기록 도중 종료된 마지막 줄
+                kind, eid = rec.get("type"), rec.get("id")
+                if kind == "edit":
+                    restored[eid] = dict(rec, status="pending", attempts=0, next_try=0.0, error=None, replayed=True)
+                elif kind in ("done", "discard"):
+                    restored.pop(eid, None)
+                elif kind == "failed" and eid in restored:
+                    restored[eid].update(status="failed", error=rec.get("error"), conflict=rec.get("conflict", False))
+                elif kind == "retry" and eid in restored:
+                    restored[eid].update(status="pending", error=None, force=rec.get("force", False))
+        self.entries = restored
+        if restored:
+            print(f"[Write Queue] 저널 복원: 대기 {sum(e['status'] == 'pending' for e in restored.values())}건 / "
+                  f"실패 {sum(e['status'] == 'failed' for e in restored.values())}건")
+
+    def _compact(self):
+        """
+        남은 수정 건만 저널에 다시 씁니다. (완료 기록 정리)
+        스냅샷 ~ 파일 교체를 _file_lock 안에서 하므로 그 사이 enqueue된 기록이 빠지지 않음
+        """
+        with self._file_lock:
+            with self._cond:
+                live = [dict(e) for e in self.entries.values()]
+            lines = []
+            for e in live:
+                lines.append({k: e[k] for k in ("type", "id", "sheet", "row", "expected", "cols", "session", "ts")})
+                if e["status"] == "failed":
+                    lines.append({"type": "failed", "id": e["id"], "error": e["error"], "conflict": e.get("conflict", False)})
+            tmp = self.journal_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for rec in lines:
+                    f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.journal_path)
+            self._lines = len(lines)
+
+    # --------------------------------------------------------------------------
+    # 등록 / 조회 / 조작
+    # --------------------------------------------------------------------------
+
+    def enqueue(self, sheet_name, row, expected=None, cols=None, session=None):
+        """수정 1건을 저널에 기록하고 id를 반환합니다. (시트 반영은 워커가 비동기로)"""
+        rec = {"type": "edit", "id": uuid.uuid4().hex[:12], "sheet": sheet_name, "row": row,
+               "expected": expected or {}, "cols": cols or [], "session": session,
+               "ts": time.strftime("%Y-%m-%d %H:%M:%S")}
+        # 저널 기록 ~ 대기열 등록을 _file_lock 하나로 묶음 (그 사이 저널 정리가 끼어들면 기록이 사라짐)
+        with self._file_lock:
+            self._append_locked(rec)
+            with self._cond:
+                # 깨우지 않음: 워커 주기(FLUSH_INTERVAL_SEC) 동안 들어온 수정을 모아 한 번에 반영
+                self.entries[rec["id"]] = dict(json.loads(json.dumps(rec, default=str)),
+                                               status="pending", attempts=0, next_try=0.0, error=None)
+        return rec["id"]
+
+    def status(self, session=None):
+        """대기 건수와 실패 목록 (session을 주면 그 세션이 등록한 수정 건만)"""
+        with self._cond:
+            mine = [e for e in self.entries.values() if session is None or e.get("session") == session]
+            pending = [e for e in mine if e["status"] == "pending"]
+            failed = [dict(e) for e in mine if e["status"] == "failed"]
+            return {"pending": len(pending), "failed": failed}
+
+    def state(self, entry_id):
+        """수정 건 상태: "pending" / "failed" / None (반영 완료 또는 폐기)"""
+        with self._cond:
+            e = self.entries.get(entry_id)
+            return e["status"] if e else None
+
+    def retry(self, entry_id, force=False):
+        """실패 건 재시도 (force=True면 충돌 검사 없이 덮어쓰기)"""
+        with self._cond:
+            e = self.entries.get(entry_id)
+            if not e or e["status"] != "failed": return
+            e.update(status="pending", attempts=0, next_try=0.0, error=None, force=force)
+            self._cond.notify()
+        self._append({"type": "retry", "id": entry_id, "force": force})
+
+    def discard(self, entry_id):
+        with self._cond:
+            self.entries.pop(entry_id, None)
+        self._append({"type": "discard", "id": entry_id})
+
+    def wait_idle(self, timeout=30.0):
+        """대기 건이 모두 반영(또는 실패)될 때까지 대기 (배치/점검용)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._cond:
+                if not self._busy and not any(e["status"] == "pending" for e in self.entries.values()):
+                    return True
+                self._cond.notify()
+            time.sleep(0.05)
+        return False
+
+    # --------------------------------------------------------------------------
+    # 워커
+    # --------------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait(self.flush_interval)
+                now = time.time()
+                due = [e for e in self.entries.values() if e["status"] == "pending" and e["next_try"] <= now]
+                self._busy = bool(due)
+            if not due: continue
+            by_sheet = OrderedDict()
+            for e in due:
+                by_sheet.setdefault(e["sheet"], []).append(e)
+            for sheet_name, batch in by_sheet.items():
+                try:
+                    self._flush_sheet(sheet_name, batch)
+                except Exception as ex:
+                    print(f"[Write Queue Error] {sheet_name}: {ex}")
+            with self._cond:
+                self._busy = False
+                idle = not any(e["status"] == "pending" for e in self.entries.values())
+            if idle and self._lines > COMPACT_AFTER_LINES:
+                self._compact()
+
+    def _finish(self, entries, status, error=None, conflict=False):
+        for e in entries:
+            if status == "done":
+                with self._cond:
+                    self.entries.pop(e["id"], None)
+                self._append({"type": "done", "id": e["id"]})
+            else:
+                with self._cond:
+                    e.update(status="failed", error=error, conflict=conflict)
+                self._append({"type": "failed", "id": e["id"], "error": error, "conflict": conflict})
+
+    @tracing.span("queue.flush_sheet")
+    def _flush_sheet(self, sheet_name, batch):
+        """시트 1개 분량 반영: 1회 읽기 → 행별 병합/충돌 검사 → 1회 쓰기 (시트 잠금 상태에서)"""
+        with write_coordinator.locked(sheet_name):
+            self._flush_locked(sheet_name, batch)
+
+    def _flush_locked(self, sheet_name, batch):
+        storage = engine.get_storage()
+
+        # 같은 행 수정 병합 (뒤에 들어온 값 우선, 충돌 기준 지문은 가장 먼저 들어온 건)
+        groups = OrderedDict()
+        for e in batch:
+            key = str(e["row"].get("IronID") or e["id"])
+            groups.setdefault(key, []).append(e)
+
+        try:
+            sheet_data = engine.normalize_headers(storage.read(sheet_name))
+        except Exception as ex:
+            self._backoff(batch, f"시트 읽기 실패: {ex}")
+            return
+
+        applied, written_rows = [], {}
+        for iid, entries in groups.items():
+            merged = {}
+            for e in entries:
+                merged.update(e["row"])
+            row_idx, by_id = engine.locate_row(sheet_data, merged)
+            if row_idx is None:
+                self._finish(entries, "failed", "원본 데이터를 찾을 수 없습니다. (ID 및 상세 조건 불일치)")
+                continue
+
+            first = entries[0]
+            if by_id and not any(e.get("force") for e in entries):
+                conflicts = engine.find_row_conflicts(sheet_data, first.get("expected") or {}, first.get("cols") or [])
+                # 같은 세션이 앞서 반영한 결과와 같으면 자기 수정이므로 충돌 아님
+                mine = self.last_written.get((sheet_name, iid))
+                if conflicts and mine and mine[1] == first.get("session"):
+                    current = engine.compute_row_fingerprints(sheet_data.loc[[row_idx]], first.get("cols") or None)
+                    if current.get(iid) == mine[0]: conflicts = []
+                if conflicts:
+                    self._finish(entries, "failed", engine.format_conflicts(conflicts), conflict=True)
+                    continue
+
+            engine.write_row_values(sheet_data, row_idx, merged)
+            applied.extend(entries)
+            written_rows[iid] = (row_idx, first)
+
+        if not applied: return
+        try:
+            storage.write(sheet_name, sheet_data)
+        except Exception as ex:
+            self._backoff(applied, f"시트 쓰기 실패: {ex}")
+            return
+
+        for iid, (row_idx, first) in written_rows.items():
+            fps = engine.compute_row_fingerprints(sheet_data.loc[[row_idx]], first.get("cols") or None)
+            if iid in fps:
+                self.last_written[(sheet_name, iid)] = (fps[iid], first.get("session"))
+                # 등록 세션의 지문도 갱신 (이후 목록 저장/삭제가 자기 수정을 충돌로 보지 않도록)
+                engine.remember_queued_write(first.get("session"), sheet_name, first.get("cols"), {iid: fps[iid]})
+        if archive_store.has_store(sheet_name):
+            rows = sheet_data.loc[[row_idx for row_idx, _ in written_rows.values()]]
+            engine.record_archive_write(sheet_name, None, rows)
+        self._finish(applied, "done")
+        engine.invalidate_search_index()
+        try:
+            import streamlit as st
+            st.cache_data.clear()  # 새로 불러오는 세션이 반영된 값을 보도록
+        except Exception:
+            pass
+
+    def _backoff(self, entries, error):
+        """일시 오류: 지수 대기 후 재시도, 한도 초과 시 실패 처리"""
+        giving_up = []
+        with self._cond:
+            for e in entries:
+                e["attempts"] += 1
+                e["error"] = error
+                if e["attempts"] >= MAX_ATTEMPTS:
+                    giving_up.append(e)
+                else:
+                    e["next_try"] = time.time() + RETRY_BASE_SEC * (2 ** (e["attempts"] - 1))
+        if giving_up:
+            self._finish(giving_up, "failed", f"{error} ({MAX_ATTEMPTS}회 시도)")
+
+# ==============================================================================
+# [SECTION 3: PROCESS-WIDE QUEUE]
+# ==============================================================================
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_queue():
+    """프로세스 공용 큐 (최초 호출 시 저널 복원 + 워커 시작)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteQueue()
+        return _queue
+
+def enqueue_row_update(updated_row, sheet_name):
+    """
+    상세 화면 저장 요청을 큐에 등록합니다. (불러온 시점 지문을 함께 보관해 반영 시 충돌 검사)
+    저널 기록이 불가능하면 기존 방식(즉시 저장)으로 처리합니다.
+    Returns: (성공 여부, 메시지, 큐 등록 id - 즉시 저장이면 None)
+    """
+    iid = updated_row.get('IronID')
+    expected, cols = engine.expected_fingerprints(sheet_name, [iid] if iid else [])
+    try:
+        entry_id = get_queue().enqueue(sheet_name, dict(updated_row), expected, cols, tracing.current_session())
+        return True, "💾 저장 요청 완료 (시트에는 잠시 후 반영됩니다)", entry_id
+    except Exception as e:
+        print(f"[Write Queue] 저널 기록 실패, 즉시 저장으로 전환: {e}")
+        return (*engine.update_single_row(updated_row, sheet_name), None)